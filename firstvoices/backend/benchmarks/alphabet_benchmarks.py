@@ -0,0 +1,364 @@
+import json
+import os
+import platform
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from backend.models import Alphabet, Character, CharacterVariant, IgnoredCharacter
+from backend.models.constants import Visibility
+from backend.models.sites import Site
+from backend.utils.alphabet_utils import AlphabetEngine
+from backend.utils.character_utils import CustomSorter, clean_input, nfc
+
+# Benchmarks for the alphabet, sorting and text normalisation code that runs for every dictionary entry.
+# Results are measured on synthetic alphabets, so they can be compared between runs without any site data.
+# Each run also times a fixed pure-Python reference workload, and results are compared to baselines relative
+# to it, so baselines recorded on one machine are still meaningful on a faster or slower one.
+
+BASELINES_PATH = Path(__file__).parent / "baselines" / "alphabet.json"
+
+# The default g2p config from backend/fixtures/default_g2p_config.json, filled in for a synthetic site
+G2P_CONFIG = {
+    config_name: {
+        "language_name": "FV Benchmark",
+        "display_name": f"FV Benchmark {display_name}",
+        "in_lang": in_lang,
+        "out_lang": out_lang,
+        "type": "mapping",
+        "authors": ["Generated for benchmarks"],
+        "rule_ordering": "apply-longest-first",
+        "case_sensitive": True,
+        "norm_form": "NFC",
+        "prevent_feeding": True,
+        "escape_special": True,
+    }
+    for config_name, display_name, in_lang, out_lang in [
+        (
+            "preprocess_config",
+            "Preprocessor: Input to Canonical",
+            "fv-benchmark-input",
+            "fv-benchmark",
+        ),
+        (
+            "presort_config",
+            "Pre-sort: Canonical to Base Characters",
+            "fv-benchmark",
+            "fv-benchmark-base",
+        ),
+    ]
+}
+
+# Alphabet sizes, chosen to cover small alphabets and the largest multigraph-heavy orthographies
+PROFILES = {
+    "small": 100,
+    "large": 300,
+}
+
+LETTERS = "abcdefghijklmnopqrstuvwxyzðŋɬʔəɛɔʷ"
+DIACRITICS = ["̀", "́", "̂", "̄", "̇", "̓", "̱"]
+MODIFIERS = ["ʼ", "'", "ʷ", "ʰ", "ː", "h", "w", "y"]
+IGNORABLES = ["-", ".", "!", "?"]
+UNKNOWN_CHARACTERS = ["ø", "ç", "@", "þ"]
+
+REFERENCE_BENCHMARK = "reference"
+
+
+def build_alphabet_config(size: int, seed: int = 0) -> dict:
+    """
+    Returns AlphabetEngine arguments for a synthetic multigraph-heavy alphabet with the given number of
+    base characters, with uppercase variants for some characters, a few ignorables, and confusables
+    that map decomposed and apostrophe-like input to canonical characters.
+    """
+    rng = random.Random(seed)
+    base_characters = list(dict.fromkeys(nfc(letter) for letter in LETTERS))
+
+    while len(base_characters) < size:
+        char = rng.choice(LETTERS)
+        if rng.random() < 0.5:
+            char += rng.choice(DIACRITICS)
+        for _ in range(rng.randint(0, 2)):
+            char += rng.choice(MODIFIERS)
+        char = nfc(char)
+        if char not in base_characters:
+            base_characters.append(char)
+    base_characters = base_characters[:size]
+    rng.shuffle(base_characters)
+
+    # uppercase variants for some characters, keeping the splitter within the possible custom order length
+    variant_characters = [
+        (char.upper(), char)
+        for char in base_characters
+        if char.upper() != char
+        and char.upper() not in base_characters
+        and rng.random() < 0.4
+    ]
+    variant_characters = list(dict(variant_characters).items())
+
+    confusables = [{"in": "’", "out": "ʼ"}, {"in": "`", "out": "'"}] + [
+        {"in": char[0] + "̲" + char[1:], "out": char} for char in base_characters[:20]
+    ]
+
+    return {
+        "base_characters": base_characters,
+        "variant_characters": variant_characters,
+        "ignorable_characters": IGNORABLES,
+        "confusables": confusables,
+        "g2p_config": G2P_CONFIG,
+    }
+
+
+def build_words(config: dict, count: int, seed: int = 0) -> list[str]:
+    """
+    Returns synthetic dictionary entry titles built from the alphabet's characters, with occasional variants,
+    ignorables, confusables, unknown characters and multi-word phrases.
+    """
+    rng = random.Random(seed)
+    characters = config["base_characters"]
+    variants = [variant for variant, _ in config["variant_characters"]]
+    confusables = [rule["in"] for rule in config["confusables"]]
+
+    def build_word():
+        chars = []
+        for _ in range(rng.randint(3, 12)):
+            roll = rng.random()
+            if roll < 0.1 and variants:
+                chars.append(rng.choice(variants))
+            elif roll < 0.13:
+                chars.append(rng.choice(config["ignorable_characters"]))
+            elif roll < 0.16:
+                chars.append(rng.choice(confusables))
+            elif roll < 0.18:
+                chars.append(rng.choice(UNKNOWN_CHARACTERS))
+            else:
+                chars.append(rng.choice(characters))
+        return "".join(chars)
+
+    words = []
+    for _ in range(count):
+        word_count = 1 if rng.random() < 0.8 else rng.randint(2, 4)
+        words.append(" ".join(build_word() for _ in range(word_count)))
+    return words
+
+
+def get_benchmarks(config: dict, words: list[str]) -> dict:
+    """
+    Returns the benchmark functions for an alphabet config, by name, with the number of operations
+    each function call performs.
+    """
+    engine = AlphabetEngine(**config)
+    sorter = CustomSorter(
+        order=config["base_characters"], ignorable=config["ignorable_characters"]
+    )
+    base_words = [engine.get_base_form(word) for word in words]
+    # warm up the memoized single character lookups, as they would be in a long-running process
+    engine.compute_derived_fields_many(words)
+
+    def each(function, values):
+        def run():
+            for value in values:
+                function(value)
+
+        return run
+
+    return {
+        "engine_build": (lambda: AlphabetEngine(**config), 1),
+        "sorter_build": (
+            lambda: CustomSorter(
+                order=config["base_characters"],
+                ignorable=config["ignorable_characters"],
+            ),
+            1,
+        ),
+        "nfc": (each(nfc, words), len(words)),
+        "clean_input": (each(clean_input, words), len(words)),
+        "clean_confusables": (each(engine.clean_confusables, words), len(words)),
+        "get_base_form": (each(engine.get_base_form, words), len(words)),
+        "sort_string": (each(sorter.word_as_sort_string, base_words), len(words)),
+        "get_custom_order": (each(engine.get_custom_order, words), len(words)),
+        "get_character_list": (each(engine.get_character_list, words), len(words)),
+        "compute_derived_fields_many": (
+            lambda: engine.compute_derived_fields_many(words),
+            len(words),
+        ),
+    }
+
+
+@contextmanager
+def synthetic_site(config: dict, name: str):
+    """
+    Creates a site with the alphabet config, for benchmarking the Alphabet model. Everything is created in a
+    transaction which is always rolled back, so the command can be run against any database.
+    """
+    with transaction.atomic():
+        user = get_user_model().objects.create(
+            email=f"alphabet-benchmark-{name}@example.com"
+        )
+        site = Site.objects.create(
+            title=f"Alphabet benchmark {name}",
+            slug=f"alphabet-benchmark-{name}",
+            visibility=Visibility.TEAM,
+            created_by=user,
+            last_modified_by=user,
+        )
+        alphabet, _ = Alphabet.objects.get_or_create(site=site)
+        alphabet.input_to_canonical_map = config["confusables"]
+        alphabet.save()
+
+        # bulk_create skips the character limit, which the large profile is over
+        characters = Character.objects.bulk_create(
+            Character(site=site, title=title, sort_order=i)
+            for i, title in enumerate(config["base_characters"], start=1)
+        )
+        characters = {character.title: character for character in characters}
+        CharacterVariant.objects.bulk_create(
+            CharacterVariant(site=site, title=variant, base_character=characters[base])
+            for variant, base in config["variant_characters"]
+        )
+        IgnoredCharacter.objects.bulk_create(
+            IgnoredCharacter(site=site, title=title)
+            for title in config["ignorable_characters"]
+        )
+
+        try:
+            yield site
+        finally:
+            transaction.set_rollback(True)
+
+
+def get_model_benchmarks(site: Site, words: list[str]) -> dict:
+    """
+    Returns benchmark functions for the Alphabet model methods, as called when saving a dictionary entry:
+    a newly loaded alphabet checks its version, then uses the shared cached engine.
+    """
+    # build and cache the engine, as it would be in a long-running process
+    Alphabet.objects.get(site=site).engine
+
+    def each_with_new_alphabet(method_name):
+        def run():
+            for word in words:
+                getattr(Alphabet.objects.get(site=site), method_name)(word)
+
+        return run
+
+    return {
+        "alphabet_get_custom_order": (
+            each_with_new_alphabet("get_custom_order"),
+            len(words),
+        ),
+        "alphabet_get_character_list": (
+            each_with_new_alphabet("get_character_list"),
+            len(words),
+        ),
+    }
+
+
+def get_reference_benchmark():
+    """
+    Returns a fixed pure-Python workload that doesn't use any FirstVoices code, with its number of operations.
+    """
+    rng = random.Random(0)
+    values = ["".join(rng.choices(LETTERS, k=10)) for _ in range(20000)]
+
+    def run():
+        for value in sorted(values):
+            "".join(sorted(value.upper()))
+
+    return run, len(values)
+
+
+def get_environment() -> dict:
+    """
+    Returns a description of the machine and Python version the benchmarks are running on.
+    """
+    return {
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def measure(function, operations: int, repeat: int) -> float:
+    """
+    Returns the median time per operation of the function, in microseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) / operations * 1_000_000
+
+
+def run_benchmarks(word_count: int = 100, repeat: int = 3, profiles=None) -> dict:
+    """
+    Runs every benchmark for each alphabet profile, and returns the microseconds per operation
+    keyed by "<profile>.<benchmark>", along with the reference benchmark.
+    """
+    # the reference is repeated more, since every other result is scaled by it
+    results = {REFERENCE_BENCHMARK: measure(*get_reference_benchmark(), max(repeat, 5))}
+    for profile in profiles or PROFILES:
+        config = build_alphabet_config(PROFILES[profile])
+        words = build_words(config, word_count)
+        benchmarks = get_benchmarks(config, words)
+        with synthetic_site(config, profile) as site:
+            benchmarks.update(get_model_benchmarks(site, words))
+            for name, (function, operations) in benchmarks.items():
+                results[f"{profile}.{name}"] = measure(function, operations, repeat)
+    return results
+
+
+def load_baselines(path=BASELINES_PATH) -> dict:
+    """
+    Returns the stored baselines, as a dict with the "environment" they were recorded in and their "results".
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baselines(results: dict, path=BASELINES_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "environment": get_environment(),
+                "results": {
+                    name: round(value, 3) for name, value in sorted(results.items())
+                },
+            },
+            f,
+            indent=2,
+        )
+        f.write("\n")
+
+
+def get_speed_factor(results: dict, baselines: dict) -> float:
+    """
+    Returns how much slower the current run's reference benchmark is than the baseline's, or 1 if either
+    is missing.
+    """
+    if results.get(REFERENCE_BENCHMARK) and baselines.get(REFERENCE_BENCHMARK):
+        return results[REFERENCE_BENCHMARK] / baselines[REFERENCE_BENCHMARK]
+    return 1
+
+
+def find_regressions(results: dict, baselines: dict, tolerance: float) -> dict:
+    """
+    Returns the (baseline, result) timings of each benchmark which is more than the given fraction
+    slower than its baseline, after scaling the baselines by the speed difference of the reference benchmark.
+    """
+    speed_factor = get_speed_factor(results, baselines)
+    return {
+        name: (baselines[name], value)
+        for name, value in results.items()
+        if name != REFERENCE_BENCHMARK
+        and name in baselines
+        and value > baselines[name] * speed_factor * (1 + tolerance)
+    }
@@ -0,0 +1,117 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.benchmarks.alphabet_benchmarks import (
+    BASELINES_PATH,
+    PROFILES,
+    find_regressions,
+    get_environment,
+    get_speed_factor,
+    load_baselines,
+    run_benchmarks,
+    save_baselines,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the alphabet, sorting and text normalisation functions on synthetic alphabets, "
+        "and compare the results with the stored baselines. Results are scaled by a reference benchmark "
+        "before comparing, to allow for differences in machine speed. Synthetic sites are created in a "
+        "transaction which is rolled back."
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.logger = logging.getLogger(__name__)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profiles",
+            dest="profiles",
+            help=f"Alphabet profiles to run, separated by comma (optional). Options: {', '.join(PROFILES)}",
+            default=None,
+        )
+        parser.add_argument(
+            "--words",
+            type=int,
+            help="Number of synthetic words per profile (default: 100)",
+            default=100,
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            help="Number of timed runs per benchmark, the median is reported (default: 3)",
+            default=3,
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            help="Fraction a benchmark can be slower than its baseline before failing (default: 0.25)",
+            default=0.25,
+        )
+        parser.add_argument(
+            "--baselines",
+            help=f"Path of the baselines file (default: {BASELINES_PATH})",
+            default=BASELINES_PATH,
+        )
+        parser.add_argument(
+            "--save-baselines",
+            action="store_true",
+            help="If set, the results are saved as the new baselines instead of being compared.",
+            default=False,
+        )
+
+    def handle(self, *args, **options):
+        profiles = None
+        if options.get("profiles"):
+            profiles = [p.strip() for p in options["profiles"].split(",")]
+            unknown_profiles = set(profiles) - set(PROFILES)
+            if unknown_profiles:
+                raise CommandError(
+                    f"Unknown profiles: {', '.join(sorted(unknown_profiles))}."
+                )
+
+        results = run_benchmarks(
+            word_count=options["words"], repeat=options["repeat"], profiles=profiles
+        )
+
+        if options["save_baselines"]:
+            save_baselines(results, options["baselines"])
+            for name, value in results.items():
+                self.logger.info(f"{name}: {value:.3f} µs/op")
+            self.logger.info(f"Baselines saved to {options['baselines']}.")
+            return
+
+        stored_baselines = load_baselines(options["baselines"])
+        baselines = stored_baselines["results"]
+        if stored_baselines.get("environment") != get_environment():
+            self.logger.warning(
+                f"Baselines were recorded in a different environment: {stored_baselines.get('environment')}"
+            )
+
+        speed_factor = get_speed_factor(results, baselines)
+        self.logger.info(
+            f"Reference benchmark is {speed_factor:.2f}x the baseline time, baselines are scaled to match."
+        )
+        for name, value in results.items():
+            baseline = baselines.get(name)
+            if baseline:
+                self.logger.info(
+                    f"{name}: {value:.3f} µs/op (baseline {baseline:.3f}, "
+                    f"{value / (baseline * speed_factor) - 1:+.0%} after scaling)"
+                )
+            else:
+                self.logger.info(f"{name}: {value:.3f} µs/op (no baseline)")
+
+        regressions = find_regressions(results, baselines, options["tolerance"])
+        if regressions:
+            raise CommandError(
+                "Benchmarks slower than their baselines: "
+                + ", ".join(
+                    f"{name} ({baseline:.3f} -> {value:.3f} µs/op)"
+                    for name, (baseline, value) in regressions.items()
+                )
+            )
+        self.logger.info("All benchmarks are within tolerance of their baselines.")
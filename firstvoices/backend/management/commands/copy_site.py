@@ -6,6 +6,7 @@ from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import UploadedFile
 from django.core.management.base import BaseCommand
 from django.db.models import Count
+from django.utils import timezone
 
 from backend.models.category import Category
 from backend.models.characters import (
@@ -152,6 +153,9 @@ def copy_alphabet(source_site, target_site, set_modified_date):
     if len(alphabets) == 1:
         alphabets[0].id = uuid.uuid4()
         alphabets[0].site = target_site
+        # the target site's entries haven't been cleaned up yet
+        alphabets[0].last_cleanup_config = None
+        alphabets[0].last_cleanup_date = None
         alphabets[0].save(set_modified_date=set_modified_date)
     else:
         Alphabet.objects.create(site=target_site)
@@ -578,6 +582,23 @@ def copy_stories(
             )
 
 
+def bulk_create_dictionary_entries(entries, alphabet, set_modified_date):
+    """
+    Creates a batch of dictionary entries with a single query, applying the same derived fields
+    and modified dates as saving each entry would.
+    """
+    if not entries:
+        return
+
+    DictionaryEntry.set_derived_fields_many(entries, alphabet)
+    now = timezone.now()
+    for entry in entries:
+        entry.system_last_modified = now
+        if set_modified_date:
+            entry.last_modified = now
+    DictionaryEntry.objects.bulk_create(entries)
+
+
 def copy_dictionary_entries_and_return_map(
     source_site,
     target_site,
@@ -597,12 +618,14 @@ def copy_dictionary_entries_and_return_map(
             f"Found {target_site_alphabet.count()} alphabets on target site."
         )
 
+    alphabet = target_site_alphabet[0]
     dictionary_entry_map = {}
 
     dictionary_entry_instances = DictionaryEntry.objects.filter(
         site=source_site
     ).iterator(chunk_size=BATCH_SIZE)
     # First pass to create new entries and fill up the map
+    batch = []
     for entry in dictionary_entry_instances:
         source_entry_id = entry.id
         target_entry_id = uuid.uuid4()
@@ -612,7 +635,12 @@ def copy_dictionary_entries_and_return_map(
         entry.site = target_site
         entry.legacy_batch_filename = ""
         entry.import_job = None
-        entry.save(set_modified_date=set_modified_date)
+        batch.append(entry)
+
+        if len(batch) >= BATCH_SIZE:
+            bulk_create_dictionary_entries(batch, alphabet, set_modified_date)
+            batch = []
+    bulk_create_dictionary_entries(batch, alphabet, set_modified_date)
 
     dictionary_entries = list(DictionaryEntry.objects.filter(site=source_site))
     # Second pass to set all the relationships
@@ -33,6 +33,18 @@ class Command(BaseCommand):
             help="Name of the index to be rebuilt (optional)",
             default=None,
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Number of worker processes adding documents to each index (default: 1)",
+            default=1,
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Number of documents per bulk request (default: 500)",
+            default=500,
+        )
 
     def handle(self, *args, **options):
         # Setting logger level to get all logs
@@ -40,11 +52,15 @@ class Command(BaseCommand):
         logger.setLevel(logging.INFO)
 
         index_name = options["index_name"]
+        rebuild_options = {
+            "workers": options["workers"],
+            "chunk_size": options["chunk_size"],
+        }
 
         if index_name:
             try:
                 manager = self.index_managers[index_name]
-                return manager.rebuild()
+                return manager.rebuild(**rebuild_options)
             except KeyError:
                 logger.warning(
                     "Can't rebuild index for unrecognized alias: [%s]", index_name
@@ -54,6 +70,6 @@ class Command(BaseCommand):
             logger.info("No index name provided. Building all indices.")
 
             for manager in self.index_managers.values():
-                manager.rebuild()
+                manager.rebuild(**rebuild_options)
 
         logger.info("Index rebuild complete.")
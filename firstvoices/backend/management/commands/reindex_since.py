@@ -0,0 +1,92 @@
+import logging
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from backend.search.constants import (
+    ELASTICSEARCH_DICTIONARY_ENTRY_INDEX,
+    ELASTICSEARCH_LANGUAGE_INDEX,
+    ELASTICSEARCH_MEDIA_INDEX,
+    ELASTICSEARCH_SONG_INDEX,
+    ELASTICSEARCH_STORY_INDEX,
+)
+from backend.search.indexing.dictionary_index import DictionaryIndexManager
+from backend.search.indexing.language_index import LanguageIndexManager
+from backend.search.indexing.media_index import MediaIndexManager
+from backend.search.indexing.song_index import SongIndexManager
+from backend.search.indexing.story_index import StoryIndexManager
+
+
+class Command(BaseCommand):
+    help = (
+        "Catch search indices up with the database, reindexing only what changed since the last rebuild or "
+        "catch-up (or since the given time)."
+    )
+    index_managers = {
+        ELASTICSEARCH_LANGUAGE_INDEX: LanguageIndexManager,
+        ELASTICSEARCH_SONG_INDEX: SongIndexManager,
+        ELASTICSEARCH_STORY_INDEX: StoryIndexManager,
+        ELASTICSEARCH_MEDIA_INDEX: MediaIndexManager,
+        ELASTICSEARCH_DICTIONARY_ENTRY_INDEX: DictionaryIndexManager,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--index",
+            dest="index_name",
+            help="Name of the index to be caught up (optional)",
+            default=None,
+        )
+        parser.add_argument(
+            "--since",
+            help="ISO 8601 time to reindex changes from (default: the watermark stored in each index)",
+            default=None,
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Number of documents per bulk request (default: 500)",
+            default=500,
+        )
+
+    def handle(self, *args, **options):
+        # Setting logger level to get all logs
+        logger = logging.getLogger("reindex_since")
+        logger.setLevel(logging.INFO)
+
+        index_name = options["index_name"]
+        reindex_options = {
+            "since": self.parse_since(options["since"]),
+            "chunk_size": options["chunk_size"],
+        }
+
+        if index_name:
+            try:
+                manager = self.index_managers[index_name]
+            except KeyError:
+                logger.warning(
+                    "Can't reindex changes for unrecognized alias: [%s]", index_name
+                )
+                return
+            managers = [manager]
+        else:
+            logger.info("No index name provided. Reindexing changes in all indices.")
+            managers = self.index_managers.values()
+
+        for manager in managers:
+            manager.reindex_since(**reindex_options)
+
+        logger.info("Reindexing changes complete.")
+
+    @staticmethod
+    def parse_since(since):
+        if since is None:
+            return None
+        try:
+            parsed = datetime.fromisoformat(since)
+        except ValueError:
+            raise CommandError(f"Invalid --since time: [{since}]")
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
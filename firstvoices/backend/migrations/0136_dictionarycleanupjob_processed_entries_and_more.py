@@ -0,0 +1,23 @@
+# Generated by Django 5.1.14 on 2026-10-17 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0135_importjobreport_warnings"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dictionarycleanupjob",
+            name="processed_entries",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="dictionarycleanupjob",
+            name="total_entries",
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.14 on 2026-10-17 11:05
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0136_dictionarycleanupjob_processed_entries_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="alphabet",
+            name="last_cleanup_config",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="alphabet",
+            name="last_cleanup_date",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="dictionaryentry",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["split_chars_base"], name="dictionary_split_chars_idx"
+            ),
+        ),
+    ]
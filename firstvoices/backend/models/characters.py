@@ -3,14 +3,20 @@ import logging
 import yaml
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.signals import post_delete, post_save
 from django.db.utils import IntegrityError
+from django.dispatch import receiver
 from django.utils.functional import cached_property
 from django.utils.translation import gettext as _
-from g2p.mappings import Mapping
-from g2p.transducer import Transducer
 
 from backend.permissions import predicates
-from backend.utils.character_utils import CustomSorter, nfc
+from backend.utils.alphabet_utils import (
+    AlphabetEngine,
+    DerivedFields,
+    alphabet_engine_cache,
+)
+from backend.utils.character_utils import CustomSorter
 
 from .app import AppJson
 from .base import BaseSiteContentModel
@@ -241,6 +247,11 @@ class Alphabet(BaseSiteContentModel):
     # JSON representation of a g2p mapping from confusable characters to canonical characters
     input_to_canonical_map = models.JSONField(default=list)
 
+    # Engine config used by the last dictionary cleanup that updated every affected entry, and when it finished.
+    # Used to find the entries affected by later alphabet changes, see get_alphabet_changes.
+    last_cleanup_config = models.JSONField(null=True, blank=True)
+    last_cleanup_date = models.DateTimeField(null=True, blank=True)
+
     @cached_property
     def base_characters(self):
         """
@@ -282,75 +293,156 @@ class Alphabet(BaseSiteContentModel):
         return site_config
 
     @property
-    def preprocess_transducer(self):
+    def version(self):
         """
-        Returns an input-to-canonical G2P transducer from stored JSON map, using default config settings.
-        Does not allow manual configuration yet.
+        Returns a stamp identifying the current state of the site's alphabet, based on the modification times
+        and counts of the alphabet, its characters, variants and ignored characters, and the g2p config.
+        Returns None if the alphabet has not been saved.
         """
-        if self.input_to_canonical_map:
-            preprocess_settings = self.default_g2p_config["preprocess_config"]
 
-            # need to query for self to grab unescaped json: see FW-4365, FW-4559
-            readable_self = Alphabet.objects.only("input_to_canonical_map").get(
-                id=self.id
+        def latest(model):
+            return Subquery(
+                model.objects.filter(site_id=OuterRef("site_id"))
+                .order_by()
+                .values("site_id")
+                .annotate(latest=Max("system_last_modified"))
+                .values("latest")[:1]
             )
-            return Transducer(
-                Mapping(
-                    **preprocess_settings,
-                    rules=readable_self.input_to_canonical_map,
-                )
+
+        def count(model):
+            return Subquery(
+                model.objects.filter(site_id=OuterRef("site_id"))
+                .order_by()
+                .values("site_id")
+                .annotate(count=Count("id"))
+                .values("count")[:1]
             )
-        else:
-            self.logger.debug("Empty confusable map for site %s", self.site)
-            return None
 
-    def presort_transducer(self, base_characters=None, character_variants=None):
+        return (
+            Alphabet.objects.filter(id=self.id)
+            .annotate(
+                characters_modified=latest(Character),
+                characters_count=count(Character),
+                variants_modified=latest(CharacterVariant),
+                variants_count=count(CharacterVariant),
+                ignored_modified=latest(IgnoredCharacter),
+                ignored_count=count(IgnoredCharacter),
+                g2p_config_modified=Subquery(
+                    AppJson.objects.filter(key="default_g2p_config").values(
+                        "system_last_modified"
+                    )[:1]
+                ),
+            )
+            .values_list(
+                "system_last_modified",
+                "characters_modified",
+                "characters_count",
+                "variants_modified",
+                "variants_count",
+                "ignored_modified",
+                "ignored_count",
+                "g2p_config_modified",
+                "site__title",
+                "site__slug",
+            )
+            .first()
+        )
+
+    @cached_property
+    def engine(self) -> AlphabetEngine:
         """
-        Returns a variant-to-base G2P transducer, built from Characters and CharacterVariants.
+        Returns the compiled text processors for the site alphabet.
+        Engines are shared across the process and rebuilt only when the alphabet version changes.
+        """
+        version = self.version
+        if version is None:
+            return self.build_engine()
+
+        engine = alphabet_engine_cache.get(self.site_id, version)
+        if engine is None:
+            engine = self.build_engine()
+            alphabet_engine_cache.set(self.site_id, version, engine)
+        return engine
+
+    def build_engine(
+        self, base_characters=None, character_variants=None, ignorable_characters=None
+    ) -> AlphabetEngine:
+        """
+        Builds a new alphabet engine from the site's characters, or from the given characters if provided.
         """
         base_characters = (
             base_characters if base_characters is not None else self.base_characters
         )
-        base_character_map = (
-            [{"in": char.title, "out": char.title} for char in base_characters]
-            if base_characters is not None
-            else []
-        )
         character_variants = (
             character_variants
             if character_variants is not None
             else self.variant_characters
         )
-        variant_character_map = (
-            [
-                {"in": variant.title, "out": variant.base_character.title}
+        ignorable_characters = (
+            ignorable_characters
+            if ignorable_characters is not None
+            else self.ignorable_characters
+        )
+
+        # need to query for self to grab unescaped json: see FW-4365, FW-4559
+        confusables = (
+            Alphabet.objects.filter(id=self.id)
+            .values_list("input_to_canonical_map", flat=True)
+            .first()
+            if self.id is not None and not self._state.adding
+            else self.input_to_canonical_map
+        )
+        if not confusables:
+            self.logger.debug("Empty confusable map for site %s", self.site_id)
+
+        return AlphabetEngine(
+            base_characters=[char.title for char in base_characters],
+            variant_characters=[
+                (variant.title, variant.base_character.title)
                 for variant in character_variants
-            ]
-            if character_variants is not None
-            else []
+            ],
+            ignorable_characters=[char.title for char in ignorable_characters],
+            confusables=confusables or [],
+            g2p_config=self.default_g2p_config,
+        )
+
+    def get_engine(
+        self, base_characters=None, character_variants=None, ignorable_characters=None
+    ) -> AlphabetEngine:
+        """
+        Returns the cached alphabet engine, or a new uncached engine if any characters are provided.
+        """
+        if (
+            base_characters is None
+            and character_variants is None
+            and ignorable_characters is None
+        ):
+            return self.engine
+        return self.build_engine(
+            base_characters, character_variants, ignorable_characters
         )
-        full_map = base_character_map + variant_character_map
 
-        presort_settings = self.default_g2p_config["presort_config"]
+    @property
+    def preprocess_transducer(self):
+        """
+        Returns an input-to-canonical G2P transducer from stored JSON map, using default config settings.
+        Does not allow manual configuration yet.
+        """
+        return self.engine.preprocess_transducer
 
-        return Transducer(Mapping(**presort_settings, rules=full_map))
+    def presort_transducer(self, base_characters=None, character_variants=None):
+        """
+        Returns a variant-to-base G2P transducer, built from Characters and CharacterVariants.
+        """
+        return self.get_engine(base_characters, character_variants).presort_transducer
 
     def sorter(self, base_characters=None, ignorable_characters=None) -> CustomSorter:
         """
         Returns a sorter object which can be called to provide custom sort values based on the site alphabet.
         """
-        base_characters = (
-            base_characters if base_characters is not None else self.base_characters
-        )
-        ignorable_characters = (
-            ignorable_characters
-            if ignorable_characters is not None
-            else self.ignorable_characters
-        )
-        return CustomSorter(
-            order=[char.title for char in base_characters],
-            ignorable=[char.title for char in ignorable_characters],
-        )
+        return self.get_engine(
+            base_characters, ignorable_characters=ignorable_characters
+        ).sorter
 
     def splitter(
         self, base_characters=None, character_variants=None, ignorable_characters=None
@@ -360,24 +452,9 @@ class Alphabet(BaseSiteContentModel):
         to properly split text into characters using the MTD splitter.
         Ignored characters are added to the order list to ensure they are not removed by the splitter.
         """
-        base_characters = (
-            base_characters if base_characters is not None else self.base_characters
-        )
-        character_variants = (
-            character_variants
-            if character_variants is not None
-            else self.variant_characters
-        )
-        ignorable_characters = (
-            ignorable_characters
-            if ignorable_characters is not None
-            else self.ignorable_characters
-        )
-        return CustomSorter(
-            order=[char.title for char in base_characters]
-            + [char.title for char in character_variants]
-            + [char.title for char in ignorable_characters]
-        )
+        return self.get_engine(
+            base_characters, character_variants, ignorable_characters
+        ).splitter
 
     def __str__(self):
         return f"Alphabet and related functions for {self.site}"
@@ -388,11 +465,14 @@ class Alphabet(BaseSiteContentModel):
         converting all instances of confusables to instances of characters or
         variant characters.
         """
-        if self.preprocess_transducer:
-            new_text = self.preprocess_transducer(text).output_string
-            return nfc(new_text)
-        else:
-            return text
+        return self.engine.clean_confusables(text)
+
+    def clean_confusables_many(self, texts: list[str]) -> list[str]:
+        """
+        Applies the confusable cleanup to many strings at once, with a single lookup of the site's alphabet.
+        Useful for import pipelines and other bulk writes.
+        """
+        return self.engine.clean_confusables_many(texts)
 
     def get_custom_order(
         self,
@@ -405,13 +485,9 @@ class Alphabet(BaseSiteContentModel):
         Convert a string to a custom-order string which follows the site custom alphabet order.
         Sort is insensitive to character variants (such as uppercase), and ignores ignorable characters.
         """
-        presort_transducer = self.presort_transducer(
-            base_characters, character_variants
-        )
-        text = presort_transducer(text).output_string
-        return self.sorter(base_characters, ignorable_characters).word_as_sort_string(
-            text
-        )
+        return self.get_engine(
+            base_characters, character_variants, ignorable_characters
+        ).get_custom_order(text)
 
     def get_character_list(
         self,
@@ -423,9 +499,9 @@ class Alphabet(BaseSiteContentModel):
         """
         Returns a list of characters in the text, split using the MTD splitter.
         """
-        return self.splitter(
+        return self.get_engine(
             base_characters, character_variants, ignorable_characters
-        ).word_as_chars(text)
+        ).get_character_list(text)
 
     def get_base_form(
         self, text: str, base_characters=None, character_variants=None
@@ -433,10 +509,7 @@ class Alphabet(BaseSiteContentModel):
         """
         Converts a string to a string with all variant characters replaced with their base characters.
         """
-        presort_transducer = self.presort_transducer(
-            base_characters, character_variants
-        )
-        return presort_transducer(text).output_string
+        return self.get_engine(base_characters, character_variants).get_base_form(text)
 
     def get_numerical_sort_form(
         self,
@@ -445,9 +518,9 @@ class Alphabet(BaseSiteContentModel):
         character_variants=None,
         ignorable_characters=None,
     ):
-        return self.sorter(base_characters, ignorable_characters).word_as_values(
-            self.get_base_form(text, base_characters, character_variants)
-        )
+        return self.get_engine(
+            base_characters, character_variants, ignorable_characters
+        ).get_numerical_sort_form(text)
 
     def get_split_chars_base(
         self,
@@ -456,60 +529,34 @@ class Alphabet(BaseSiteContentModel):
         character_variants=None,
         ignorable_characters=None,
     ) -> list[str]:
-        ignored_characters = IgnoredCharacter.objects.filter(
-            site=self.site
-        ).values_list("title", flat=True)
-        base_characters = (
-            base_characters if base_characters is not None else self.base_characters
-        )
-        character_variants = (
-            character_variants
-            if character_variants is not None
-            else self.variant_characters
-        )
-        ignorable_characters = (
-            ignorable_characters
-            if ignorable_characters is not None
-            else self.ignorable_characters
-        )
-        if "⚑" in entry.custom_order:
-            return []
-        else:
-            char_list = (
-                []
-                if self == []
-                else self.get_character_list(
-                    entry.title,
-                    base_characters,
-                    character_variants,
-                    ignorable_characters,
-                )
-            )
-            has_ignored_char = set(char_list).intersection(set(ignored_characters))
-            if has_ignored_char:
-                return []
-            else:
-                base_chars = [
-                    self.get_base_form(
-                        c,
-                        base_characters,
-                        character_variants,
-                    )
-                    for c in char_list
-                ]
-                return base_chars
+        return self.get_engine(
+            base_characters, character_variants, ignorable_characters
+        ).get_split_chars_base(entry.title, entry.custom_order)
+
+    def compute_derived_fields(self, titles: list[str]) -> list[DerivedFields]:
+        """
+        Returns the cleaned title, custom order and split base characters for each of the given titles,
+        using the same processing as saving a DictionaryEntry. Useful for bulk writes.
+        """
+        return self.engine.compute_derived_fields_many(titles)
 
     def get_unknown_characters(self, text: str) -> list[str]:
         """
         Returns a list of characters in the text that are not in the site's alphabet or variants.
         """
-        base_characters = self.base_characters.values_list("title", flat=True)
-        variant_characters = self.variant_characters.values_list("title", flat=True)
-        ignorable_characters = self.ignorable_characters.values_list("title", flat=True)
-
-        all_known_chars = (
-            set(base_characters) | set(variant_characters) | set(ignorable_characters)
-        )
-        char_list = self.get_character_list(text)
-        unknown_chars = [char for char in char_list if char not in all_known_chars]
-        return unknown_chars
+        return self.engine.get_unknown_characters(text)
+
+
+@receiver(post_save, sender=Alphabet)
+@receiver(post_delete, sender=Alphabet)
+@receiver(post_save, sender=Character)
+@receiver(post_delete, sender=Character)
+@receiver(post_save, sender=CharacterVariant)
+@receiver(post_delete, sender=CharacterVariant)
+@receiver(post_save, sender=IgnoredCharacter)
+@receiver(post_delete, sender=IgnoredCharacter)
+def invalidate_alphabet_engine(sender, instance, **kwargs):
+    """Evicts the cached alphabet engine for the site when any part of its alphabet changes."""
+    if isinstance(instance, Alphabet):
+        instance.__dict__.pop("engine", None)
+    alphabet_engine_cache.invalidate(instance.site_id)
@@ -1,4 +1,5 @@
 import rules
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils.translation import gettext as _
 from django_better_admin_arrayfield.models.fields import ArrayField
@@ -184,6 +185,8 @@ class DictionaryEntry(AudienceMixin, RelatedMediaMixin, BaseControlledSiteConten
                 fields=["site", "type", "visibility", "exclude_from_wotd"],
                 name="dictionary_wotd_candidates_idx",
             ),
+            # used to find entries containing characters affected by alphabet changes
+            GinIndex(fields=["split_chars_base"], name="dictionary_split_chars_idx"),
         ]
 
     def __str__(self):
@@ -210,6 +213,27 @@ class DictionaryEntry(AudienceMixin, RelatedMediaMixin, BaseControlledSiteConten
     def set_split_chars_base(self, alphabet):
         self.split_chars_base = alphabet.get_split_chars_base(self)
 
+    @classmethod
+    def set_derived_fields_many(cls, entries, alphabet=None):
+        """
+        Applies the same cleanup and alphabet-derived fields as save() to many entries at once, without
+        saving them, so they can be written with bulk_create or bulk_update.
+        All entries must belong to the same site. Each entry's title is processed with a single shared alphabet.
+        """
+        if not entries:
+            return
+        if alphabet is None:
+            alphabet, _ = Alphabet.objects.get_or_create(site_id=entries[0].site_id)
+
+        derived_fields = alphabet.compute_derived_fields(
+            [entry.title for entry in entries]
+        )
+        for entry, derived in zip(entries, derived_fields):
+            entry.title = derived.title
+            entry.custom_order = derived.custom_order
+            entry.split_chars_base = derived.split_chars_base
+            entry.clean_related_fields()
+
     def clean_related_fields(self):
         # strip whitespace and normalize related fields
         self.acknowledgements = [clean_input(ack) for ack in self.acknowledgements]
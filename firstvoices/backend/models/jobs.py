@@ -55,6 +55,10 @@ class DictionaryCleanupJob(BaseJob):
     cleanup_result = models.JSONField(blank=True, null=True)
     is_preview = models.BooleanField(default=True)
 
+    # progress of a running job
+    total_entries = models.IntegerField(default=0)
+    processed_entries = models.IntegerField(default=0)
+
     def __str__(self):
         return self.site.title + " - DictionaryCleanup - " + str(self.id)
 
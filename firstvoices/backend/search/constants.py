@@ -6,6 +6,22 @@ from backend.models.constants import DEFAULT_TITLE_LENGTH
 # retry_on_conflict for all update calls
 RETRY_ON_CONFLICT = 10
 
+# Stored in the mapping of each index. Increase when the documents change in a way that needs indexes to be
+# rebuilt, so server-side updates are not run against indexes built with an older mapping.
+ELASTICSEARCH_MAPPING_VERSION = 2
+
+
+class RefreshPolicy(TextChoices):
+    """
+    Whether index writes wait for the changes to be visible to searches. NONE leaves it to the next scheduled
+    refresh, WAIT_FOR waits for it, and TRUE forces a refresh of the affected shards.
+    """
+
+    NONE = "none", _("none")
+    WAIT_FOR = "wait_for", _("wait_for")
+    TRUE = "true", _("true")
+
+
 # Only exact search will be used if the length of
 # search term crosses this threshold
 FUZZY_SEARCH_CUTOFF = 50
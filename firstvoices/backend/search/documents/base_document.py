@@ -1,4 +1,6 @@
-from elasticsearch.dsl import Boolean, Date, Document, Integer, Keyword, Text
+from elasticsearch.dsl import Boolean, Date, Document, Integer, Keyword, MetaField, Text
+
+from backend.search.constants import ELASTICSEARCH_MAPPING_VERSION
 
 
 class BaseDocument(Document):
@@ -6,6 +8,12 @@ class BaseDocument(Document):
 
     document_id = Keyword()  # model id
     document_type = Keyword()  # model class name
+    indexed_at = (
+        Date()
+    )  # when the document was last written, see DocumentManager.sync_site
+
+    class Meta:
+        meta = MetaField(mapping_version=ELASTICSEARCH_MAPPING_VERSION)
 
 
 class BaseSiteEntryDocument(BaseDocument):
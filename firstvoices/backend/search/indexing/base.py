@@ -1,35 +1,110 @@
+import multiprocessing
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+
+import django
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Exists, OuterRef, Q
 from django.utils import timezone
-from elasticsearch.dsl import Search, connections
+from elasticsearch.dsl import connections
 from elasticsearch.dsl.index import Index
 from elasticsearch.exceptions import ConnectionError, NotFoundError
 from elasticsearch.helpers import actions
 
 from backend.search import es_logging
+from backend.search.constants import (
+    ELASTICSEARCH_MAPPING_VERSION,
+    RETRY_ON_CONFLICT,
+    RefreshPolicy,
+)
 from firstvoices.settings import ELASTICSEARCH_DEFAULT_CONFIG
 
+ES_REFRESH_PARAMS = {
+    RefreshPolicy.NONE: False,
+    RefreshPolicy.WAIT_FOR: "wait_for",
+    RefreshPolicy.TRUE: True,
+}
 
-def search_by_id(document_id, index):
-    s = Search(index=index).params(request_timeout=10)
-    response = s.query("match", document_id=document_id).execute()
-    hits = response["hits"]["hits"]
-    return hits[0] if hits else None
+_refresh_policy = ContextVar("index_refresh_policy", default=RefreshPolicy.NONE)
+
+
+def get_refresh_policy():
+    """
+    Returns the refresh policy for index writes in the current context. The default is RefreshPolicy.NONE.
+    """
+    return _refresh_policy.get()
+
+
+@contextmanager
+def index_refresh_policy(policy):
+    """
+    Sets the refresh policy for index writes made or requested within the block, e.g. RefreshPolicy.WAIT_FOR for
+    interactive edits that need to be visible in search results right away.
+    """
+    token = _refresh_policy.set(policy)
+    try:
+        yield
+    finally:
+        _refresh_policy.reset(token)
+
+
+def get_pk_ranges(count):
+    """
+    Splits the UUID primary key space into the given number of contiguous (low, high) ranges. The last range
+    has no upper bound. Primary keys are random UUIDs, so the ranges hold similar numbers of instances.
+    """
+    step = 2**128 // count
+    bounds = [uuid.UUID(int=i * step) for i in range(count)] + [None]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _init_rebuild_worker():
+    django.setup()
+
+
+def _add_pk_range(document_manager, low, high, chunk_size):
+    document_manager.add_range(connections.get_connection(), low, high, chunk_size)
+
+
+def related_exists(model, field_name):
+    """
+    Returns an Exists expression which is true for instances that have any objects in the given many-to-many field.
+    """
+    field = model._meta.get_field(field_name)
+    through = field.remote_field.through
+    return Exists(through.objects.filter(**{field.m2m_field_name(): OuterRef("pk")}))
 
 
 class IndexManager:
     index = ""
     document_managers = []
+    # Seconds between checks on the progress of background tasks run on the Elasticsearch server
+    task_poll_interval = 1
+    # Changes this long before the watermark are reindexed again, to allow for clock differences between servers
+    reindex_overlap = timedelta(minutes=5)
 
     @classmethod
-    def rebuild(cls):
+    def rebuild(cls, workers=1, chunk_size=500):
+        """
+        Builds a new index with all documents, then replaces the current index with it.
+        With more than one worker, each document type is added by a pool of processes (see
+        DocumentManager.add_all_parallel). chunk_size is the number of documents per bulk request.
+        """
         es_logging.logger.info(f"Building index: {cls.index}")
 
+        started = timezone.now()
         es = connections.get_connection()
         current_index = cls._get_current_index(es)
         new_index = cls._create_new_write_index()
 
         try:
-            cls._add_all(es)
+            cls._add_all(es, workers, chunk_size)
+            cls._restore_index_settings(es, new_index)
+            cls._set_watermark(es, new_index._name, started)
 
         except Exception as e:
             # If we are not able to complete the new index, delete it and leave the current one as read + write alias
@@ -71,9 +146,11 @@ class IndexManager:
         new_index_name = cls.index + "_" + current_timestamp
         new_index = Index(new_index_name)
 
+        # Replicas and refreshes are turned off while loading, see _restore_index_settings
         new_index.settings(
             number_of_shards=int(ELASTICSEARCH_DEFAULT_CONFIG["shards"]),
-            number_of_replicas=int(ELASTICSEARCH_DEFAULT_CONFIG["replicas"]),
+            number_of_replicas=0,
+            refresh_interval="-1",
         )
 
         cls._add_document_types(new_index)
@@ -102,15 +179,180 @@ class IndexManager:
         index.put_alias(using=es, name=cls.index)
 
     @classmethod
-    def _add_all(cls, es):
+    def _restore_index_settings(cls, es, index):
+        """
+        Restores the configured replicas and default refresh interval on a newly loaded index, and refreshes it
+        so all documents are searchable before it replaces the current index.
+        """
+        index.put_settings(
+            using=es,
+            settings={
+                "index": {
+                    "number_of_replicas": int(ELASTICSEARCH_DEFAULT_CONFIG["replicas"]),
+                    "refresh_interval": None,
+                }
+            },
+        )
+        index.refresh(using=es)
+
+    @classmethod
+    def has_current_mapping(cls):
+        """
+        True if the index was built with the current ELASTICSEARCH_MAPPING_VERSION. Indexes built with another
+        version should have their documents rebuilt rather than updated on the server.
+        """
+        es = connections.get_connection()
+        mappings = es.indices.get_mapping(index=cls.index)
+        return bool(mappings) and all(
+            index_mapping["mappings"].get("_meta", {}).get("mapping_version")
+            == ELASTICSEARCH_MAPPING_VERSION
+            for index_mapping in mappings.values()
+        )
+
+    @classmethod
+    def update_by_query(cls, query, script, params):
+        """
+        Runs a painless script on the server for every document matching the query. Returns True if all matching
+        documents were updated, or False if any failed or were skipped because they changed while the update ran.
+        """
+        es = connections.get_connection()
+        response = es.update_by_query(
+            index=cls.index,
+            query=query,
+            script={"source": script, "lang": "painless", "params": params},
+            conflicts="proceed",
+            slices="auto",
+        )
+
+        if response["failures"] or response["version_conflicts"]:
+            es_logging.logger.error(
+                "update_by_query on index [%s] did not complete. Version conflicts: %s, failures: %s",
+                cls.index,
+                response["version_conflicts"],
+                response["failures"],
+            )
+            return False
+        return True
+
+    @classmethod
+    def delete_by_query(cls, query):
+        """
+        Deletes all documents matching the query. The delete runs as a background task on the server, split into
+        slices, and is polled until it completes. Returns True if all matching documents were deleted.
+        """
+        es = connections.get_connection()
+        response = es.delete_by_query(
+            index=cls.index,
+            query=query,
+            conflicts="proceed",
+            slices="auto",
+            wait_for_completion=False,
+        )
+        task = cls._wait_for_task(es, response["task"])
+        result = task.get("response", {})
+
+        if (
+            task.get("error")
+            or result.get("failures")
+            or result.get("version_conflicts")
+        ):
+            es_logging.logger.error(
+                "delete_by_query on index [%s] did not complete. Version conflicts: %s, failures: %s, error: %s",
+                cls.index,
+                result.get("version_conflicts"),
+                result.get("failures"),
+                task.get("error"),
+            )
+            return False
+        return True
+
+    @classmethod
+    def refresh(cls):
+        Index(cls.index).refresh()
+
+    @classmethod
+    def reindex_since(cls, since=None, chunk_size=500):
+        """
+        Catches the index up with the database: documents for instances modified since the given time (or since
+        the index's watermark) are rewritten, and documents for deleted instances are removed. If it completes
+        without errors, the watermark is moved to the time it started. Returns True if it completed.
+        """
+        es = connections.get_connection()
+        started = timezone.now()
+        if since is None:
+            since = cls.get_watermark()
+        if since is None:
+            es_logging.logger.warning(
+                "No reindex watermark for index [%s]. Rebuild the index with rebuild_index first.",
+                cls.index,
+            )
+            return False
+
+        es_logging.logger.info(
+            f"Reindexing changes since {since} in index: {cls.index}"
+        )
+        completed = True
         for document_manager in cls.document_managers:
-            document_manager.add_all(es)
+            completed &= document_manager.reindex_since(
+                es, since - cls.reindex_overlap, chunk_size
+            )
+            completed &= document_manager.remove_deleted(es)
+
+        if completed:
+            cls._set_watermark(es, cls.index, started)
+        es_logging.logger.info(f"Finished reindexing changes in index: {cls.index}")
+        return completed
+
+    @classmethod
+    def get_watermark(cls):
+        """
+        Returns the time up to which the index is known to be in sync with the database, or None if it has not been
+        recorded. It is set when the index is rebuilt or caught up by reindex_since.
+        """
+        es = connections.get_connection()
+        watermarks = [
+            index_mapping["mappings"].get("_meta", {}).get("reindexed_until")
+            for index_mapping in es.indices.get_mapping(index=cls.index).values()
+        ]
+        if not watermarks or None in watermarks:
+            return None
+        return min(datetime.fromisoformat(watermark) for watermark in watermarks)
+
+    @classmethod
+    def _set_watermark(cls, es, index_name, watermark):
+        """Stores the watermark in the mapping metadata of the index, keeping the rest of the metadata."""
+        for name, index_mapping in es.indices.get_mapping(index=index_name).items():
+            meta = index_mapping["mappings"].get("_meta", {})
+            es.indices.put_mapping(
+                index=name, meta={**meta, "reindexed_until": watermark.isoformat()}
+            )
+
+    @classmethod
+    def _wait_for_task(cls, es, task_id):
+        """Polls a background task on the server until it completes, and returns its final status."""
+        while True:
+            task = es.tasks.get(task_id=task_id)
+            if task["completed"]:
+                return task
+            time.sleep(cls.task_poll_interval)
+
+    @classmethod
+    def _add_all(cls, es, workers=1, chunk_size=500):
+        for document_manager in cls.document_managers:
+            if workers > 1:
+                document_manager.add_all_parallel(es, workers, chunk_size)
+            else:
+                document_manager.add_all(es, chunk_size)
 
 
 class DocumentManager:
     index = ""
     document = None
     model = None
+    # Number of instances loaded per database query when adding all documents to an index
+    iterator_chunk_size = 500
+    # Number of primary key ranges per worker process when adding all documents in parallel
+    ranges_per_worker = 4
 
     @classmethod
     def refresh(cls):
@@ -122,20 +364,41 @@ class DocumentManager:
         raise NotImplementedError()
 
     @classmethod
-    def add_to_index(cls, instance):
+    def _get_index_document(cls, instance):
+        """
+        Returns the index document for the given instance, with the model id as its Elasticsearch _id. This lets
+        documents be written and deleted directly by id, without searching for them first.
+        """
+        index_document = cls.create_index_document(instance)
+        index_document.meta.id = str(instance.id)
+        index_document.indexed_at = timezone.now()
+        return index_document
+
+    @staticmethod
+    def _refresh_param(refresh):
+        """
+        Returns the Elasticsearch refresh parameter for the given RefreshPolicy, or for the current context's
+        policy if None.
+        """
+        return ES_REFRESH_PARAMS[refresh or get_refresh_policy()]
+
+    @classmethod
+    def add_to_index(cls, instance, refresh=None):
+        """
+        Adds the document for the given instance, or replaces it if it is already indexed.
+        """
         try:
-            new_index_document = cls.create_index_document(instance)
-            new_index_document.save()
-            cls.refresh()
+            new_index_document = cls._get_index_document(instance)
+            new_index_document.save(refresh=cls._refresh_param(refresh))
         except ConnectionError as e:
             es_logging.log_connection_error(e, instance)
         except Exception as e:
             es_logging.log_fallback_exception(e, instance)
 
     @classmethod
-    def update_in_index(cls, instance):
+    def update_in_index(cls, instance, refresh=None):
         try:
-            cls._update_in_index(instance)
+            cls._update_in_index(instance, refresh)
         except ConnectionError as e:
             es_logging.log_connection_error(e, instance)
         except NotFoundError:
@@ -144,29 +407,24 @@ class DocumentManager:
             es_logging.log_fallback_exception(e, instance)
 
     @classmethod
-    def _update_in_index(cls, instance):
-        existing_index_document = cls._find_in_index(instance.id)
-        new_index_document = cls.create_index_document(instance)
+    def _update_in_index(cls, instance, refresh=None):
+        """
+        Updates the existing document for the given instance. Raises NotFoundError if it is not indexed.
+        """
+        new_index_document = cls._get_index_document(instance)
         new_values = new_index_document.to_dict(False, False)
-        existing_index_document.update(**new_values)
-        cls.refresh()
-
-    @classmethod
-    def _find_in_index(cls, instance_id):
-        search_result = search_by_id(instance_id, cls.index)
-        if search_result:
-            return cls.document.get(id=search_result["_id"])
-
-        raise NotFoundError(
-            "Document [%s] not found in index [%s]", instance_id, cls.index
+        existing_index_document = cls.document(meta={"id": str(instance.id)})
+        existing_index_document.update(
+            refresh=cls._refresh_param(refresh),
+            retry_on_conflict=RETRY_ON_CONFLICT,
+            **new_values,
         )
 
     @classmethod
-    def remove_from_index(cls, instance_id):
+    def remove_from_index(cls, instance_id, refresh=None):
         try:
-            existing_index_document = cls._find_in_index(instance_id)
-            existing_index_document.delete()
-            cls.refresh()
+            existing_index_document = cls.document(meta={"id": str(instance_id)})
+            existing_index_document.delete(refresh=cls._refresh_param(refresh))
         except ConnectionError as e:
             es_logging.log_connection_error_details(
                 e, type(cls.model).__name__, instance_id
@@ -184,33 +442,124 @@ class DocumentManager:
         return True
 
     @classmethod
-    def sync_in_index(cls, instance_id):
+    def sync_in_index(cls, instance_id, refresh=None):
         """
         Add, update, ignore, or remove indexing for the given instance, based on the conditions in should_be_indexed.
+        Documents are written or deleted directly by id, so syncing the same instance again has no further effect.
         When you know a model has been deleted, use remove_from_index for efficiency.
 
         NOTE that this will sync the index with the database state for the given ID, so you must
         commit your db transaction FIRST.
         """
         try:
-            instance = cls.model.objects.get(pk=instance_id)
+            instance = cls._get_all_instances().get(pk=instance_id)
         except ObjectDoesNotExist:
-            return cls.remove_from_index(instance_id)
+            return cls.remove_from_index(instance_id, refresh)
 
         if cls.should_be_indexed(instance):
-            try:
-                cls._update_in_index(instance)
-            except ConnectionError as e:
-                es_logging.log_connection_error(e, instance)
-            except NotFoundError:
-                cls.add_to_index(instance)
-            except Exception as e:
-                es_logging.log_fallback_exception(e, instance)
+            cls.add_to_index(instance, refresh)
         else:
-            cls.remove_from_index(instance_id)
+            cls.remove_from_index(instance_id, refresh)
 
     @classmethod
-    def add_all(cls, es):
+    def bulk_sync_in_index(cls, instance_ids, refresh=None):
+        """
+        Adds, updates, or removes the documents for the given instance IDs in one bulk request, based on the
+        conditions in should_be_indexed. Like sync_in_index, this must run after the db transaction is committed.
+        """
+        bulk_actions = []
+        indexed_ids = set()
+        for instance in cls._get_all_instances().filter(pk__in=instance_ids):
+            if cls.should_be_indexed(instance):
+                bulk_actions.append(cls._get_index_document(instance).to_dict(True))
+                indexed_ids.add(str(instance.id))
+
+        bulk_actions.extend(
+            cls._delete_action(instance_id)
+            for instance_id in instance_ids
+            if str(instance_id) not in indexed_ids
+        )
+        cls._send_bulk(instance_ids, bulk_actions, refresh)
+
+    @classmethod
+    def bulk_update_in_index(cls, instance_ids, refresh=None):
+        """
+        Updates the existing documents for the given instance IDs in one bulk request. Instances that are not
+        already indexed are ignored.
+        """
+        bulk_actions = []
+        updated_ids = set()
+        for instance in cls._get_all_instances().filter(pk__in=instance_ids):
+            if cls.should_be_indexed(instance):
+                bulk_actions.append(cls._update_action(instance))
+                updated_ids.add(str(instance.id))
+
+        bulk_actions.extend(
+            cls._delete_action(instance_id)
+            for instance_id in instance_ids
+            if str(instance_id) not in updated_ids
+        )
+        cls._send_bulk(instance_ids, bulk_actions, refresh)
+
+    @classmethod
+    def bulk_remove_from_index(cls, instance_ids, refresh=None):
+        """
+        Removes the documents for the given instance IDs in one bulk request.
+        """
+        cls._send_bulk(
+            instance_ids,
+            [cls._delete_action(instance_id) for instance_id in instance_ids],
+            refresh,
+        )
+
+    @classmethod
+    def _update_action(cls, instance):
+        return {
+            "_op_type": "update",
+            "_index": cls.index,
+            "_id": str(instance.id),
+            "doc": cls._get_index_document(instance).to_dict(False, False),
+            "retry_on_conflict": RETRY_ON_CONFLICT,
+        }
+
+    @classmethod
+    def _delete_action(cls, instance_id):
+        return {"_op_type": "delete", "_index": cls.index, "_id": str(instance_id)}
+
+    @classmethod
+    def _send_bulk(cls, instance_ids, bulk_actions, refresh=None):
+        """
+        Sends the actions in one bulk request. Documents that are not indexed can't be updated or deleted, and
+        those errors are ignored.
+        """
+        if not bulk_actions:
+            return
+
+        try:
+            _, errors = actions.bulk(
+                connections.get_connection(),
+                bulk_actions,
+                raise_on_error=False,
+                refresh=cls._refresh_param(refresh),
+            )
+            errors = [
+                error
+                for error in errors
+                if next(iter(error.values())).get("status") != 404
+            ]
+            if errors:
+                es_logging.log_fallback_exception_details(
+                    errors, cls.model.__name__, instance_ids
+                )
+        except ConnectionError as e:
+            es_logging.log_connection_error_details(e, cls.model.__name__, instance_ids)
+        except Exception as e:
+            es_logging.log_fallback_exception_details(
+                e, cls.model.__name__, instance_ids
+            )
+
+    @classmethod
+    def add_all(cls, es, chunk_size=500):
         """
         Adds all documents to the index, via the provided ElasticSearch Connection.
         """
@@ -220,22 +569,247 @@ class DocumentManager:
             cls.model.__name__,
             cls.index,
         )
-        actions.bulk(es, cls._iterator())
+        actions.bulk(es, cls._iterator(), chunk_size=chunk_size)
+        es_logging.logger.info(
+            "Finished adding all indexable [%s] instances to [%s] index",
+            cls.model.__name__,
+            cls.index,
+        )
+
+    @classmethod
+    def add_all_parallel(cls, es, workers, chunk_size=500):
+        """
+        Adds all documents to the index using a pool of worker processes. The primary keys are split into
+        ranges, and each range is added by one worker with parallel_bulk (see add_range).
+
+        Daemon processes (such as celery prefork workers) can't start child processes, so they add all
+        documents in-process instead.
+        """
+        if multiprocessing.current_process().daemon:
+            return cls.add_all(es, chunk_size)
+
+        es_logging.logger.info(
+            "Adding all indexable [%s] instances to [%s] index with [%s] workers",
+            cls.model.__name__,
+            cls.index,
+            workers,
+        )
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_rebuild_worker,
+        ) as executor:
+            futures = [
+                executor.submit(_add_pk_range, cls, low, high, chunk_size)
+                for low, high in get_pk_ranges(workers * cls.ranges_per_worker)
+            ]
+            # raises the first error from any worker
+            for future in futures:
+                future.result()
         es_logging.logger.info(
             "Finished adding all indexable [%s] instances to [%s] index",
             cls.model.__name__,
             cls.index,
         )
 
+    @classmethod
+    def add_range(cls, es, low, high, chunk_size=500):
+        """
+        Adds the documents for instances with primary keys from low (inclusive) to high (exclusive, or no upper
+        bound if None), sending bulk requests from several threads.
+        """
+        instances = cls._get_all_instances().filter(pk__gte=low)
+        if high is not None:
+            instances = instances.filter(pk__lt=high)
+
+        # parallel_bulk is lazy, so the results need to be consumed. Failures raise a BulkIndexError.
+        for _ in actions.parallel_bulk(
+            es, cls._iterator(instances), chunk_size=chunk_size
+        ):
+            pass
+
+    @classmethod
+    def sync_site(cls, es, site_id, chunk_size=500):
+        """
+        Adds or replaces the documents for all of a site's indexable instances, streaming the instances from the
+        database in chunks and writing them with streaming_bulk. Returns the time the sync started, or None if any
+        document could not be written. Documents for the site written before that time are stale, see
+        stale_site_documents_query.
+        """
+        started = timezone.now()
+        instances = cls._get_all_instances().filter(site_id=site_id)
+
+        errors = [
+            item
+            for ok, item in actions.streaming_bulk(
+                es,
+                cls._iterator(instances),
+                chunk_size=chunk_size,
+                raise_on_error=False,
+            )
+            if not ok
+        ]
+        if errors:
+            es_logging.logger.error(
+                "Errors syncing [%s] documents for site [%s]. Errors: [%s]",
+                cls.model.__name__,
+                site_id,
+                errors,
+            )
+            return None
+        return started
+
+    @classmethod
+    def stale_site_documents_query(cls, site_id, indexed_before):
+        """
+        Returns a query for the site's documents of this type that were written before the given time, or before
+        documents recorded when they were written.
+        """
+        return {
+            "bool": {
+                "filter": [
+                    {"term": {"site_id": str(site_id)}},
+                    {"term": {"document_type": cls.model.__name__}},
+                ],
+                "should": [
+                    {"range": {"indexed_at": {"lt": indexed_before.isoformat()}}},
+                    {"bool": {"must_not": {"exists": {"field": "indexed_at"}}}},
+                ],
+                "minimum_should_match": 1,
+            }
+        }
+
+    @classmethod
+    def reindex_since(cls, es, since, chunk_size=500):
+        """
+        Rewrites the documents for instances modified after the given time, and removes those that should no longer
+        be indexed. Instances are paged through in order of (system_last_modified, id), continuing after the last
+        instance of each page. Returns False if any document could not be written.
+        """
+        instances = cls._get_all_instances().order_by("system_last_modified", "id")
+        page = list(instances.filter(system_last_modified__gt=since)[:chunk_size])
+        completed = True
+
+        while page:
+            bulk_actions = [
+                (
+                    cls._get_index_document(instance).to_dict(True)
+                    if cls.should_be_indexed(instance)
+                    else cls._delete_action(instance.id)
+                )
+                for instance in page
+            ]
+            completed &= cls._send_catch_up_bulk(es, bulk_actions)
+
+            last = page[-1]
+            page = list(
+                instances.filter(
+                    Q(system_last_modified__gt=last.system_last_modified)
+                    | Q(system_last_modified=last.system_last_modified, id__gt=last.id)
+                )[:chunk_size]
+            )
+
+        return completed
+
+    @classmethod
+    def remove_deleted(cls, es):
+        """
+        Removes documents for instances that no longer exist, by comparing the ids in the index with the ids in the
+        database. Site content is compared one site at a time. Returns False if any document could not be deleted.
+        """
+        if not any(field.name == "site" for field in cls.model._meta.get_fields()):
+            return cls._remove_missing(es, [], cls.model.objects.all())
+
+        site_model = cls.model._meta.get_field("site").related_model
+        completed = True
+        for site_id in site_model.objects.values_list("id", flat=True):
+            completed &= cls._remove_missing(
+                es,
+                [{"term": {"site_id": str(site_id)}}],
+                cls.model.objects.filter(site_id=site_id),
+            )
+        return completed
+
+    @classmethod
+    def _remove_missing(cls, es, filters, instances):
+        query = {
+            "bool": {
+                "filter": [{"term": {"document_type": cls.model.__name__}}, *filters]
+            }
+        }
+        indexed_ids = {
+            hit["_id"]
+            for hit in actions.scan(
+                es, index=cls.index, query={"query": query, "_source": False}
+            )
+        }
+        if not indexed_ids:
+            return True
+
+        existing_ids = {str(pk) for pk in instances.values_list("pk", flat=True)}
+        return cls._send_catch_up_bulk(
+            es,
+            [
+                cls._delete_action(instance_id)
+                for instance_id in indexed_ids - existing_ids
+            ],
+        )
+
+    @classmethod
+    def _send_catch_up_bulk(cls, es, bulk_actions):
+        """Sends the actions for reindex_since, ignoring deletes of documents that are not indexed."""
+        if not bulk_actions:
+            return True
+
+        _, errors = actions.bulk(es, bulk_actions, raise_on_error=False)
+        errors = [
+            error for error in errors if next(iter(error.values())).get("status") != 404
+        ]
+        if errors:
+            es_logging.logger.error(
+                "Errors reindexing [%s] documents. Errors: [%s]",
+                cls.model.__name__,
+                errors,
+            )
+            return False
+        return True
+
     @classmethod
     def _get_all_instances(cls):
+        """
+        Returns all instances of the model. Subclasses can override to eager load the related data used by
+        create_index_document, so that documents can be created without further queries per instance.
+        """
         return cls.model.objects.all()
 
     @classmethod
-    def _iterator(cls):
-        instances = cls._get_all_instances()
+    def related_exists_annotations(cls, *field_names):
+        """
+        Returns annotations for _get_all_instances, flagging whether each instance has objects in the given
+        many-to-many fields. See has_related.
+        """
+        return {
+            f"has_{field_name}": related_exists(cls.model, field_name)
+            for field_name in field_names
+        }
+
+    @staticmethod
+    def has_related(instance, field_name):
+        """
+        Returns whether the instance has objects in the given many-to-many field, using the annotation from
+        related_exists_annotations if the instance has one.
+        """
+        annotation = f"has_{field_name}"
+        if hasattr(instance, annotation):
+            return getattr(instance, annotation)
+        return getattr(instance, field_name).exists()
+
+    @classmethod
+    def _iterator(cls, instances=None):
+        if instances is None:
+            instances = cls._get_all_instances()
 
-        for instance in instances:
+        for instance in instances.iterator(chunk_size=cls.iterator_chunk_size):
             if cls.should_be_indexed(instance):
-                index_document = cls.create_index_document(instance)
+                index_document = cls._get_index_document(instance)
                 yield index_document.to_dict(True)
@@ -1,11 +1,13 @@
-from backend.models import DictionaryEntry
+from django.db.models import Prefetch
+
+from backend.models import Category, DictionaryEntry
+from backend.models.media import Audio, Person
 from backend.search.constants import (
     ELASTICSEARCH_DICTIONARY_ENTRY_INDEX,
     UNKNOWN_CHARACTER_FLAG,
 )
 from backend.search.documents import DictionaryEntryDocument
 from backend.search.indexing.base import DocumentManager, IndexManager
-from backend.utils.as_list import fields_as_list
 
 
 class DictionaryEntryDocumentManager(DocumentManager):
@@ -13,6 +15,29 @@ class DictionaryEntryDocumentManager(DocumentManager):
     document = DictionaryEntryDocument
     model = DictionaryEntry
 
+    @classmethod
+    def _get_all_instances(cls):
+        return (
+            cls.model.objects.select_related("site")
+            .annotate(
+                **cls.related_exists_annotations(
+                    "related_documents",
+                    "related_images",
+                    "related_videos",
+                    "related_dictionary_entries",
+                )
+            )
+            .prefetch_related(
+                Prefetch("categories", queryset=Category.objects.only("id")),
+                Prefetch(
+                    "related_audio",
+                    queryset=Audio.objects.only("id").prefetch_related(
+                        Prefetch("speakers", queryset=Person.objects.only("id"))
+                    ),
+                ),
+            )
+        )
+
     @classmethod
     def create_index_document(cls, instance: DictionaryEntry):
         """Returns a DictionaryEntryDocument populated for the given DictionaryEntry instance."""
@@ -30,7 +55,7 @@ class DictionaryEntryDocumentManager(DocumentManager):
         return cls.document(
             document_id=str(instance.id),
             document_type=type(instance).__name__,
-            site_id=str(instance.site.id),
+            site_id=str(instance.site_id),
             site_visibility=instance.site.visibility,
             title=instance.title,
             type=instance.type,
@@ -38,26 +63,24 @@ class DictionaryEntryDocumentManager(DocumentManager):
             acknowledgement=instance.acknowledgements,
             alternate_spelling=instance.alternate_spellings,
             note=instance.notes,
-            categories=fields_as_list(instance.categories, "id"),
-            import_job_id=instance.import_job.id if instance.import_job else None,
-            external_system=(
-                instance.external_system.id if instance.external_system else None
-            ),
+            categories=[str(category.id) for category in instance.categories.all()],
+            import_job_id=instance.import_job_id,
+            external_system=instance.external_system_id,
             exclude_from_kids=instance.exclude_from_kids,
             exclude_from_games=instance.exclude_from_games,
             custom_order=instance.custom_order,
             visibility=instance.visibility,
             has_audio=has_audio,
-            has_document=instance.related_documents.exists(),
-            has_image=instance.related_images.exists(),
-            has_video=instance.related_videos.exists()
+            has_document=cls.has_related(instance, "related_documents"),
+            has_image=cls.has_related(instance, "related_images"),
+            has_video=cls.has_related(instance, "related_videos")
             or bool(instance.related_video_links),
             created=instance.created,
             last_modified=instance.last_modified,
             has_translation=(len(instance.translations) > 0),
             has_unrecognized_chars=UNKNOWN_CHARACTER_FLAG in instance.custom_order,
             has_categories=instance.categories.exists(),
-            has_related_entries=instance.related_dictionary_entries.exists(),
+            has_related_entries=cls.has_related(instance, "related_dictionary_entries"),
             speakers=speakers,
         )
 
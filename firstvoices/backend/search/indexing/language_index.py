@@ -11,6 +11,10 @@ class LanguageDocumentManager(DocumentManager):
     document = LanguageDocument
     model = Language
 
+    @classmethod
+    def _get_all_instances(cls):
+        return cls.model.objects.select_related("language_family")
+
     @classmethod
     def create_index_document(cls, instance: Language):
         """Returns a LanguageDocument populated for the given Language instance."""
@@ -47,6 +51,10 @@ class SiteDocumentManager(DocumentManager):
     document = LanguageDocument
     model = Site
 
+    @classmethod
+    def _get_all_instances(cls):
+        return cls.model.objects.select_related("language")
+
     @classmethod
     def create_index_document(cls, instance: Site):
         """Returns a LanguageDocument populated for the given Site instance, with the assumption that the Site has
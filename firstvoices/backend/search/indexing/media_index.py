@@ -1,5 +1,7 @@
+from django.db.models import Prefetch
+
 from backend.models.constants import Visibility
-from backend.models.media import Audio, Document, Image, Video
+from backend.models.media import Audio, Document, Image, Person, Video
 from backend.search.constants import ELASTICSEARCH_MEDIA_INDEX
 from backend.search.documents import MediaDocument
 from backend.search.indexing.base import DocumentManager, IndexManager
@@ -10,6 +12,12 @@ class MediaDocumentManager(DocumentManager):
     document = MediaDocument
     model = None
 
+    @classmethod
+    def _get_all_instances(cls):
+        return cls.model.objects.select_related("site", "original").prefetch_related(
+            "site__sitefeature_set"
+        )
+
     @classmethod
     def create_index_document(cls, instance):
         """Returns a MediaDocument populated for the given media instance."""
@@ -23,13 +31,13 @@ class MediaDocumentManager(DocumentManager):
         return cls.document(
             document_id=str(instance.id),
             document_type=type(instance).__name__,
-            site_id=str(instance.site.id),
+            site_id=str(instance.site_id),
             site_visibility=instance.site.visibility,
-            site_features=list(
-                instance.site.sitefeature_set.filter(is_enabled=True).values_list(
-                    "key", flat=True
-                )
-            ),
+            site_features=[
+                feature.key
+                for feature in instance.site.sitefeature_set.all()
+                if feature.is_enabled
+            ],
             visibility=Visibility.PUBLIC,
             title=instance.title,
             filename=instance_filename,
@@ -45,12 +53,18 @@ class MediaDocumentManager(DocumentManager):
 class AudioDocumentManager(MediaDocumentManager):
     model = Audio
 
+    @classmethod
+    def _get_all_instances(cls):
+        return (
+            super()
+            ._get_all_instances()
+            .prefetch_related(Prefetch("speakers", queryset=Person.objects.only("id")))
+        )
+
     @classmethod
     def create_index_document(cls, instance):
         document = super().create_index_document(instance)
-        document.speakers = list(
-            map(str, instance.speakers.values_list("id", flat=True))
-        )
+        document.speakers = [str(speaker.id) for speaker in instance.speakers.all()]
         return document
 
 
@@ -2,7 +2,6 @@ from backend.models import Song
 from backend.search.constants import ELASTICSEARCH_SONG_INDEX
 from backend.search.documents import SongDocument
 from backend.search.indexing.base import DocumentManager, IndexManager
-from backend.utils.as_list import fields_as_list
 
 
 class SongDocumentManager(DocumentManager):
@@ -10,13 +9,28 @@ class SongDocumentManager(DocumentManager):
     document = SongDocument
     model = Song
 
+    @classmethod
+    def _get_all_instances(cls):
+        return (
+            cls.model.objects.select_related("site")
+            .annotate(
+                **cls.related_exists_annotations(
+                    "related_audio",
+                    "related_documents",
+                    "related_images",
+                    "related_videos",
+                )
+            )
+            .prefetch_related("lyrics")
+        )
+
     @classmethod
     def create_index_document(cls, instance: Song):
         """Returns a SongDocument populated for the given Song instance."""
         return cls.document(
             document_id=str(instance.id),
             document_type=type(instance).__name__,
-            site_id=str(instance.site.id),
+            site_id=str(instance.site_id),
             site_visibility=instance.site.visibility,
             visibility=instance.visibility,
             title=instance.title,
@@ -24,14 +38,16 @@ class SongDocumentManager(DocumentManager):
             has_translation=bool(instance.title_translation),
             intro_title=instance.introduction,
             intro_translation=instance.introduction_translation,
-            lyrics_text=fields_as_list(instance.lyrics, "text"),
-            lyrics_translation=fields_as_list(instance.lyrics, "translation"),
+            lyrics_text=[str(lyric.text) for lyric in instance.lyrics.all()],
+            lyrics_translation=[
+                str(lyric.translation) for lyric in instance.lyrics.all()
+            ],
             note=instance.notes,
             acknowledgement=instance.acknowledgements,
-            has_audio=instance.related_audio.exists(),
-            has_document=instance.related_documents.exists(),
-            has_image=instance.related_images.exists(),
-            has_video=instance.related_videos.exists()
+            has_audio=cls.has_related(instance, "related_audio"),
+            has_document=cls.has_related(instance, "related_documents"),
+            has_image=cls.has_related(instance, "related_images"),
+            has_video=cls.has_related(instance, "related_videos")
             or bool(instance.related_video_links),
             exclude_from_games=instance.exclude_from_games,
             exclude_from_kids=instance.exclude_from_kids,
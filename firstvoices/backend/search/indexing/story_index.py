@@ -2,7 +2,6 @@ from backend.models import Story
 from backend.search.constants import ELASTICSEARCH_STORY_INDEX
 from backend.search.documents import StoryDocument
 from backend.search.indexing.base import DocumentManager, IndexManager
-from backend.utils.as_list import fields_as_list
 
 
 class StoryDocumentManager(DocumentManager):
@@ -10,13 +9,28 @@ class StoryDocumentManager(DocumentManager):
     document = StoryDocument
     model = Story
 
+    @classmethod
+    def _get_all_instances(cls):
+        return (
+            cls.model.objects.select_related("site")
+            .annotate(
+                **cls.related_exists_annotations(
+                    "related_audio",
+                    "related_documents",
+                    "related_images",
+                    "related_videos",
+                )
+            )
+            .prefetch_related("pages")
+        )
+
     @classmethod
     def create_index_document(cls, instance: Story):
         """Returns a SongDocument populated for the given Song instance."""
         return cls.document(
             document_id=str(instance.id),
             document_type=type(instance).__name__,
-            site_id=str(instance.site.id),
+            site_id=str(instance.site_id),
             site_visibility=instance.site.visibility,
             visibility=instance.visibility,
             title=instance.title,
@@ -24,15 +38,15 @@ class StoryDocumentManager(DocumentManager):
             has_translation=bool(instance.title_translation),
             intro_title=instance.introduction,
             intro_translation=instance.introduction_translation,
-            page_text=fields_as_list(instance.pages, "text"),
-            page_translation=fields_as_list(instance.pages, "translation"),
+            page_text=[str(page.text) for page in instance.pages.all()],
+            page_translation=[str(page.translation) for page in instance.pages.all()],
             author=instance.author,
             note=instance.notes,
             acknowledgement=instance.acknowledgements,
-            has_audio=instance.related_audio.exists(),
-            has_document=instance.related_documents.exists(),
-            has_image=instance.related_images.exists(),
-            has_video=instance.related_videos.exists()
+            has_audio=cls.has_related(instance, "related_audio"),
+            has_document=cls.has_related(instance, "related_documents"),
+            has_image=cls.has_related(instance, "related_images"),
+            has_video=cls.has_related(instance, "related_videos")
             or bool(instance.related_video_links),
             exclude_from_games=instance.exclude_from_games,
             exclude_from_kids=instance.exclude_from_kids,
@@ -1,10 +1,13 @@
-from django.db.models.signals import post_delete, pre_save
+import threading
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from backend.models.sites import Site
+from backend.models.sites import Site, SiteFeature
 from backend.search.tasks.site_content_indexing_tasks import (
     request_remove_all_site_content_from_indexes,
-    request_sync_all_site_content_in_indexes,
+    request_update_site_visibility_in_indexes,
 )
 
 
@@ -15,6 +18,10 @@ def change_site_visibility(sender, instance, **kwargs):
         # new site, no changes needed
         return
 
+    if indexing_signals_paused(instance):
+        # the content is reindexed when indexing resumes
+        return
+
     original_site = Site.objects.filter(id=instance.id)
 
     if (not original_site.exists()) or (
@@ -23,28 +30,58 @@ def change_site_visibility(sender, instance, **kwargs):
         # no changes needed
         return
 
-    request_sync_all_site_content_in_indexes(instance)
+    request_update_site_visibility_in_indexes(instance)
 
 
 # If a site is deleted, delete all docs from index related to site
 @receiver(post_delete, sender=Site)
 def remove_all_site_content(sender, instance, **kwargs):
-    site_title = instance.title
-    site_content_ids = {
-        "dictionaryentry_set": list(
-            instance.dictionaryentry_set.values_list("id", flat=True)
-        ),
-        "song_set": list(instance.song_set.values_list("id", flat=True)),
-        "story_set": list(instance.story_set.values_list("id", flat=True)),
-        "audio_set": list(instance.audio_set.values_list("id", flat=True)),
-        "document_set": list(instance.document_set.values_list("id", flat=True)),
-        "image_set": list(instance.image_set.values_list("id", flat=True)),
-        "video_set": list(instance.video_set.values_list("id", flat=True)),
-    }
-    request_remove_all_site_content_from_indexes(site_title, site_content_ids)
+    request_remove_all_site_content_from_indexes(instance.title, instance.id)
+
+
+_local = threading.local()
+
+
+def _get_indexing_paused_memo():
+    """
+    Returns the indexing_signals_paused results for the current transaction, by site id, or None outside a
+    transaction. The memo is dropped when the transaction commits or is rolled back.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return None
+
+    memo = getattr(_local, "indexing_paused_memo", None)
+    if memo is None or not any(
+        callback == memo.clear for _, callback, _ in connection.run_on_commit
+    ):
+        memo = {}
+        _local.indexing_paused_memo = memo
+        transaction.on_commit(memo.clear)
+    return memo
 
 
 def indexing_signals_paused(site):
-    if not site.sitefeature_set.filter(key="indexing_paused").exists():
-        return False
-    return site.sitefeature_set.get(key="indexing_paused").is_enabled
+    """
+    True if the site's indexing_paused feature is enabled. The result is memoized for the rest of the transaction,
+    so the many signals fired while importing or editing content only query it once.
+    """
+    memo = _get_indexing_paused_memo()
+    if memo is not None and site.id in memo:
+        return memo[site.id]
+
+    paused = SiteFeature.objects.filter(
+        site_id=site.id, key="indexing_paused", is_enabled=True
+    ).exists()
+    if memo is not None:
+        memo[site.id] = paused
+    return paused
+
+
+@receiver(post_save, sender=SiteFeature)
+@receiver(post_delete, sender=SiteFeature)
+def reset_indexing_signals_paused(sender, instance, **kwargs):
+    """When a site pauses or resumes indexing, forget its memoized indexing_signals_paused result"""
+    memo = getattr(_local, "indexing_paused_memo", None)
+    if memo and instance.key == "indexing_paused":
+        memo.pop(instance.site_id, None)
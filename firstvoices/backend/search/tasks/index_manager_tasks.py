@@ -1,12 +1,51 @@
+import threading
+
 from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.db import transaction
 
 from backend.search import es_logging, indexing
-from backend.search.indexing import DocumentManager
+from backend.search.constants import RefreshPolicy
+from backend.search.indexing import (
+    DictionaryIndexManager,
+    DocumentManager,
+    LanguageIndexManager,
+    MediaIndexManager,
+    SongIndexManager,
+    StoryIndexManager,
+)
+from backend.search.indexing.base import get_refresh_policy
 from backend.tasks.constants import ASYNC_TASK_END_TEMPLATE, ASYNC_TASK_START_TEMPLATE
 from firstvoices.celery import link_error_handler
 
+# Maximum number of instances synced by each bulk indexing task
+BULK_INDEXING_CHUNK_SIZE = 500
+
+# Bulk operations and their document manager methods, in order of precedence. When several are requested for
+# the same instance in one transaction, only the one that comes first is run.
+BULK_OPERATIONS = {
+    "remove": "bulk_remove_from_index",
+    "sync": "bulk_sync_in_index",
+    "update": "bulk_update_in_index",
+}
+BULK_OPERATION_PRECEDENCE = list(BULK_OPERATIONS)
+
+# Refresh policies from weakest to strongest. A buffer is flushed with the strongest policy requested for it.
+REFRESH_POLICY_STRENGTH = [
+    RefreshPolicy.NONE,
+    RefreshPolicy.WAIT_FOR,
+    RefreshPolicy.TRUE,
+]
+
+# Index managers caught up by the periodic reindex_since_watermark task
+INDEX_MANAGERS = [
+    LanguageIndexManager,
+    SongIndexManager,
+    StoryIndexManager,
+    MediaIndexManager,
+    DictionaryIndexManager,
+]
+
 
 def _get_manager(manager_name: str) -> DocumentManager:
     if not hasattr(indexing, manager_name):
@@ -67,29 +106,129 @@ def remove_from_index(document_manager_name, instance_id):
     logger.info(ASYNC_TASK_END_TEMPLATE)
 
 
-# convenience methods for calling the async tasks
+@shared_task
+def bulk_index(
+    document_manager_name, operation, instance_ids, refresh=RefreshPolicy.NONE
+):
+    logger = get_task_logger(__name__)
+    logger.info(
+        ASYNC_TASK_START_TEMPLATE,
+        f"document_manager_name: {document_manager_name}, operation: {operation}, "
+        f"instance count: {len(instance_ids)}, refresh: {refresh}",
+    )
+
+    document_manager = _get_manager(document_manager_name)
+    if document_manager:
+        getattr(document_manager, BULK_OPERATIONS[operation])(
+            instance_ids, refresh=RefreshPolicy(refresh)
+        )
+
+    logger.info(ASYNC_TASK_END_TEMPLATE)
+
+
+@shared_task
+def reindex_since_watermark():
+    """Catches every index up with the changes made since its watermark, see IndexManager.reindex_since."""
+    logger = get_task_logger(__name__)
+    logger.info(ASYNC_TASK_START_TEMPLATE, "all indices")
+
+    for index_manager in INDEX_MANAGERS:
+        index_manager.reindex_since()
 
+    logger.info(ASYNC_TASK_END_TEMPLATE)
 
-def request_index_task(task, document_manager, instance):
-    instance_id = instance.id
-    transaction.on_commit(
-        lambda: task.apply_async(
-            (
-                document_manager.__name__,
-                instance_id,
-            ),
-            link_error=link_error_handler.s(),
+
+class IndexingBuffer:
+    """
+    Collects the indexing operations requested during a database transaction, so that they can be sent as a few
+    bulk_index tasks when it commits, instead of one task per saved instance.
+    """
+
+    def __init__(self):
+        # (document manager name, instance id) -> operation, in the order they were first requested
+        self.operations = {}
+        self.refresh = RefreshPolicy.NONE
+        self.flushed = False
+
+    def add(self, document_manager, instance_id, operation, refresh=RefreshPolicy.NONE):
+        if REFRESH_POLICY_STRENGTH.index(refresh) > REFRESH_POLICY_STRENGTH.index(
+            self.refresh
+        ):
+            self.refresh = refresh
+
+        key = (document_manager.__name__, instance_id)
+        current = self.operations.get(key)
+        if current is None or BULK_OPERATION_PRECEDENCE.index(
+            operation
+        ) < BULK_OPERATION_PRECEDENCE.index(current):
+            self.operations[key] = operation
+
+    def is_pending(self, connection):
+        """
+        True if this buffer has not been flushed and a flush is still scheduled. A rollback discards the
+        scheduled flushes, and with them the operations for the rolled back changes.
+        """
+        return not self.flushed and any(
+            getattr(callback, "__self__", None) is self
+            for _, callback, _ in connection.run_on_commit
         )
-    )
+
+    def flush(self):
+        if self.flushed:
+            return
+        self.flushed = True
+
+        grouped = {}
+        for (manager_name, instance_id), operation in self.operations.items():
+            grouped.setdefault((manager_name, operation), []).append(instance_id)
+
+        for (manager_name, operation), instance_ids in grouped.items():
+            for start in range(0, len(instance_ids), BULK_INDEXING_CHUNK_SIZE):
+                end = start + BULK_INDEXING_CHUNK_SIZE
+                bulk_index.apply_async(
+                    (manager_name, operation, instance_ids[start:end], self.refresh),
+                    link_error=link_error_handler.s(),
+                )
+
+
+_local = threading.local()
+
+
+def get_indexing_buffer():
+    """
+    Returns the indexing buffer for the current transaction, starting a new one if the last was already
+    flushed or rolled back.
+    """
+    connection = transaction.get_connection()
+    buffer = getattr(_local, "indexing_buffer", None)
+    if buffer is None or not buffer.is_pending(connection):
+        buffer = IndexingBuffer()
+        _local.indexing_buffer = buffer
+    return buffer
+
+
+# convenience methods for calling the async tasks
+
+
+def request_index_task(operation, document_manager, instance):
+    """
+    Adds the operation to the indexing buffer for the current transaction. The buffer is flushed by the first of
+    its on_commit callbacks to run, so a flush is scheduled with each request in case earlier ones are discarded
+    by a savepoint rollback. Outside a transaction, the operation is sent right away. The refresh policy is taken
+    from the context of the request, see index_refresh_policy.
+    """
+    buffer = get_indexing_buffer()
+    buffer.add(document_manager, instance.id, operation, get_refresh_policy())
+    transaction.on_commit(buffer.flush)
 
 
 def request_sync_in_index(document_manager, instance):
-    request_index_task(sync_in_index, document_manager, instance)
+    request_index_task("sync", document_manager, instance)
 
 
 def request_update_in_index(document_manager, instance):
-    request_index_task(update_in_index, document_manager, instance)
+    request_index_task("update", document_manager, instance)
 
 
 def request_remove_from_index(document_manager, instance):
-    request_index_task(remove_from_index, document_manager, instance)
+    request_index_task("remove", document_manager, instance)
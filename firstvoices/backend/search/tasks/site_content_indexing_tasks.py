@@ -1,46 +1,61 @@
 from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.db import transaction
+from elasticsearch.dsl import connections
 
 from backend.models import Site
 from backend.search.indexing import (
-    AudioDocumentManager,
-    DictionaryEntryDocumentManager,
-    DocumentDocumentManager,
-    ImageDocumentManager,
-    SongDocumentManager,
-    StoryDocumentManager,
-    VideoDocumentManager,
+    DictionaryIndexManager,
+    MediaIndexManager,
+    SongIndexManager,
+    StoryIndexManager,
 )
 from backend.tasks.constants import ASYNC_TASK_END_TEMPLATE, ASYNC_TASK_START_TEMPLATE
 from firstvoices.celery import link_error_handler
 
+# Indexes with documents for site content. Media documents are always public, so only their site visibility changes.
+CONTENT_VISIBILITY_INDEX_MANAGERS = [
+    DictionaryIndexManager,
+    SongIndexManager,
+    StoryIndexManager,
+]
+SITE_CONTENT_INDEX_MANAGERS = CONTENT_VISIBILITY_INDEX_MANAGERS + [MediaIndexManager]
 
-# special tasks for bulk Site content indexing actions
-def remove_all(document_manager, queryset):
-    for instance_id in queryset:
-        document_manager.remove_from_index(instance_id)
+UPDATE_VISIBILITY_SCRIPT = """
+ctx._source.site_visibility = params.site_visibility;
+if (params.to_visibility != null && ctx._source.visibility == params.from_visibility) {
+    ctx._source.visibility = params.to_visibility;
+}
+"""
 
 
+# special tasks for bulk Site content indexing actions
 @shared_task
-def remove_all_site_content_from_indexes(site_title, site_content_ids):
+def remove_all_site_content_from_indexes(site_title, site_id):
+    """Deletes all documents for the site's content from the indexes, with a delete_by_query on each index."""
     logger = get_task_logger(__name__)
     logger.info(ASYNC_TASK_START_TEMPLATE, f"site: {site_title}")
 
-    remove_all(DictionaryEntryDocumentManager, site_content_ids["dictionaryentry_set"])
-    remove_all(SongDocumentManager, site_content_ids["song_set"])
-    remove_all(StoryDocumentManager, site_content_ids["story_set"])
-    remove_all(AudioDocumentManager, site_content_ids["audio_set"])
-    remove_all(DocumentDocumentManager, site_content_ids["document_set"])
-    remove_all(ImageDocumentManager, site_content_ids["image_set"])
-    remove_all(VideoDocumentManager, site_content_ids["video_set"])
+    query = {"term": {"site_id": str(site_id)}}
+    for manager in SITE_CONTENT_INDEX_MANAGERS:
+        manager.delete_by_query(query)
 
     logger.info(ASYNC_TASK_END_TEMPLATE)
 
 
-def sync_all(document_manager, queryset):
-    for instance in queryset:
-        document_manager.sync_in_index(instance.id)
+def sync_all(index_manager, site_id):
+    """
+    Rewrites the documents for all of the site's content in the index, then deletes the site's documents that were
+    not rewritten, and refreshes the index once at the end.
+    """
+    es = connections.get_connection()
+    for document_manager in index_manager.document_managers:
+        indexed_from = document_manager.sync_site(es, site_id)
+        if indexed_from:
+            index_manager.delete_by_query(
+                document_manager.stale_site_documents_query(site_id, indexed_from)
+            )
+    index_manager.refresh()
 
 
 @shared_task
@@ -49,9 +64,9 @@ def sync_all_site_content_in_indexes(site_id):
     logger = get_task_logger(__name__)
     logger.info(ASYNC_TASK_START_TEMPLATE, f"site: {site}")
 
-    sync_all(DictionaryEntryDocumentManager, site.dictionaryentry_set.all())
-    sync_all(SongDocumentManager, site.song_set.all())
-    sync_all(StoryDocumentManager, site.story_set.all())
+    sync_all(DictionaryIndexManager, site_id)
+    sync_all(SongIndexManager, site_id)
+    sync_all(StoryIndexManager, site_id)
     sync_all_media_site_content_in_indexes(site_id)
 
     logger.info(ASYNC_TASK_END_TEMPLATE)
@@ -63,18 +78,60 @@ def sync_all_media_site_content_in_indexes(site_id):
     logger = get_task_logger(__name__)
     logger.info(ASYNC_TASK_START_TEMPLATE, f"site: {site}")
 
-    sync_all(AudioDocumentManager, site.audio_set.all())
-    sync_all(DocumentDocumentManager, site.document_set.all())
-    sync_all(ImageDocumentManager, site.image_set.all())
-    sync_all(VideoDocumentManager, site.video_set.all())
+    sync_all(MediaIndexManager, site_id)
 
     logger.info(ASYNC_TASK_END_TEMPLATE)
 
 
-def request_remove_all_site_content_from_indexes(site_title, site_content_ids):
+@shared_task
+def update_site_visibility_in_indexes(
+    site_id, from_visibility=None, to_visibility=None
+):
+    """
+    Sets the site visibility on all documents for the site's content and, if given, changes documents with
+    from_visibility to to_visibility, using an update_by_query on each index. Falls back to syncing all the site
+    content if an index was built with another mapping version, or an update did not complete.
+    """
+    site = Site.objects.get(id=site_id)
+    logger = get_task_logger(__name__)
+    logger.info(
+        ASYNC_TASK_START_TEMPLATE,
+        f"site: {site}, from_visibility: {from_visibility}, to_visibility: {to_visibility}",
+    )
+
+    if not all(
+        manager.has_current_mapping() for manager in SITE_CONTENT_INDEX_MANAGERS
+    ):
+        logger.info("Index mapping version differs, syncing all site content.")
+        sync_all_site_content_in_indexes(site_id)
+        logger.info(ASYNC_TASK_END_TEMPLATE)
+        return
+
+    query = {"term": {"site_id": str(site_id)}}
+    updated = True
+    for manager in SITE_CONTENT_INDEX_MANAGERS:
+        params = {
+            "site_visibility": site.visibility,
+            "from_visibility": None,
+            "to_visibility": None,
+        }
+        if manager in CONTENT_VISIBILITY_INDEX_MANAGERS:
+            params.update(from_visibility=from_visibility, to_visibility=to_visibility)
+        updated = manager.update_by_query(query, UPDATE_VISIBILITY_SCRIPT, params)
+        if not updated:
+            break
+
+    if not updated:
+        logger.info("Visibility update did not complete, syncing all site content.")
+        sync_all_site_content_in_indexes(site_id)
+
+    logger.info(ASYNC_TASK_END_TEMPLATE)
+
+
+def request_remove_all_site_content_from_indexes(site_title, site_id):
     transaction.on_commit(
         lambda: remove_all_site_content_from_indexes.apply_async(
-            (site_title, site_content_ids),
+            (site_title, site_id),
             link_error=link_error_handler.s(),
         )
     )
@@ -89,6 +146,17 @@ def request_sync_all_site_content_in_indexes(site):
     )
 
 
+def request_update_site_visibility_in_indexes(
+    site, from_visibility=None, to_visibility=None
+):
+    transaction.on_commit(
+        lambda: update_site_visibility_in_indexes.apply_async(
+            (site.id, from_visibility, to_visibility),
+            link_error=link_error_handler.s(),
+        )
+    )
+
+
 def request_sync_all_media_site_content_in_indexes(site):
     transaction.on_commit(
         lambda: sync_all_media_site_content_in_indexes.apply_async(
@@ -1,5 +1,3 @@
-import logging
-
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
@@ -185,8 +183,6 @@ class DictionaryEntryDetailSerializer(
 
     is_immersion_label = serializers.SerializerMethodField(read_only=True)
 
-    logger = logging.getLogger(__name__)
-
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -234,90 +230,6 @@ class DictionaryEntryDetailSerializer(
                     )
         return super().validate(attrs)
 
-    def get_model_from_context(self, model_name):
-        if self.context is not None and model_name in self.context:
-            return self.context[model_name]
-        else:
-            self.logger.error(
-                f"({model_name}) context could not be found for view ({self.context['view'].__class__.__name__})"
-            )
-            return []
-
-    @extend_schema_field(OpenApiTypes.STR)
-    def get_split_chars(self, entry):
-        alphabet = self.get_model_from_context("alphabet")
-        ignored_characters = self.get_model_from_context("ignored_characters")
-
-        if "⚑" in entry.custom_order:
-            return []
-        else:
-            char_list = (
-                []
-                if alphabet == []
-                else alphabet.get_character_list(
-                    entry.title,
-                    self.context["base_characters"],
-                    self.context["character_variants"],
-                    self.context["ignorable_characters"],
-                )
-            )
-            has_ignored_char = set(char_list).intersection(set(ignored_characters))
-            if has_ignored_char:
-                return []
-            else:
-                return char_list
-
-    @extend_schema_field(OpenApiTypes.STR)
-    def get_split_chars_base(self, entry):
-        alphabet = self.get_model_from_context("alphabet")
-        ignored_characters = self.get_model_from_context("ignored_characters")
-        if "⚑" in entry.custom_order:
-            return []
-        else:
-            # split, check for ignored, then convert title to base characters
-            char_list = (
-                []
-                if alphabet == []
-                else alphabet.get_character_list(
-                    entry.title,
-                    self.context["base_characters"],
-                    self.context["character_variants"],
-                    self.context["ignorable_characters"],
-                )
-            )
-            has_ignored_char = set(char_list).intersection(set(ignored_characters))
-            if has_ignored_char:
-                return []
-            else:
-                base_chars = [
-                    alphabet.get_base_form(
-                        c,
-                        self.context["base_characters"],
-                        self.context["character_variants"],
-                    )
-                    for c in char_list
-                ]
-                return base_chars
-
-    @staticmethod
-    @extend_schema_field(OpenApiTypes.STR)
-    def get_split_words(entry):
-        return entry.title.split(" ")
-
-    @extend_schema_field(OpenApiTypes.STR)
-    def get_split_words_base(self, entry):
-        alphabet = self.get_model_from_context("alphabet")
-        if not alphabet:
-            return entry.title
-        # convert title to base characters
-        base_title = alphabet.get_base_form(
-            entry.title,
-            self.context["base_characters"],
-            self.context["character_variants"],
-        )
-        word_list = base_title.split(" ")
-        return word_list
-
     @extend_schema_field(OpenApiTypes.BOOL)
     def get_is_immersion_label(self, entry):
         return ImmersionLabel.objects.filter(dictionary_entry=entry).exists()
@@ -38,6 +38,8 @@ class DictionaryCleanupJobSerializer(
 
     is_preview = serializers.BooleanField(read_only=True)
     cleanup_result = serializers.SerializerMethodField(read_only=True)
+    total_entries = serializers.IntegerField(read_only=True)
+    processed_entries = serializers.IntegerField(read_only=True)
 
     def get_fields(self):
         fields = super().get_fields()
@@ -82,7 +84,12 @@ class DictionaryCleanupJobSerializer(
 
     class Meta:
         model = DictionaryCleanupJob
-        fields = BaseJobSerializer.Meta.fields + ("is_preview", "cleanup_result")
+        fields = BaseJobSerializer.Meta.fields + (
+            "is_preview",
+            "cleanup_result",
+            "total_entries",
+            "processed_entries",
+        )
 
 
 class DictionaryCleanupPreviewJobSerializer(DictionaryCleanupJobSerializer):
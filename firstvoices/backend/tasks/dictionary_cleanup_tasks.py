@@ -1,11 +1,35 @@
+from collections import Counter
+from itertools import batched
+
 from celery import current_task, shared_task
 from celery.utils.log import get_task_logger
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 
 from backend.models import Alphabet, DictionaryCleanupJob, DictionaryEntry
 from backend.models.jobs import JobStatus
+from backend.search.indexing.dictionary_index import DictionaryEntryDocumentManager
+from backend.search.signals.site_signals import indexing_signals_paused
+from backend.search.tasks.index_manager_tasks import request_sync_in_index
 from backend.tasks.constants import ASYNC_TASK_END_TEMPLATE, ASYNC_TASK_START_TEMPLATE
+from backend.utils.alphabet_utils import get_alphabet_changes
+from backend.utils.character_utils import CustomSorter
+from backend.utils.dictionary_cleanup_utils import (
+    calculate_cleanup_batches,
+    count_unknown_characters,
+)
+
+CLEANUP_BATCH_SIZE = 1000
+CLEANUP_UPDATE_FIELDS = [
+    "title",
+    "custom_order",
+    "split_chars_base",
+    "system_last_modified",
+    "system_last_modified_by",
+]
 
 
 @shared_task
@@ -14,6 +38,8 @@ def cleanup_dictionary(job_instance_id: str):
     Calculates and returns the results of a custom order recalculation,
     including the changes in custom order and title and the count of unknown characters.
     Jobs marked as preview will not update DictionaryEntries in the database.
+    After the first complete cleanup of a site, only entries affected by alphabet changes since
+    the last cleanup are recalculated. Unknown characters are still counted for the whole site.
     """
 
     logger = get_task_logger(__name__)
@@ -52,47 +78,63 @@ def cleanup_dictionary(job_instance_id: str):
         raise ValidationError(cancelled_message)
 
     alphabet = Alphabet.objects.get_or_create(site=site)[0]
+    alphabet_version = alphabet.version
+    engine = alphabet.engine
     results = {}
 
     # First, get the changes in custom order and title for every entry, and store entries with unknown characters
     updated_entries = []
-    unknown_character_count = {}
+    unknown_character_count = Counter()
+    changes = []
 
-    # Wrapped in a transaction so a failure partway through doesn't leave the dictionary half recalculated.
-    # The except needs to stay outside the atomic block, otherwise the changes get committed instead of rolled back.
-    try:
-        with transaction.atomic():
-            # Return the results of the recalculation i.e. the changes in custom order and title for every entry
-            for entry in DictionaryEntry.objects.filter(site=site).iterator(
-                chunk_size=1000
-            ):
-                original_title = entry.title
-                original_custom_order = entry.custom_order
-
-                cleaned_title = alphabet.clean_confusables(entry.title)
-                new_order = alphabet.get_custom_order(cleaned_title)
-
-                # If job is not preview, save the entry to recalculate custom order and clean title
-                if not job.is_preview:
-                    entry.system_last_modified_by = job.created_by
-                    entry.save(set_modified_date=False)
-
-                append_updated_entry(
-                    updated_entries,
-                    original_title,
-                    original_custom_order,
-                    cleaned_title,
-                    new_order,
-                )
+    entries = get_affected_entries(site, alphabet, engine)
+    job.total_entries = entries.count()
+    job.processed_entries = 0
+    job.save()
 
-                # Count unknown characters remaining in each entry, first split by character, then apply custom order
-                chars = alphabet.get_character_list(cleaned_title)
-                for char in chars:
-                    custom_order = alphabet.get_custom_order(char)
-                    if "⚑" in custom_order:
-                        unknown_character_count[custom_order] = (
-                            unknown_character_count.get(custom_order, 0) + 1
-                        )
+    try:
+        rows = entries.values_list(
+            "id", "title", "custom_order", "split_chars_base"
+        ).iterator(chunk_size=CLEANUP_BATCH_SIZE)
+        batch_results = calculate_cleanup_batches(
+            engine,
+            batched(rows, CLEANUP_BATCH_SIZE),
+            DictionaryEntry._meta.get_field("custom_order").max_length,
+            workers=settings.DICTIONARY_CLEANUP_WORKERS,
+        )
+        for batch_result in batch_results:
+            updated_entries.extend(batch_result.updated_entries)
+            unknown_character_count.update(batch_result.unknown_character_count)
+            changes.extend(batch_result.changes)
+
+            job.processed_entries += batch_result.entry_count
+            DictionaryCleanupJob.objects.filter(id=job.id).update(
+                processed_entries=job.processed_entries
+            )
+
+        # Entries that weren't recalculated already match the alphabet, so their unknown characters are
+        # counted directly. Only entries with flagged custom orders can contain unknown characters.
+        unaffected_titles = (
+            DictionaryEntry.objects.filter(
+                site=site, custom_order__contains=CustomSorter.out_of_vocab_flag
+            )
+            .exclude(id__in=entries.values("id"))
+            .values_list("title", flat=True)
+        )
+        for title in unaffected_titles.iterator(chunk_size=CLEANUP_BATCH_SIZE):
+            count_unknown_characters(engine, title, unknown_character_count)
+
+        # If job is not preview, write the recalculated custom order and cleaned title
+        if not job.is_preview:
+            write_cleanup_changes(site, changes, job.created_by)
+
+            # Record the alphabet the entries now match, unless it was changed while the job was running
+            Alphabet.objects.filter(id=alphabet.id).update(
+                last_cleanup_config=(
+                    engine.config if alphabet.version == alphabet_version else None
+                ),
+                last_cleanup_date=timezone.now(),
+            )
     except Exception as e:
         job.status = JobStatus.FAILED
         job.message = str(e)
@@ -102,7 +144,7 @@ def cleanup_dictionary(job_instance_id: str):
         logger.info(ASYNC_TASK_END_TEMPLATE)
         return
 
-    results["unknown_character_count"] = unknown_character_count
+    results["unknown_character_count"] = dict(unknown_character_count)
     results["updated_entries"] = updated_entries
 
     # Save the result to the database
@@ -113,22 +155,75 @@ def cleanup_dictionary(job_instance_id: str):
     logger.info(ASYNC_TASK_END_TEMPLATE)
 
 
-def append_updated_entry(
-    updated_entries, original_title, original_custom_order, cleaned_title, new_order
-):
-    result = {
-        "title": original_title,
-        "cleaned_title": "",
-        "is_title_updated": False,
-        "previous_custom_order": original_custom_order,
-        "new_custom_order": "",
-    }
-
-    if result["previous_custom_order"] != new_order:
-        result["new_custom_order"] = new_order
-    if result["title"] != cleaned_title:
-        result["cleaned_title"] = cleaned_title
-        result["is_title_updated"] = True
-
-    if result["new_custom_order"] or result["cleaned_title"]:
-        updated_entries.append(result)
+def get_affected_entries(site, alphabet, engine):
+    """
+    Returns the entries that may be affected by alphabet changes since the last cleanup, using split_chars_base
+    to find entries containing the changed characters. Returns every entry in the site if there is no record
+    of a previous cleanup, or if the changes affect every entry.
+    """
+    entries = DictionaryEntry.objects.filter(site=site)
+    if alphabet.last_cleanup_config is None or alphabet.last_cleanup_date is None:
+        return entries
+
+    changes = get_alphabet_changes(alphabet.last_cleanup_config, engine.config)
+    if changes is None:
+        return entries
+
+    # Entries saved since the last cleanup may have been calculated with a different alphabet
+    affected = Q(system_last_modified__gt=alphabet.last_cleanup_date)
+
+    if changes.characters:
+        affected |= Q(split_chars_base__overlap=sorted(changes.characters))
+    if changes.flagged_entries:
+        # Entries with unknown or ignored characters have no split_chars_base
+        affected |= Q(split_chars_base=[]) | Q(
+            custom_order__contains=CustomSorter.out_of_vocab_flag
+        )
+    for confusable in changes.confusables:
+        affected |= Q(title__contains=confusable)
+
+    return entries.filter(affected)
+
+
+def write_cleanup_changes(site, changes, user):
+    """
+    Writes recalculated titles, custom orders and split characters for changed entries with bulk updates,
+    and requests search index updates for them.
+    Entries whose title was edited after the calculation are skipped, since saving them already recalculated
+    their fields.
+    Only alphabet-derived fields are written. Notes, translations and acknowledgements don't depend on the
+    alphabet, and are already normalised whenever an entry is saved (see DictionaryEntry.clean_related_fields).
+    """
+    updated_entries = []
+
+    # Wrapped in a transaction so a failure partway through doesn't leave the dictionary half recalculated.
+    # The except needs to stay outside the atomic block, otherwise the changes get committed instead of rolled back.
+    with transaction.atomic():
+        for batch in batched(changes, CLEANUP_BATCH_SIZE):
+            current_titles = dict(
+                DictionaryEntry.objects.select_for_update()
+                .filter(id__in=[entry_id for entry_id, _, _ in batch])
+                .order_by()
+                .values_list("id", "title")
+            )
+
+            now = timezone.now()
+            entries = [
+                DictionaryEntry(
+                    id=entry_id,
+                    site=site,
+                    title=derived.title,
+                    custom_order=derived.custom_order,
+                    split_chars_base=derived.split_chars_base,
+                    system_last_modified=now,
+                    system_last_modified_by=user,
+                )
+                for entry_id, original_title, derived in batch
+                if current_titles.get(entry_id) == original_title
+            ]
+            DictionaryEntry.objects.bulk_update(entries, CLEANUP_UPDATE_FIELDS)
+            updated_entries.extend(entries)
+
+        if not indexing_signals_paused(site):
+            for entry in updated_entries:
+                request_sync_in_index(DictionaryEntryDocumentManager, entry)
@@ -8,7 +8,7 @@ from backend.models.jobs import BulkVisibilityJob, JobStatus
 from backend.models.sites import SiteFeature
 from backend.models.widget import SiteWidget
 from backend.search.tasks.site_content_indexing_tasks import (
-    request_sync_all_site_content_in_indexes,
+    request_update_site_visibility_in_indexes,
 )
 from backend.tasks.constants import ASYNC_TASK_END_TEMPLATE, ASYNC_TASK_START_TEMPLATE
 
@@ -104,10 +104,12 @@ def bulk_change_visibility(job_instance_id: str):
         logger.info(ASYNC_TASK_END_TEMPLATE)
         return
 
-    # Resume search indexing for site, + reindex entire site
+    # Resume search indexing for site, + update the visibility of all site content in the indexes
     indexing_paused_feature[0].is_enabled = False
     indexing_paused_feature[0].save()
-    request_sync_all_site_content_in_indexes(site)
+    request_update_site_visibility_in_indexes(
+        site, job.from_visibility, job.to_visibility
+    )
 
     # update status of job at each step
     job.status = JobStatus.COMPLETE
@@ -41,6 +41,8 @@ class TestDictionaryCleanupAPI(
             "message": instance.message,
             "cleanupResult": {"unknownCharacterCount": 0, "updatedEntries": []},
             "isPreview": instance.is_preview,
+            "totalEntries": instance.total_entries,
+            "processedEntries": instance.processed_entries,
         }
 
     def get_expected_response(self, instance, site):
@@ -4,6 +4,8 @@ import pytest
 
 from backend.models.constants import Role, Visibility
 from backend.models.song import Lyric, Song
+from backend.search.constants import RefreshPolicy
+from backend.search.tasks.index_manager_tasks import bulk_index
 from backend.tests import factories
 from backend.tests.test_apis.base.base_controlled_site_api import (
     BaseControlledSiteContentApiTest,
@@ -284,6 +286,27 @@ class TestSongEndpoint(
             == original_instance.acknowledgements[0]
         )
 
+    @pytest.mark.django_db
+    def test_edits_wait_for_index_refresh(
+        self, mocker, django_capture_on_commit_callbacks
+    ):
+        mock_bulk_index = mocker.patch.object(bulk_index, "apply_async")
+        site, _ = factories.get_site_with_app_admin(self.client, Visibility.PUBLIC)
+        instance = self.create_minimal_instance(site=site, visibility=Visibility.PUBLIC)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = self.client.delete(
+                self.get_detail_endpoint(key=instance.id, site_slug=site.slug)
+            )
+
+        assert response.status_code == 204
+        ((manager_name, operation, instance_ids, refresh),) = (
+            mock_bulk_index.call_args.args
+        )
+        assert (manager_name, operation) == ("SongDocumentManager", "remove")
+        assert instance_ids == [instance.id]
+        assert refresh == RefreshPolicy.WAIT_FOR
+
     @pytest.mark.django_db
     def test_lyrics_order(self):
         """Verify lyrics come back in defined order"""
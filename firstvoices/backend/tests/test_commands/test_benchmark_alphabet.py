@@ -0,0 +1,87 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from backend.benchmarks.alphabet_benchmarks import (
+    REFERENCE_BENCHMARK,
+    build_alphabet_config,
+    build_words,
+    find_regressions,
+    load_baselines,
+    synthetic_site,
+)
+from backend.models import Character
+from backend.models.sites import Site
+
+
+class TestBenchmarkAlphabet:
+    command_options = {"profiles": "small", "words": 5, "repeat": 1}
+
+    def test_synthetic_alphabet(self):
+        config = build_alphabet_config(100)
+        assert len(config["base_characters"]) == 100
+        assert len(set(config["base_characters"])) == 100
+        assert any(len(char) > 1 for char in config["base_characters"])
+        assert config["variant_characters"]
+        assert config["confusables"]
+
+        assert build_alphabet_config(100) == config
+        assert build_words(config, 10) == build_words(config, 10)
+        assert len(build_words(config, 10)) == 10
+
+    @pytest.mark.django_db
+    def test_save_and_compare_baselines(self, tmp_path, caplog):
+        baselines_path = tmp_path / "baselines.json"
+        call_command(
+            "benchmark_alphabet",
+            save_baselines=True,
+            baselines=baselines_path,
+            **self.command_options,
+        )
+        baselines = load_baselines(baselines_path)
+        assert baselines["environment"]["python"]
+        assert "small.get_custom_order" in baselines["results"]
+        assert "small.alphabet_get_custom_order" in baselines["results"]
+        assert REFERENCE_BENCHMARK in baselines["results"]
+        assert "large.get_custom_order" not in baselines["results"]
+
+        call_command(
+            "benchmark_alphabet",
+            baselines=baselines_path,
+            tolerance=1000,
+            **self.command_options,
+        )
+        assert "All benchmarks are within tolerance of their baselines." in caplog.text
+
+    @pytest.mark.django_db
+    def test_regression_fails(self, tmp_path):
+        baselines_path = tmp_path / "baselines.json"
+        baselines_path.write_text(
+            '{"environment": {}, "results": {"small.get_custom_order": 0.000001}}'
+        )
+
+        with pytest.raises(CommandError, match="small.get_custom_order"):
+            call_command(
+                "benchmark_alphabet", baselines=baselines_path, **self.command_options
+            )
+
+    def test_unknown_profile(self):
+        with pytest.raises(CommandError, match="Unknown profiles: huge."):
+            call_command("benchmark_alphabet", profiles="huge")
+
+    def test_find_regressions(self):
+        assert find_regressions(
+            {"a": 1.3, "b": 1.2, "c": 5.0}, {"a": 1.0, "b": 1.0}, 0.25
+        ) == {"a": (1.0, 1.3)}
+
+    def test_find_regressions_scaled_by_reference(self):
+        baselines = {REFERENCE_BENCHMARK: 1.0, "a": 1.0, "b": 1.0}
+        results = {REFERENCE_BENCHMARK: 2.0, "a": 2.2, "b": 2.6}
+        assert find_regressions(results, baselines, 0.25) == {"b": (1.0, 2.6)}
+
+    @pytest.mark.django_db
+    def test_synthetic_site_is_rolled_back(self):
+        config = build_alphabet_config(100)
+        with synthetic_site(config, "test") as site:
+            assert Character.objects.filter(site=site).count() == 100
+        assert not Site.objects.filter(slug="alphabet-benchmark-test").exists()
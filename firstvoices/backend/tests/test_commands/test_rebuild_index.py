@@ -75,3 +75,17 @@ class TestRebuildIndex:
         assert (
             "Can't rebuild index for unrecognized alias: [invalid_key]" in caplog.text
         )
+
+    def test_workers_and_chunk_size_passed(self):
+        with patch(
+            "elasticsearch.dsl.connections.Connections.get_connection",
+            return_value=self.mock_connection,
+        ), patch(
+            "backend.management.commands.rebuild_index.Command.index_managers",
+            {
+                "MOCK_MANAGER": self.mock_manager,
+            },
+        ):
+            self.call_command("--workers", "4", "--chunk-size", "100")
+
+        self.mock_manager.rebuild.assert_called_once_with(workers=4, chunk_size=100)
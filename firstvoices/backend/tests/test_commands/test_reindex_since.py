@@ -0,0 +1,87 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.management import CommandError, call_command
+
+
+@pytest.mark.django_db
+class TestReindexSince:
+    """
+    This class only contains integration tests and does not
+    test the manager.reindex_since() itself as that should be covered
+    in its own unit tests.
+    """
+
+    @staticmethod
+    def call_command(*args, **kwargs):
+        call_command(
+            "reindex_since",
+            *args,
+            **kwargs,
+        )
+
+    def setup_method(self):
+        self.mock_manager = MagicMock()
+
+    def patch_index_managers(self):
+        return patch(
+            "backend.management.commands.reindex_since.Command.index_managers",
+            {
+                "MOCK_MANAGER": self.mock_manager,
+            },
+        )
+
+    def test_base_case(self, caplog):
+        with self.patch_index_managers():
+            self.call_command()
+
+        self.mock_manager.reindex_since.assert_called_once_with(
+            since=None, chunk_size=500
+        )
+
+        assert (
+            "No index name provided. Reindexing changes in all indices." in caplog.text
+        )
+        assert "Reindexing changes complete." in caplog.text
+
+    def test_valid_index_name_passed(self):
+        other_manager = MagicMock()
+        with patch(
+            "backend.management.commands.reindex_since.Command.index_managers",
+            {
+                "MOCK_MANAGER": self.mock_manager,
+                "OTHER_MANAGER": other_manager,
+            },
+        ):
+            self.call_command("--index", "MOCK_MANAGER")
+
+        assert self.mock_manager.reindex_since.called
+        assert not other_manager.reindex_since.called
+
+    def test_invalid_index_provided(self, caplog):
+        with self.patch_index_managers():
+            self.call_command("--index", "invalid_key")
+
+        assert not self.mock_manager.reindex_since.called
+
+        assert (
+            "Can't reindex changes for unrecognized alias: [invalid_key]" in caplog.text
+        )
+
+    def test_since_and_chunk_size_passed(self):
+        with self.patch_index_managers():
+            self.call_command(
+                "--since", "2024-05-01T12:00:00+00:00", "--chunk-size", "100"
+            )
+
+        self.mock_manager.reindex_since.assert_called_once_with(
+            since=datetime(2024, 5, 1, 12, tzinfo=timezone.utc), chunk_size=100
+        )
+
+    def test_invalid_since(self):
+        with self.patch_index_managers():
+            with pytest.raises(CommandError):
+                self.call_command("--since", "yesterday")
+
+        assert not self.mock_manager.reindex_since.called
@@ -1,6 +1,7 @@
 import pytest
+from django.utils import timezone
 
-from backend.models.characters import AppJson
+from backend.models.characters import Alphabet, AppJson, Character
 from backend.tests.factories import (
     AlphabetFactory,
     CharacterFactory,
@@ -88,6 +89,27 @@ class TestAlphabetModel:
         IgnoredCharacterFactory(site=alphabet.site, title="/")
         assert alphabet.clean_confusables("ᐱ/_/b/č") == "A/_/b/cv"
 
+    @pytest.mark.django_db
+    def test_clean_confusables_many(self):
+        alphabet = AlphabetFactory.create(
+            input_to_canonical_map=[
+                {"in": "á", "out": "a"},
+                {"in": "ᐱ", "out": "A"},
+            ],
+        )
+        assert alphabet.clean_confusables_many(["áx", "X", "ᐱá", "áx"]) == [
+            "ax",
+            "X",
+            "Aa",
+            "ax",
+        ]
+        assert alphabet.clean_confusables_many([]) == []
+
+    @pytest.mark.django_db
+    def test_clean_confusables_many_empty_map(self):
+        alphabet = AlphabetFactory.create()
+        assert alphabet.clean_confusables_many(["á", "x"]) == ["á", "x"]
+
     @pytest.mark.django_db
     def test_clean_confusables_no_feeding(self):
         """Default confusables transducer does not allow multi-rule application"""
@@ -193,3 +215,78 @@ class TestAlphabetModel:
         order = alphabet.get_custom_order(new_form)
         # custom order is successful and reflects nfc ordering issue
         assert order == "⚑ź⚑̲"
+
+    @pytest.mark.django_db
+    def test_compute_derived_fields(self):
+        """Derived fields for many titles match the values calculated when saving an entry"""
+        alphabet = AlphabetFactory.create(
+            input_to_canonical_map=[{"in": "ᐱ", "out": "A"}]
+        )
+        a = CharacterFactory(site=alphabet.site, title="a")
+        CharacterFactory(site=alphabet.site, title="b")
+        CharacterVariantFactory(site=alphabet.site, title="A", base_character=a)
+        IgnoredCharacterFactory(site=alphabet.site, title="-")
+
+        results = alphabet.compute_derived_fields([" ᐱb ", "ab-", "abc", "ᐱb "])
+
+        assert [result.title for result in results] == ["Ab", "ab-", "abc", "Ab"]
+        assert [result.custom_order for result in results] == [
+            "!#",
+            "!#",
+            "!#⚑c",
+            "!#",
+        ]
+        assert [result.split_chars_base for result in results] == [
+            ["a", "b"],
+            [],
+            [],
+            ["a", "b"],
+        ]
+
+
+class TestAlphabetEngineCache:
+    @pytest.fixture
+    def alphabet(self):
+        return AlphabetFactory.create()
+
+    @pytest.mark.django_db
+    def test_engine_shared_between_instances(self, alphabet):
+        """Alphabet instances for the same site share one compiled engine"""
+        CharacterFactory(site=alphabet.site, title="a")
+        engine = alphabet.engine
+        other_instance = Alphabet.objects.get(id=alphabet.id)
+        assert other_instance.engine is engine
+
+    @pytest.mark.django_db
+    def test_engine_rebuilt_on_character_change(self, alphabet):
+        """Changing the site characters invalidates the cached engine"""
+        CharacterFactory(site=alphabet.site, title="b", sort_order=1)
+        engine = alphabet.engine
+        CharacterFactory(site=alphabet.site, title="a", sort_order=2)
+
+        new_instance = Alphabet.objects.get(id=alphabet.id)
+        assert new_instance.engine is not engine
+        assert new_instance.get_custom_order("a") > new_instance.get_custom_order("b")
+
+    @pytest.mark.django_db
+    def test_engine_rebuilt_on_version_change_without_signals(self, alphabet):
+        """Changes made without signals, e.g. from another process, are detected by the version stamp"""
+        char = CharacterFactory(site=alphabet.site, title="a")
+        engine = alphabet.engine
+        Character.objects.filter(id=char.id).update(
+            title="b", system_last_modified=timezone.now()
+        )
+
+        new_instance = Alphabet.objects.get(id=alphabet.id)
+        assert new_instance.engine is not engine
+        assert new_instance.get_character_list("b") == ["b"]
+        assert "⚑" not in new_instance.get_custom_order("b")
+
+    @pytest.mark.django_db
+    def test_engine_rebuilt_on_confusables_change(self, alphabet):
+        """Saving the alphabet invalidates its cached engine"""
+        assert alphabet.clean_confusables("á") == "á"
+        alphabet.input_to_canonical_map = [{"in": "á", "out": "a"}]
+        alphabet.save()
+        assert alphabet.clean_confusables("á") == "a"
+        assert Alphabet.objects.get(id=alphabet.id).clean_confusables("á") == "a"
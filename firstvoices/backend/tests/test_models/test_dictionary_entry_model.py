@@ -120,6 +120,31 @@ class TestDictionaryEntryModel(RelatedVideoLinksValidationMixin):
         fetched_entry = DictionaryEntry.objects.get(id=entry.id)
         assert fetched_entry.split_chars_base == ["a", "üü", "a"]
 
+    @pytest.mark.django_db
+    def test_set_derived_fields_many(self):
+        site = SiteFactory.create()
+        factories.CharacterFactory.create(title="üü", site=site)
+        factories.CharacterFactory.create(title="a", site=site)
+        entries = [
+            DictionaryEntry(title=" aüüa ", type="WORD", site=site, notes=[" note "]),
+            DictionaryEntry(title="ab", type="WORD", site=site),
+        ]
+
+        DictionaryEntry.set_derived_fields_many(entries)
+        DictionaryEntry.objects.bulk_create(entries)
+
+        for entry in entries:
+            saved_entry = DictionaryEntry.objects.get(id=entry.id)
+            saved_entry.save()
+            saved_entry.refresh_from_db()
+            assert entry.title == saved_entry.title
+            assert entry.custom_order == saved_entry.custom_order
+            assert entry.split_chars_base == saved_entry.split_chars_base
+            assert entry.notes == saved_entry.notes
+
+        assert entries[0].split_chars_base == ["a", "üü", "a"]
+        assert entries[0].notes == ["note"]
+
     @pytest.mark.django_db
     def test_metadata_onsave(self):
         site = SiteFactory.create()
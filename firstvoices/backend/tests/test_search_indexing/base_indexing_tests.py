@@ -1,20 +1,49 @@
+import math
+import uuid
+from concurrent.futures import Future
+from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from elasticsearch import ConnectionError, NotFoundError
 
+from backend.search.constants import (
+    ELASTICSEARCH_MAPPING_VERSION,
+    RETRY_ON_CONFLICT,
+    RefreshPolicy,
+)
+from backend.search.indexing.base import get_pk_ranges, index_refresh_policy
 from backend.tasks.constants import ASYNC_TASK_END_TEMPLATE
 from backend.tests import factories
 from backend.tests.utils import TransactionOnCommitMixin
 
-TEST_SEARCH_INDEX_ID = "test search index id"
-
 
 class MockNotFoundError(NotFoundError):
     def __init__(self, message="", meta={}, body={}):
         super().__init__(message=message, meta=meta, body=body)
 
 
+class InProcessExecutor:
+    """Stands in for ProcessPoolExecutor, running each submitted function immediately in the test process."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def submit(self, function, *args):
+        future = Future()
+        future.set_result(function(*args))
+        return future
+
+
 class BaseIndexManagerTest:
     """
     Base test class for subclasses of IndexManager.
@@ -36,11 +65,13 @@ class BaseIndexManagerTest:
         "es_index_settings": "elasticsearch.dsl.index.Index.settings",
         "es_index_refresh": "elasticsearch.dsl.index.Index.refresh",
         "es_bulk": "elasticsearch.helpers.actions.bulk",
-        "es_search_init": "elasticsearch.dsl.search.Search.__init__",
-        "es_search_params": "elasticsearch.dsl.search.Search.params",
+        "es_parallel_bulk": "elasticsearch.helpers.actions.parallel_bulk",
+        "es_streaming_bulk": "elasticsearch.helpers.actions.streaming_bulk",
+        "es_scan": "elasticsearch.helpers.actions.scan",
         "log_error": "logging.Logger.error",
         "log_warning": "logging.Logger.warning",
         "log_info": "logging.Logger.info",
+        "process_pool_executor": "backend.search.indexing.base.ProcessPoolExecutor",
     }
 
     def setup_method(self):
@@ -98,7 +129,7 @@ class BaseIndexManagerTest:
                 **{self.expected_index_name: {"is_write_index": True}}
             )
             mock_settings.assert_called_once_with(
-                number_of_shards=1, number_of_replicas=0
+                number_of_shards=1, number_of_replicas=0, refresh_interval="-1"
             )
             mock_create.assert_called_once()
 
@@ -127,6 +158,41 @@ class BaseIndexManagerTest:
                 using=mock_connection, name=self.expected_index_name
             )
 
+            # restores the settings turned off while loading
+            mock_new_index.put_settings.assert_called_once_with(
+                using=mock_connection,
+                settings={"index": {"number_of_replicas": 0, "refresh_interval": None}},
+            )
+            mock_new_index.refresh.assert_called_once_with(using=mock_connection)
+
+    @pytest.mark.django_db
+    def test_rebuild_parallel(self):
+        mock_connection = MagicMock()
+        mock_new_index = MagicMock()
+
+        with patch(
+            self.paths["es_get_connection"], return_value=mock_connection
+        ), patch(self.paths["_get_current_index"], return_value=None), patch(
+            self.paths["_create_new_write_index"], return_value=mock_new_index
+        ), patch(
+            self.paths["process_pool_executor"], InProcessExecutor
+        ), patch(
+            self.paths["es_bulk"]
+        ) as mock_bulk, patch(
+            self.paths["es_parallel_bulk"], return_value=[]
+        ) as mock_parallel_bulk:
+            self.manager.rebuild(workers=2, chunk_size=100)
+
+            mock_bulk.assert_not_called()
+            # each document type is split into ranges of primary keys
+            expected_ranges = 2 * sum(
+                manager.ranges_per_worker for manager in self.manager.document_managers
+            )
+            assert mock_parallel_bulk.call_count == expected_ranges
+            for call in mock_parallel_bulk.call_args_list:
+                assert call.kwargs["chunk_size"] == 100
+            mock_new_index.put_alias.assert_called_once()
+
     @pytest.mark.django_db
     def test_rebuild_failure_es_error(self):
         with patch(
@@ -152,14 +218,189 @@ class BaseIndexManagerTest:
 
                 mock_new_index.delete.assert_called_once()
 
-    def create_search_mocks(self):
-        mock_query = MagicMock()
-        mock_query.execute.return_value = {
-            "hits": {"hits": [{"_id": TEST_SEARCH_INDEX_ID}]}
+    @pytest.mark.parametrize(
+        "index_meta, expected",
+        [
+            ({"mapping_version": ELASTICSEARCH_MAPPING_VERSION}, True),
+            ({"mapping_version": ELASTICSEARCH_MAPPING_VERSION - 1}, False),
+            ({}, False),
+        ],
+    )
+    def test_has_current_mapping(self, index_meta, expected):
+        mock_connection = MagicMock()
+        mock_connection.indices.get_mapping.return_value = {
+            "index_1": {"mappings": {"_meta": index_meta, "properties": {}}}
         }
-        mock_search_obj = MagicMock()
-        mock_search_obj.query.return_value = mock_query
-        return mock_query, mock_search_obj
+
+        with patch(self.paths["es_get_connection"], return_value=mock_connection):
+            assert self.manager.has_current_mapping() is expected
+
+        mock_connection.indices.get_mapping.assert_called_once_with(
+            index=self.expected_index_name
+        )
+
+    @pytest.mark.parametrize(
+        "response, expected",
+        [
+            ({"updated": 2, "version_conflicts": 0, "failures": []}, True),
+            ({"updated": 1, "version_conflicts": 1, "failures": []}, False),
+            ({"updated": 1, "version_conflicts": 0, "failures": [{}]}, False),
+        ],
+    )
+    def test_update_by_query(self, response, expected):
+        mock_connection = MagicMock()
+        mock_connection.update_by_query.return_value = response
+        query = {"term": {"site_id": "1"}}
+
+        with patch(self.paths["es_get_connection"], return_value=mock_connection):
+            assert (
+                self.manager.update_by_query(query, "script", {"param": 1}) is expected
+            )
+
+        mock_connection.update_by_query.assert_called_once_with(
+            index=self.expected_index_name,
+            query=query,
+            script={"source": "script", "lang": "painless", "params": {"param": 1}},
+            conflicts="proceed",
+            slices="auto",
+        )
+
+    @pytest.mark.parametrize(
+        "task, expected",
+        [
+            ({"completed": True, "response": {"deleted": 2, "failures": []}}, True),
+            (
+                {
+                    "completed": True,
+                    "response": {"deleted": 1, "version_conflicts": 1, "failures": []},
+                },
+                False,
+            ),
+            ({"completed": True, "error": {"type": "task_cancelled"}}, False),
+        ],
+    )
+    def test_delete_by_query(self, task, expected):
+        mock_connection = MagicMock()
+        mock_connection.delete_by_query.return_value = {"task": "node:1"}
+        mock_connection.tasks.get.side_effect = [{"completed": False}, task]
+        query = {"term": {"site_id": "1"}}
+
+        with patch(
+            self.paths["es_get_connection"], return_value=mock_connection
+        ), patch.object(self.manager, "task_poll_interval", 0):
+            assert self.manager.delete_by_query(query) is expected
+
+        mock_connection.delete_by_query.assert_called_once_with(
+            index=self.expected_index_name,
+            query=query,
+            conflicts="proceed",
+            slices="auto",
+            wait_for_completion=False,
+        )
+        # polled until the task completed
+        assert mock_connection.tasks.get.call_count == 2
+        mock_connection.tasks.get.assert_called_with(task_id="node:1")
+
+    def test_rebuild_sets_watermark(self):
+        mock_connection = MagicMock()
+        mock_connection.indices.get_mapping.return_value = {
+            "index_1": {"mappings": {"_meta": {"mapping_version": 2}}}
+        }
+        mock_new_index = MagicMock()
+        mock_new_index._name = "index_1"
+        started = timezone.now()
+
+        with patch(
+            self.paths["es_get_connection"], return_value=mock_connection
+        ), patch(self.paths["_get_current_index"], return_value=None), patch(
+            self.paths["_create_new_write_index"], return_value=mock_new_index
+        ), patch(
+            self.paths["es_bulk"]
+        ):
+            self.manager.rebuild()
+
+        mock_connection.indices.get_mapping.assert_called_with(index="index_1")
+        meta = mock_connection.indices.put_mapping.call_args.kwargs["meta"]
+        assert meta["mapping_version"] == 2
+        assert datetime.fromisoformat(meta["reindexed_until"]) >= started
+
+    @pytest.mark.parametrize(
+        "watermarks, expected",
+        [
+            (["2024-01-02T00:00:00+00:00"], "2024-01-02T00:00:00+00:00"),
+            (
+                ["2024-01-02T00:00:00+00:00", "2024-01-01T00:00:00+00:00"],
+                "2024-01-01T00:00:00+00:00",
+            ),
+            (["2024-01-02T00:00:00+00:00", None], None),
+        ],
+    )
+    def test_get_watermark(self, watermarks, expected):
+        mock_connection = MagicMock()
+        mock_connection.indices.get_mapping.return_value = {
+            f"index_{i}": {
+                "mappings": {
+                    "_meta": {"reindexed_until": watermark} if watermark else {}
+                }
+            }
+            for i, watermark in enumerate(watermarks)
+        }
+
+        with patch(self.paths["es_get_connection"], return_value=mock_connection):
+            watermark = self.manager.get_watermark()
+
+        assert watermark == (datetime.fromisoformat(expected) if expected else None)
+
+    def test_reindex_since_without_watermark(self):
+        with patch(self.paths["es_get_connection"]), patch.object(
+            self.manager, "get_watermark", return_value=None
+        ), patch(self.paths["log_warning"]) as mock_log_warning:
+            assert self.manager.reindex_since() is False
+
+            mock_log_warning.assert_called_once()
+
+    @pytest.mark.parametrize("completed", [True, False])
+    def test_reindex_since_watermark(self, completed):
+        mock_connection = MagicMock()
+        watermark = timezone.now() - timedelta(hours=1)
+        started = timezone.now()
+        patches = [
+            patch.object(document_manager, "reindex_since", return_value=completed)
+            for document_manager in self.manager.document_managers
+        ] + [
+            patch.object(document_manager, "remove_deleted", return_value=True)
+            for document_manager in self.manager.document_managers
+        ]
+        for document_patch in patches:
+            document_patch.start()
+
+        try:
+            with patch(
+                self.paths["es_get_connection"], return_value=mock_connection
+            ), patch.object(
+                self.manager, "get_watermark", return_value=watermark
+            ), patch.object(
+                self.manager, "_set_watermark"
+            ) as mock_set_watermark:
+                assert self.manager.reindex_since(chunk_size=10) is completed
+
+            for document_manager in self.manager.document_managers:
+                # changes made shortly before the watermark are reindexed again
+                document_manager.reindex_since.assert_called_once_with(
+                    mock_connection, watermark - self.manager.reindex_overlap, 10
+                )
+                document_manager.remove_deleted.assert_called_once_with(mock_connection)
+        finally:
+            for document_patch in patches:
+                document_patch.stop()
+
+        # the watermark only moves forward when all changes were reindexed
+        if completed:
+            mock_set_watermark.assert_called_once()
+            assert mock_set_watermark.call_args.args[1] == self.expected_index_name
+            assert mock_set_watermark.call_args.args[2] >= started
+        else:
+            mock_set_watermark.assert_not_called()
 
     def get_mock_document_with_es_error(self):
         mock_document = MagicMock()
@@ -189,8 +430,9 @@ class BaseDocumentManagerTest:
         "es_index_settings": "elasticsearch.dsl.index.Index.settings",
         "es_index_refresh": "elasticsearch.dsl.index.Index.refresh",
         "es_bulk": "elasticsearch.helpers.actions.bulk",
-        "es_search_init": "elasticsearch.dsl.search.Search.__init__",
-        "es_search_params": "elasticsearch.dsl.search.Search.params",
+        "es_parallel_bulk": "elasticsearch.helpers.actions.parallel_bulk",
+        "es_streaming_bulk": "elasticsearch.helpers.actions.streaming_bulk",
+        "es_scan": "elasticsearch.helpers.actions.scan",
         "log_error": "logging.Logger.error",
         "log_warning": "logging.Logger.warning",
         "log_info": "logging.Logger.info",
@@ -205,6 +447,7 @@ class BaseDocumentManagerTest:
         # paths for document methods
         self.paths["document_get"] = document_full_module + ".get"
         self.paths["document_update"] = document_full_module + ".update"
+        self.paths["document_delete"] = document_full_module + ".delete"
 
         # paths for internal manager methods
         self.paths["create_index_document"] = (
@@ -229,10 +472,26 @@ class BaseDocumentManagerTest:
             self.manager.add_to_index(instance)
 
             mock_create_index_document.assert_called_once_with(instance)
-            mock_document.save.assert_called_once()
-            mock_refresh.assert_called_once()
+            assert mock_document.meta.id == str(instance.id)
+            mock_document.save.assert_called_once_with(refresh=False)
+            mock_refresh.assert_not_called()
             mock_log_error.assert_not_called()
 
+    @pytest.mark.django_db
+    def test_add_to_index_refresh_policy(self):
+        mock_document = MagicMock()
+        instance = self.factory.create()
+
+        with patch(self.paths["create_index_document"], return_value=mock_document):
+            with index_refresh_policy(RefreshPolicy.WAIT_FOR):
+                self.manager.add_to_index(instance)
+            mock_document.save.assert_called_once_with(refresh="wait_for")
+
+            mock_document.save.reset_mock()
+            with index_refresh_policy(RefreshPolicy.WAIT_FOR):
+                self.manager.add_to_index(instance, RefreshPolicy.TRUE)
+            mock_document.save.assert_called_once_with(refresh=True)
+
     @pytest.mark.django_db
     def test_add_failure_es_error(self):
         mock_document = MagicMock()
@@ -247,8 +506,6 @@ class BaseDocumentManagerTest:
 
     @pytest.mark.django_db
     def test_update_in_index_success(self):
-        mock_query, mock_search_obj = self.create_search_mocks()
-        mock_existing_document = MagicMock()
         mock_new_document = MagicMock()
         mock_new_document.to_dict.return_value = {"test1": "value1"}
 
@@ -256,68 +513,39 @@ class BaseDocumentManagerTest:
 
         with patch(
             self.paths["create_index_document"], return_value=mock_new_document
-        ), patch(
-            self.paths["es_search_init"], return_value=None
-        ) as mock_search_init, patch(
-            self.paths["es_search_params"], return_value=mock_search_obj
-        ), patch(
-            self.paths["document_get"], return_value=mock_existing_document
-        ) as mock_get, patch(
+        ), patch(self.paths["document_update"]) as mock_update, patch(
             self.paths["es_index_refresh"], return_value=None
         ) as mock_refresh, patch(
             self.paths["log_error"], return_value=None
         ) as mock_log_error:
             self.manager.update_in_index(instance)
 
-            # assert searched the right index for the right id
-            mock_search_init.assert_called_once_with(index=self.expected_index_name)
-            mock_search_obj.query.assert_called_once_with(
-                "match", document_id=instance.id
+            # assert updated the document with the instance id, without searching for it
+            mock_update.assert_called_once_with(
+                refresh=False, retry_on_conflict=RETRY_ON_CONFLICT, test1="value1"
             )
-            mock_query.execute.assert_called_once()
 
-            # assert updated the right index document with the right values
-            mock_get.assert_called_once_with(id=TEST_SEARCH_INDEX_ID)
-            mock_existing_document.update.assert_called_once_with(test1="value1")
-
-            # assert refreshed the index
-            mock_refresh.assert_called_once()
+            # assert left the refresh to the index's refresh interval
+            mock_refresh.assert_not_called()
 
             mock_log_error.assert_not_called()
 
     @pytest.mark.django_db
     def test_remove_from_index_success(self):
-        mock_query, mock_search_obj = self.create_search_mocks()
-        mock_existing_document = MagicMock()
-
         instance = self.factory.create()
 
-        with patch(
-            self.paths["es_search_init"], return_value=None
-        ) as mock_search_init, patch(
-            self.paths["es_search_params"], return_value=mock_search_obj
-        ), patch(
-            self.paths["document_get"], return_value=mock_existing_document
-        ) as mock_get, patch(
+        with patch(self.paths["document_delete"]) as mock_delete, patch(
             self.paths["es_index_refresh"], return_value=None
         ) as mock_refresh, patch(
             self.paths["log_error"], return_value=None
         ) as mock_log_error:
             self.manager.remove_from_index(instance.id)
 
-            # assert searched the right index for the right id
-            mock_search_init.assert_called_once_with(index=self.expected_index_name)
-            mock_search_obj.query.assert_called_once_with(
-                "match", document_id=instance.id
-            )
-            mock_query.execute.assert_called_once()
-
-            # assert deleted the right index document with the right values
-            mock_get.assert_called_once_with(id=TEST_SEARCH_INDEX_ID)
-            mock_existing_document.delete.assert_called_once()
+            # assert deleted the document with the instance id, without searching for it
+            mock_delete.assert_called_once_with(refresh=False)
 
-            # assert refreshed the index
-            mock_refresh.assert_called_once()
+            # assert left the refresh to the index's refresh interval
+            mock_refresh.assert_not_called()
 
             mock_log_error.assert_not_called()
 
@@ -326,7 +554,7 @@ class BaseDocumentManagerTest:
         instance = self.factory.create()
 
         with patch(
-            self.paths["es_search_init"], side_effect=ConnectionError("Oh dear!")
+            self.paths["document_update"], side_effect=ConnectionError("Oh dear!")
         ), patch(self.paths["log_error"], return_value=None) as mock_log_error:
             self.manager.update_in_index(instance)
             mock_log_error.assert_called()
@@ -336,7 +564,7 @@ class BaseDocumentManagerTest:
         instance = self.factory.create()
 
         with patch(
-            self.paths["es_search_init"], side_effect=ConnectionError("Oh dear!")
+            self.paths["document_delete"], side_effect=ConnectionError("Oh dear!")
         ), patch(self.paths["log_error"], return_value=None) as mock_log_error:
             self.manager.remove_from_index(instance.id)
             mock_log_error.assert_called()
@@ -349,7 +577,7 @@ class BaseDocumentManagerTest:
     def test_failure_surprise_exception(self, method):
         instance = self.factory.create()
 
-        with patch(self.paths["es_search_init"], return_value=None), patch(
+        with patch(
             self.paths["create_index_document"], side_effect=Exception("Kaboom!")
         ), patch(self.paths["log_error"], return_value=None) as mock_log_error:
             m = getattr(self.manager, method)
@@ -357,75 +585,246 @@ class BaseDocumentManagerTest:
             mock_log_error.assert_called()
 
     @pytest.mark.django_db
-    def test_update_failure_search_result_not_found(self):
-        mock_query, mock_search_obj = self.create_search_mocks()
-        mock_query.execute.side_effect = MockNotFoundError()
-
+    def test_update_failure_index_doc_not_found(self):
         instance = self.factory.create()
 
-        with patch(self.paths["es_search_init"], return_value=None), patch(
-            self.paths["es_search_params"], return_value=mock_search_obj
+        with patch(
+            self.paths["document_update"], side_effect=MockNotFoundError("Nice try!")
         ), patch(self.paths["log_info"], return_value=None) as mock_log_info:
             self.manager.update_in_index(instance)
 
             mock_log_info.assert_called()
 
     @pytest.mark.django_db
-    def test_remove_failure_search_result_not_found(self):
-        mock_query, mock_search_obj = self.create_search_mocks()
-        mock_query.execute.side_effect = MockNotFoundError()
-
+    def test_remove_failure_index_doc_not_found(self):
         instance = self.factory.create()
 
-        with patch(self.paths["es_search_init"], return_value=None), patch(
-            self.paths["es_search_params"], return_value=mock_search_obj
+        with patch(
+            self.paths["document_delete"], side_effect=MockNotFoundError("Nice try!")
         ), patch(self.paths["log_info"], return_value=None) as mock_log_info:
             self.manager.remove_from_index(instance.id)
 
             mock_log_info.assert_called()
 
     @pytest.mark.django_db
-    def test_update_failure_index_doc_not_found(self):
-        _, mock_search_obj = self.create_search_mocks()
+    def test_iterator(self):
+        with patch(self.paths["create_index_document"]) as mock_create_index_doc:
+            for _ in self.manager._iterator():
+                continue
 
-        instance = self.factory.create()
+            for instance in self.manager.model.objects.all():
+                mock_create_index_doc.assert_any_call(instance)
 
-        with patch(self.paths["es_search_init"], return_value=None), patch(
-            self.paths["es_search_params"], return_value=mock_search_obj
-        ), patch(
-            self.paths["document_get"], side_effect=MockNotFoundError("Nice try!")
-        ), patch(
-            self.paths["log_info"], return_value=None
-        ) as mock_log_info:
-            self.manager.update_in_index(instance)
+    @pytest.mark.django_db
+    def test_add_range_covers_all_instances(self):
+        site = factories.SiteFactory.create()
+        for _ in range(5):
+            self.create_instance_with_related_data(site)
+        expected_ids = [
+            doc["_source"]["document_id"] for doc in self.manager._iterator()
+        ]
+        added_ids = []
 
-            mock_log_info.assert_called()
+        def mock_parallel_bulk(es, documents, chunk_size):
+            added_ids.extend(doc["_source"]["document_id"] for doc in documents)
+            return []
+
+        with patch(self.paths["es_parallel_bulk"], side_effect=mock_parallel_bulk):
+            for low, high in get_pk_ranges(3):
+                self.manager.add_range(MagicMock(), low, high)
+
+        assert sorted(added_ids) == sorted(expected_ids)
 
     @pytest.mark.django_db
-    def test_remove_failure_index_doc_not_found(self):
-        _, mock_search_obj = self.create_search_mocks()
+    def test_sync_site_adds_site_documents(self):
+        site = factories.SiteFactory.create()
+        for _ in range(3):
+            self.create_instance_with_related_data(site)
+        self.create_instance_with_related_data(factories.SiteFactory.create())
+        expected_ids = [
+            str(instance.id)
+            for instance in self.manager.model.objects.filter(site=site)
+            if self.manager.should_be_indexed(instance)
+        ]
+        synced_ids = []
+
+        def mock_streaming_bulk(es, documents, chunk_size, raise_on_error):
+            for document in documents:
+                synced_ids.append(document["_id"])
+                yield True, {}
+
+        started = timezone.now()
+        with patch(self.paths["es_streaming_bulk"], side_effect=mock_streaming_bulk):
+            indexed_from = self.manager.sync_site(MagicMock(), site.id)
+
+        assert indexed_from >= started
+        assert sorted(synced_ids) == sorted(expected_ids)
 
-        instance = self.factory.create()
+    @pytest.mark.django_db
+    def test_sync_site_errors(self):
+        site = factories.SiteFactory.create()
+        self.create_instance_with_related_data(site)
+        failure = {"index": {"_id": "1", "status": 400}}
 
-        with patch(self.paths["es_search_init"], return_value=None), patch(
-            self.paths["es_search_params"], return_value=mock_search_obj
-        ), patch(
-            self.paths["document_get"], side_effect=MockNotFoundError("Nice try!")
-        ), patch(
-            self.paths["log_info"], return_value=None
-        ) as mock_log_info:
-            self.manager.remove_from_index(instance.id)
+        with patch(
+            self.paths["es_streaming_bulk"], return_value=[(False, failure)]
+        ), patch(self.paths["log_error"]) as mock_log_error:
+            assert self.manager.sync_site(MagicMock(), site.id) is None
 
-            mock_log_info.assert_called()
+            mock_log_error.assert_called_once()
+
+    def test_stale_site_documents_query(self):
+        site_id = uuid.uuid4()
+        indexed_before = timezone.now()
+
+        query = self.manager.stale_site_documents_query(site_id, indexed_before)
+
+        assert query["bool"]["filter"] == [
+            {"term": {"site_id": str(site_id)}},
+            {"term": {"document_type": self.manager.model.__name__}},
+        ]
+        assert {"range": {"indexed_at": {"lt": indexed_before.isoformat()}}} in query[
+            "bool"
+        ]["should"]
 
     @pytest.mark.django_db
-    def test_iterator(self):
-        with patch(self.paths["create_index_document"]) as mock_create_index_doc:
-            for _ in self.manager._iterator():
-                continue
+    def test_reindex_since_pages_through_changes(self):
+        site = factories.SiteFactory.create()
+        old_instance = self.create_instance_with_related_data(site)
+        since = timezone.now()
+        changed = [self.create_instance_with_related_data(site) for _ in range(3)]
+        # instances modified at the same time are paged by id
+        self.manager.model.objects.filter(
+            id__in=[instance.id for instance in changed]
+        ).update(system_last_modified=since + timedelta(seconds=1))
+        self.manager.model.objects.filter(id=old_instance.id).update(
+            system_last_modified=since - timedelta(seconds=1)
+        )
+        expected_ids = [
+            str(instance.id)
+            for instance in self.manager.model.objects.filter(
+                system_last_modified__gt=since
+            )
+        ]
 
-            for instance in self.manager.model.objects.all():
-                mock_create_index_doc.assert_any_call(instance)
+        with patch(self.paths["es_bulk"], return_value=(1, [])) as mock_bulk:
+            assert self.manager.reindex_since(MagicMock(), since, chunk_size=2)
+
+        written_ids = [
+            action["_id"]
+            for call in mock_bulk.call_args_list
+            for action in call.args[1]
+        ]
+        assert sorted(written_ids) == sorted(expected_ids)
+        assert mock_bulk.call_count == math.ceil(len(expected_ids) / 2)
+
+    @pytest.mark.django_db
+    def test_reindex_since_removes_unindexable_instances(self):
+        instance = self.create_non_indexable_document()
+
+        if instance:
+            with patch(self.paths["es_bulk"], return_value=(1, [])) as mock_bulk:
+                self.manager.reindex_since(
+                    MagicMock(), instance.system_last_modified - timedelta(seconds=1)
+                )
+
+            assert self.manager._delete_action(instance.id) in [
+                action for call in mock_bulk.call_args_list for action in call.args[1]
+            ]
+
+    @pytest.mark.django_db
+    def test_reindex_since_errors(self):
+        instance = self.create_indexable_document()
+        failure = {"index": {"_id": str(instance.id), "status": 400}}
+        not_found = {"delete": {"_id": "1", "status": 404}}
+
+        with patch(self.paths["es_bulk"], return_value=(0, [not_found])), patch(
+            self.paths["log_error"]
+        ) as mock_log_error:
+            assert self.manager.reindex_since(
+                MagicMock(), instance.system_last_modified - timedelta(seconds=1)
+            )
+            mock_log_error.assert_not_called()
+
+        with patch(self.paths["es_bulk"], return_value=(0, [failure])), patch(
+            self.paths["log_error"]
+        ) as mock_log_error:
+            assert not self.manager.reindex_since(
+                MagicMock(), instance.system_last_modified - timedelta(seconds=1)
+            )
+            mock_log_error.assert_called_once()
+
+    @pytest.mark.django_db
+    def test_remove_deleted(self):
+        instance = self.create_indexable_document()
+        deleted_id = str(uuid.uuid4())
+        hits = [{"_id": str(instance.id)}, {"_id": deleted_id}]
+
+        def scan_indexed_ids(es, index, query):
+            # the documents are only indexed for the site of the instance
+            site_filters = [
+                term["term"]["site_id"]
+                for term in query["query"]["bool"]["filter"]
+                if "site_id" in term["term"]
+            ]
+            if site_filters and site_filters != [str(instance.site_id)]:
+                return []
+            return hits
+
+        with patch(
+            self.paths["es_scan"], side_effect=scan_indexed_ids
+        ) as mock_scan, patch(self.paths["es_bulk"], return_value=(1, [])) as mock_bulk:
+            assert self.manager.remove_deleted(MagicMock())
+
+        query = mock_scan.call_args.kwargs["query"]
+        assert query["_source"] is False
+        assert {"term": {"document_type": self.manager.model.__name__}} in query[
+            "query"
+        ]["bool"]["filter"]
+        # only the documents of deleted instances are removed
+        mock_bulk.assert_called_once()
+        assert mock_bulk.call_args.args[1] == [self.manager._delete_action(deleted_id)]
+
+    def create_instance_with_related_data(self, site):
+        """Subclasses should override to add the related data their documents are built from"""
+        return self.factory.create(site=site)
+
+    @pytest.mark.django_db
+    def test_iterator_matches_create_index_document(self):
+        site = factories.SiteFactory.create()
+        self.create_instance_with_related_data(site)
+        self.create_instance_with_related_data(site)
+
+        expected = [
+            self.manager.create_index_document(instance).to_dict(True)
+            | {"_id": str(instance.id)}
+            for instance in self.manager.model.objects.all()
+            if self.manager.should_be_indexed(instance)
+        ]
+        actual = list(self.manager._iterator())
+        for document in actual:
+            assert document["_source"].pop("indexed_at")
+
+        def sort_key(doc):
+            return doc["_source"]["document_id"]
+
+        assert sorted(actual, key=sort_key) == sorted(expected, key=sort_key)
+
+    @pytest.mark.django_db
+    def test_iterator_query_count_does_not_depend_on_instance_count(self):
+        site = factories.SiteFactory.create()
+        self.create_instance_with_related_data(site)
+
+        with CaptureQueriesContext(connection) as few_instances:
+            list(self.manager._iterator())
+
+        for _ in range(5):
+            self.create_instance_with_related_data(site)
+
+        with CaptureQueriesContext(connection) as more_instances:
+            list(self.manager._iterator())
+
+        assert len(more_instances) == len(few_instances)
 
     def create_indexable_document(self):
         """Subclasses should override if not all documents are indexed"""
@@ -436,149 +835,190 @@ class BaseDocumentManagerTest:
         return None
 
     @pytest.mark.django_db
-    def test_sync_in_index_new_good_document_is_added(self):
-        mock_query, mock_search_obj = self.create_search_mocks()
-        mock_query.execute.side_effect = (
-            MockNotFoundError()
-        )  # new document is not yet in the index
-
+    def test_sync_in_index_good_document_is_added(self):
         instance = self.create_indexable_document()
 
-        with patch(self.paths["es_search_init"], return_value=None), patch(
-            self.paths["es_search_params"], return_value=mock_search_obj
-        ), patch(self.paths["add_to_index"], return_value=None) as mock_add_to_index:
+        with patch(
+            self.paths["add_to_index"], return_value=None
+        ) as mock_add_to_index, patch(
+            self.paths["remove_from_index"], return_value=None
+        ) as mock_remove_from_index:
             self.manager.sync_in_index(instance.id)
-            mock_add_to_index.assert_called_once_with(instance)
 
-    @pytest.mark.django_db
-    def test_sync_in_index_new_bad_document_is_skipped(self):
-        mock_query, mock_search_obj = self.create_search_mocks()
-        mock_query.execute.side_effect = (
-            MockNotFoundError()
-        )  # new document is not yet in the index
+            # adding replaces the document if it is already indexed
+            mock_add_to_index.assert_called_once_with(instance, None)
+            mock_remove_from_index.assert_not_called()
 
+    @pytest.mark.django_db
+    def test_sync_in_index_bad_document_is_removed(self):
         instance = self.create_non_indexable_document()
 
         if instance:
-            with patch(self.paths["es_search_init"], return_value=None), patch(
-                self.paths["es_search_params"], return_value=mock_search_obj
-            ), patch(
+            with patch(
                 self.paths["add_to_index"], return_value=None
             ) as mock_add_to_index, patch(
-                self.paths["update_in_index"], return_value=None
-            ) as mock_update_in_index:
+                self.paths["remove_from_index"], return_value=None
+            ) as mock_remove_from_index:
                 self.manager.sync_in_index(instance.id)
+
+                # removing is ignored if the document is not indexed
+                mock_remove_from_index.assert_called_once_with(instance.id, None)
                 mock_add_to_index.assert_not_called()
-                mock_update_in_index.assert_not_called()
 
     @pytest.mark.django_db
-    def test_sync_in_index_edited_good_document_is_updated(self):
-        _, mock_search_obj = self.create_search_mocks()
-
+    def test_sync_missing_instance_is_removed(self):
         instance = self.create_indexable_document()
+        instance_id = instance.id
+        instance.delete()
 
-        with patch(self.paths["es_search_init"], return_value=None), patch(
-            self.paths["es_search_params"], return_value=mock_search_obj
-        ), patch(
-            self.paths["add_to_index"], return_value=None
-        ) as mock_add_to_index, patch(
-            self.paths["update_in_index"], return_value=None
-        ) as mock_update_in_index, patch(
+        with patch(
             self.paths["remove_from_index"], return_value=None
-        ) as remove_from_index:
-            self.manager.sync_in_index(instance.id)
+        ) as mock_remove_from_index:
+            self.manager.sync_in_index(instance_id)
+            mock_remove_from_index.assert_called_once_with(instance_id, None)
 
-            mock_update_in_index.assert_called_once_with(instance)
-            mock_add_to_index.assert_not_called()
-            remove_from_index.assert_not_called()
+    @pytest.mark.django_db
+    def test_bulk_sync_in_index(self):
+        instance = self.create_indexable_document()
+        deleted_instance = self.create_indexable_document()
+        deleted_instance_id = deleted_instance.id
+        deleted_instance.delete()
+
+        with patch(self.paths["es_get_connection"]), patch(
+            self.paths["create_index_document"],
+            side_effect=self.mock_index_document,
+        ), patch(self.paths["es_bulk"], return_value=(1, [])) as mock_bulk, patch(
+            self.paths["es_index_refresh"]
+        ) as mock_refresh:
+            self.manager.bulk_sync_in_index([instance.id, deleted_instance_id])
+
+            mock_bulk.assert_called_once()
+            assert mock_bulk.call_args.args[1] == [
+                {"document_id": str(instance.id)},
+                {
+                    "_op_type": "delete",
+                    "_index": self.manager.index,
+                    "_id": str(deleted_instance_id),
+                },
+            ]
+            assert mock_bulk.call_args.kwargs["refresh"] is False
+            mock_refresh.assert_not_called()
 
     @pytest.mark.django_db
-    def test_sync_in_index_edited_bad_document_is_skipped(self):
-        _, mock_search_obj = self.create_search_mocks()
+    def test_bulk_refresh_policy(self):
+        instance = self.create_indexable_document()
 
+        with patch(self.paths["es_get_connection"]), patch(
+            self.paths["es_bulk"], return_value=(1, [])
+        ) as mock_bulk:
+            with index_refresh_policy(RefreshPolicy.WAIT_FOR):
+                self.manager.bulk_remove_from_index([instance.id])
+            assert mock_bulk.call_args.kwargs["refresh"] == "wait_for"
+
+            self.manager.bulk_remove_from_index([instance.id], RefreshPolicy.TRUE)
+            assert mock_bulk.call_args.kwargs["refresh"] is True
+
+    @pytest.mark.django_db
+    def test_bulk_sync_in_index_bad_document_is_removed(self):
         instance = self.create_non_indexable_document()
 
         if instance:
-            with patch(self.paths["es_search_init"], return_value=None), patch(
-                self.paths["es_search_params"], return_value=mock_search_obj
-            ), patch(
-                self.paths["add_to_index"], return_value=None
-            ) as mock_add_to_index, patch(
-                self.paths["update_in_index"], return_value=None
-            ) as mock_update_in_index:
-                self.manager.sync_in_index(instance.id)
+            with patch(self.paths["es_get_connection"]), patch(
+                self.paths["es_bulk"], return_value=(1, [])
+            ) as mock_bulk, patch(self.paths["es_index_refresh"]):
+                self.manager.bulk_sync_in_index([instance.id])
+
+                assert mock_bulk.call_args.args[1] == [
+                    {
+                        "_op_type": "delete",
+                        "_index": self.manager.index,
+                        "_id": str(instance.id),
+                    }
+                ]
 
-                mock_update_in_index.assert_not_called()
-                mock_add_to_index.assert_not_called()
+    @pytest.mark.django_db
+    def test_bulk_update_in_index(self):
+        instance = self.create_indexable_document()
+
+        with patch(self.paths["es_get_connection"]), patch(
+            self.paths["create_index_document"],
+            side_effect=self.mock_index_document,
+        ), patch(self.paths["es_bulk"], return_value=(1, [])) as mock_bulk, patch(
+            self.paths["es_index_refresh"]
+        ):
+            self.manager.bulk_update_in_index([str(instance.id)])
+
+            assert mock_bulk.call_args.args[1] == [
+                {
+                    "_op_type": "update",
+                    "_index": self.manager.index,
+                    "_id": str(instance.id),
+                    "doc": {"document_id": str(instance.id)},
+                    "retry_on_conflict": RETRY_ON_CONFLICT,
+                }
+            ]
 
     @pytest.mark.django_db
-    def test_sync_in_index_edited_good_to_bad_document_is_removed(self):
-        _, mock_search_obj = self.create_search_mocks()
-        instance = self.create_non_indexable_document()
+    def test_bulk_remove_from_index(self):
+        instance = self.create_indexable_document()
 
-        if instance:
-            with patch(self.paths["es_search_init"], return_value=None), patch(
-                self.paths["es_search_params"], return_value=mock_search_obj
-            ), patch(
-                self.paths["add_to_index"], return_value=None
-            ) as mock_add_to_index, patch(
-                self.paths["update_in_index"], return_value=None
-            ) as mock_update_in_index, patch(
-                self.paths["remove_from_index"], return_value=None
-            ) as remove_from_index:
-                self.manager.sync_in_index(instance.id)
+        with patch(self.paths["es_get_connection"]), patch(
+            self.paths["es_bulk"], return_value=(1, [])
+        ) as mock_bulk, patch(self.paths["es_index_refresh"]):
+            self.manager.bulk_remove_from_index([instance.id])
 
-                remove_from_index.assert_called_once_with(instance.id)
-                mock_update_in_index.assert_not_called()
-                mock_add_to_index.assert_not_called()
+            assert mock_bulk.call_args.args[1] == [
+                {
+                    "_op_type": "delete",
+                    "_index": self.manager.index,
+                    "_id": str(instance.id),
+                }
+            ]
 
     @pytest.mark.django_db
-    def test_sync_in_index_edited_bad_to_good_document_is_added(self):
-        _, mock_search_obj = self.create_search_mocks()
+    def test_bulk_not_indexed_errors_are_ignored(self):
+        not_found = {"delete": {"_id": "1", "status": 404}}
+
+        with patch(self.paths["es_get_connection"]), patch(
+            self.paths["es_bulk"], return_value=(0, [not_found])
+        ), patch(self.paths["es_index_refresh"]), patch(
+            self.paths["log_error"]
+        ) as mock_log_error:
+            self.manager.bulk_remove_from_index([uuid.uuid4()])
 
+            mock_log_error.assert_not_called()
+
+    @pytest.mark.django_db
+    def test_bulk_errors_are_logged(self):
+        failure = {"index": {"_id": "1", "status": 400}}
         instance = self.create_indexable_document()
 
-        with patch(self.paths["es_search_init"], return_value=None), patch(
-            self.paths["es_search_params"], return_value=mock_search_obj
+        with patch(self.paths["es_get_connection"]), patch(
+            self.paths["create_index_document"],
+            side_effect=self.mock_index_document,
+        ), patch(self.paths["es_bulk"], return_value=(0, [failure])), patch(
+            self.paths["es_index_refresh"]
         ), patch(
-            self.paths["add_to_index"], return_value=None
-        ) as mock_add_to_index, patch(
-            self.paths["update_in_index"], return_value=None
-        ) as mock_update_in_index, patch(
-            self.paths["remove_from_index"], return_value=None
-        ) as remove_from_index:
-            mock_update_in_index.side_effect = (
-                MockNotFoundError()
-            )  # document is not yet in the index
+            self.paths["log_error"]
+        ) as mock_log_error:
+            self.manager.bulk_sync_in_index([instance.id])
 
-            self.manager.sync_in_index(instance.id)
-            mock_add_to_index.assert_called_once_with(instance)
-            remove_from_index.assert_not_called()
+            mock_log_error.assert_called_once()
 
     @pytest.mark.django_db
-    def test_sync_missing_instance_is_removed(self):
-        _, mock_search_obj = self.create_search_mocks()
-
-        instance = self.create_indexable_document()
-        instance_id = instance.id
-        instance.delete()
+    def test_bulk_es_error(self):
+        with patch(self.paths["es_get_connection"]), patch(
+            self.paths["es_bulk"], side_effect=ConnectionError("Uh oh!")
+        ), patch(self.paths["log_error"]) as mock_log_error:
+            self.manager.bulk_remove_from_index([uuid.uuid4()])
 
-        with patch(self.paths["es_search_init"], return_value=None), patch(
-            self.paths["es_search_params"], return_value=mock_search_obj
-        ), patch(self.paths["log_warning"], return_value=None), patch(
-            self.paths["remove_from_index"], return_value=None
-        ) as mock_remove_from_index:
-            self.manager.sync_in_index(instance_id)
-            mock_remove_from_index.assert_called_once_with(instance_id)
+            mock_log_error.assert_called_once()
 
-    def create_search_mocks(self):
-        mock_query = MagicMock()
-        mock_query.execute.return_value = {
-            "hits": {"hits": [{"_id": TEST_SEARCH_INDEX_ID}]}
-        }
-        mock_search_obj = MagicMock()
-        mock_search_obj.query.return_value = mock_query
-        return mock_query, mock_search_obj
+    @staticmethod
+    def mock_index_document(instance):
+        mock_document = MagicMock()
+        mock_document.to_dict.return_value = {"document_id": str(instance.id)}
+        return mock_document
 
     def get_mock_document_with_es_error(self):
         mock_document = MagicMock()
@@ -714,9 +1154,9 @@ class BaseSignalTest(TransactionOnCommitMixin):
     @pytest.fixture
     def mock_index_methods(self, mocker):
         return {
-            "mock_sync": mocker.patch.object(self.manager, "sync_in_index"),
-            "mock_update": mocker.patch.object(self.manager, "update_in_index"),
-            "mock_remove": mocker.patch.object(self.manager, "remove_from_index"),
+            "mock_sync": mocker.patch.object(self.manager, "bulk_sync_in_index"),
+            "mock_update": mocker.patch.object(self.manager, "bulk_update_in_index"),
+            "mock_remove": mocker.patch.object(self.manager, "bulk_remove_from_index"),
         }
 
     @pytest.mark.django_db
@@ -724,12 +1164,14 @@ class BaseSignalTest(TransactionOnCommitMixin):
         with self.capture_on_commit_callbacks(execute=True):
             instance = self.factory.create()
 
-        mock_index_methods["mock_sync"].assert_called_with(instance.id)
+        mock_index_methods["mock_sync"].assert_called_with(
+            [instance.id], refresh=RefreshPolicy.NONE
+        )
         mock_index_methods["mock_remove"].assert_not_called()
 
         assert (
-            f"Task started. Additional info: document_manager_name: {self.manager.__name__}, instance_id: {instance.id}"
-            in caplog.text
+            f"Task started. Additional info: document_manager_name: {self.manager.__name__}, "
+            "operation: sync, instance count: 1" in caplog.text
         )
         assert ASYNC_TASK_END_TEMPLATE in caplog.text
 
@@ -744,12 +1186,14 @@ class BaseSignalTest(TransactionOnCommitMixin):
             instance.title = "New Title"
             instance.save()
 
-        mock_index_methods["mock_sync"].assert_called_once_with(instance.id)
+        mock_index_methods["mock_sync"].assert_called_once_with(
+            [instance.id], refresh=RefreshPolicy.NONE
+        )
         mock_index_methods["mock_remove"].assert_not_called()
 
         assert (
-            f"Task started. Additional info: document_manager_name: {self.manager.__name__}, instance_id: {instance.id}"
-            in caplog.text
+            f"Task started. Additional info: document_manager_name: {self.manager.__name__}, "
+            "operation: sync, instance count: 1" in caplog.text
         )
         assert ASYNC_TASK_END_TEMPLATE in caplog.text
 
@@ -764,12 +1208,14 @@ class BaseSignalTest(TransactionOnCommitMixin):
         with self.capture_on_commit_callbacks(execute=True):
             instance.delete()
 
-        mock_index_methods["mock_remove"].assert_called_once_with(instance_id)
+        mock_index_methods["mock_remove"].assert_called_once_with(
+            [instance_id], refresh=RefreshPolicy.NONE
+        )
         mock_index_methods["mock_sync"].assert_not_called()
 
         assert (
-            f"Task started. Additional info: document_manager_name: {self.manager.__name__}, instance_id: {instance_id}"
-            in caplog.text
+            f"Task started. Additional info: document_manager_name: {self.manager.__name__}, "
+            "operation: remove, instance count: 1" in caplog.text
         )
         assert ASYNC_TASK_END_TEMPLATE in caplog.text
 
@@ -808,7 +1254,9 @@ class BaseRelatedInstanceSignalTest(BaseSignalTest):
         with self.capture_on_commit_callbacks(execute=True):
             instance.delete()
 
-        mock_index_methods["mock_remove"].assert_called_with(instance_id)
+        mock_index_methods["mock_remove"].assert_called_with(
+            [instance_id], refresh=RefreshPolicy.NONE
+        )
 
     @pytest.mark.django_db
     def test_new_related_instance_main_instance_is_updated(self, mock_index_methods):
@@ -861,6 +1309,8 @@ class BaseRelatedInstanceSignalTest(BaseSignalTest):
             self.assert_only_update_called(instance, mock_index_methods)
 
     def assert_only_update_called(self, instance, mock_index_methods):
-        mock_index_methods["mock_update"].assert_called_with(instance)
+        mock_index_methods["mock_update"].assert_called_with(
+            [instance.id], refresh=RefreshPolicy.NONE
+        )
         mock_index_methods["mock_sync"].assert_not_called()
         mock_index_methods["mock_remove"].assert_not_called()
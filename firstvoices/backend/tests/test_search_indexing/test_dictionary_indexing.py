@@ -172,3 +172,19 @@ class TestDictionaryEntryDocumentManager(BaseDocumentManagerTest):
         assert str(speaker2.id) in doc.speakers
         assert str(speaker3.id) in doc.speakers
         assert str(speaker4.id) in doc.speakers
+
+    def create_instance_with_related_data(self, site):
+        speaker = factories.PersonFactory.create(site=site)
+        audio = factories.AudioFactory.create(site=site)
+        audio.speakers.add(speaker)
+        instance = self.factory.create(
+            site=site,
+            related_audio=[audio],
+            related_images=[factories.ImageFactory.create(site=site)],
+        )
+        instance.categories.add(factories.CategoryFactory.create(site=site))
+        factories.DictionaryEntryLinkFactory(
+            from_dictionary_entry=instance,
+            to_dictionary_entry=self.factory.create(site=site),
+        )
+        return instance
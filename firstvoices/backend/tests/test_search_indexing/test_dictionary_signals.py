@@ -1,5 +1,6 @@
 import pytest
 
+from backend.search.constants import RefreshPolicy
 from backend.search.indexing.dictionary_index import DictionaryEntryDocumentManager
 from backend.tests import factories
 from backend.tests.test_search_indexing.base_indexing_tests import (
@@ -53,7 +54,9 @@ class TestDictionaryEntryIndexingSignals(
         with self.capture_on_commit_callbacks(execute=True):
             instance.delete()
 
-        mock_index_methods["mock_remove"].assert_called_once_with(instance_id)
+        mock_index_methods["mock_remove"].assert_called_once_with(
+            [instance_id], refresh=RefreshPolicy.NONE
+        )
 
     @pytest.mark.django_db
     def test_assign_category_main_instance_is_synced(self, mock_index_methods):
@@ -93,7 +96,11 @@ class TestDictionaryEntryIndexingSignals(
         with self.capture_on_commit_callbacks(execute=True):
             self.assign_new_category_via_manager(instance)
 
-        mock_index_methods["mock_update"].assert_called_with(instance)
+        # the instance is also saved, and the sync replaces the update
+        mock_index_methods["mock_sync"].assert_called_once_with(
+            [instance.id], refresh=RefreshPolicy.NONE
+        )
+        mock_index_methods["mock_update"].assert_not_called()
         mock_index_methods["mock_remove"].assert_not_called()
 
     @pytest.mark.django_db
@@ -108,7 +115,9 @@ class TestDictionaryEntryIndexingSignals(
         with self.capture_on_commit_callbacks(execute=True):
             instance.categories.remove(category)
 
-        mock_index_methods["mock_update"].assert_called_with(instance)
+        mock_index_methods["mock_update"].assert_called_with(
+            [instance.id], refresh=RefreshPolicy.NONE
+        )
         mock_index_methods["mock_remove"].assert_not_called()
 
     @pytest.mark.django_db
@@ -192,7 +201,7 @@ class TestDictionaryEntryIndexingSignals(
         with self.capture_on_commit_callbacks(execute=True):
             self.assign_new_related_entry(instance)
 
-        mock_index_methods["mock_update"].assert_any_call(instance)
+        assert instance.id in mock_index_methods["mock_update"].call_args.args[0]
         mock_index_methods["mock_remove"].assert_not_called()
 
     @pytest.mark.django_db
@@ -204,9 +213,13 @@ class TestDictionaryEntryIndexingSignals(
         mock_index_methods["mock_update"].reset_mock()
 
         with self.capture_on_commit_callbacks(execute=True):
-            self.assign_new_related_entry_via_manager(instance)
+            related_entry = self.assign_new_related_entry_via_manager(instance)
 
-        mock_index_methods["mock_update"].assert_called_with(instance)
+        # the instance is also saved, and the sync replaces the update
+        mock_index_methods["mock_sync"].assert_called_once_with(
+            [related_entry.id, instance.id], refresh=RefreshPolicy.NONE
+        )
+        mock_index_methods["mock_update"].assert_not_called()
         mock_index_methods["mock_remove"].assert_not_called()
 
     @pytest.mark.django_db
@@ -224,7 +237,7 @@ class TestDictionaryEntryIndexingSignals(
         with self.capture_on_commit_callbacks(execute=True):
             dictionary_entry_link.delete()
 
-        mock_index_methods["mock_update"].assert_any_call(instance)
+        assert instance.id in mock_index_methods["mock_update"].call_args.args[0]
         mock_index_methods["mock_remove"].assert_not_called()
 
     @pytest.mark.django_db
@@ -239,7 +252,7 @@ class TestDictionaryEntryIndexingSignals(
         with self.capture_on_commit_callbacks(execute=True):
             instance.related_dictionary_entries.remove(related_entry)
 
-        mock_index_methods["mock_update"].assert_called_with(instance)
+        assert instance.id in mock_index_methods["mock_update"].call_args.args[0]
         mock_index_methods["mock_remove"].assert_not_called()
 
     @pytest.mark.django_db
@@ -254,7 +267,7 @@ class TestDictionaryEntryIndexingSignals(
         with self.capture_on_commit_callbacks(execute=True):
             related_entry.delete()
 
-        mock_index_methods["mock_update"].assert_any_call(instance)
+        assert instance.id in mock_index_methods["mock_update"].call_args.args[0]
 
     @pytest.mark.django_db
     def test_assign_related_entry_instance_paused(self, mock_index_methods):
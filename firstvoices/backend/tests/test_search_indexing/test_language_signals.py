@@ -1,5 +1,6 @@
 import pytest
 
+from backend.search.constants import RefreshPolicy
 from backend.search.indexing.language_index import (
     LanguageDocumentManager,
     SiteDocumentManager,
@@ -12,14 +13,16 @@ from backend.tests.utils import TransactionOnCommitMixin
 def mock_index_methods(mocker):
     return {
         "mock_sync_language": mocker.patch.object(
-            LanguageDocumentManager, "sync_in_index"
+            LanguageDocumentManager, "bulk_sync_in_index"
         ),
         "mock_remove_language": mocker.patch.object(
-            LanguageDocumentManager, "remove_from_index"
+            LanguageDocumentManager, "bulk_remove_from_index"
+        ),
+        "mock_sync_site": mocker.patch.object(
+            SiteDocumentManager, "bulk_sync_in_index"
         ),
-        "mock_sync_site": mocker.patch.object(SiteDocumentManager, "sync_in_index"),
         "mock_remove_site": mocker.patch.object(
-            SiteDocumentManager, "remove_from_index"
+            SiteDocumentManager, "bulk_remove_from_index"
         ),
     }
 
@@ -51,7 +54,8 @@ class TestLanguageIndexingSignals(TransactionOnCommitMixin):
             family.title = "New Family Title"
             family.save()
 
-        assert mock_index_methods["mock_sync_language"].call_count == 2
+        mock_index_methods["mock_sync_language"].assert_called_once()
+        assert len(mock_index_methods["mock_sync_language"].call_args.args[0]) == 2
         mock_index_methods["mock_remove_language"].assert_not_called()
         mock_index_methods["mock_sync_site"].assert_not_called()
         mock_index_methods["mock_remove_site"].assert_not_called()
@@ -61,7 +65,9 @@ class TestLanguageIndexingSignals(TransactionOnCommitMixin):
         with self.capture_on_commit_callbacks(execute=True):
             language = factories.LanguageFactory.create()
 
-        mock_index_methods["mock_sync_language"].assert_called_once_with(language.id)
+        mock_index_methods["mock_sync_language"].assert_called_once_with(
+            [language.id], refresh=RefreshPolicy.NONE
+        )
         mock_index_methods["mock_remove_language"].assert_not_called()
         mock_index_methods["mock_sync_site"].assert_not_called()
         mock_index_methods["mock_remove_site"].assert_not_called()
@@ -77,7 +83,9 @@ class TestLanguageIndexingSignals(TransactionOnCommitMixin):
             language.title = "New title"
             language.save()
 
-        mock_index_methods["mock_sync_language"].assert_called_once_with(language.id)
+        mock_index_methods["mock_sync_language"].assert_called_once_with(
+            [language.id], refresh=RefreshPolicy.NONE
+        )
         mock_index_methods["mock_remove_language"].assert_not_called()
         mock_index_methods["mock_sync_site"].assert_not_called()
         mock_index_methods["mock_remove_site"].assert_not_called()
@@ -89,7 +97,9 @@ class TestLanguageIndexingSignals(TransactionOnCommitMixin):
             language_id = language.id
             language.delete()
 
-        mock_index_methods["mock_remove_language"].assert_called_once_with(language_id)
+        mock_index_methods["mock_remove_language"].assert_called_once_with(
+            [language_id], refresh=RefreshPolicy.NONE
+        )
 
     @pytest.mark.django_db
     def test_deleted_language_related_sites_are_synced(self, mock_index_methods):
@@ -105,7 +115,8 @@ class TestLanguageIndexingSignals(TransactionOnCommitMixin):
         with self.capture_on_commit_callbacks(execute=True):
             language.delete()
 
-        assert mock_index_methods["mock_sync_site"].call_count == 2
+        mock_index_methods["mock_sync_site"].assert_called_once()
+        assert len(mock_index_methods["mock_sync_site"].call_args.args[0]) == 2
 
 
 class TestSiteIndexingSignals(TransactionOnCommitMixin):
@@ -114,7 +125,9 @@ class TestSiteIndexingSignals(TransactionOnCommitMixin):
         with self.capture_on_commit_callbacks(execute=True):
             site = factories.SiteFactory.create(language=None)
 
-        mock_index_methods["mock_sync_site"].assert_called_once_with(site.id)
+        mock_index_methods["mock_sync_site"].assert_called_once_with(
+            [site.id], refresh=RefreshPolicy.NONE
+        )
 
     @pytest.mark.django_db
     def test_new_site_with_language_is_synced(self, mock_index_methods):
@@ -126,7 +139,9 @@ class TestSiteIndexingSignals(TransactionOnCommitMixin):
         with self.capture_on_commit_callbacks(execute=True):
             site = factories.SiteFactory.create(language=language)
 
-        mock_index_methods["mock_sync_site"].assert_called_once_with(site.id)
+        mock_index_methods["mock_sync_site"].assert_called_once_with(
+            [site.id], refresh=RefreshPolicy.NONE
+        )
 
     @pytest.mark.django_db
     def test_new_site_related_language_is_synced(self, mock_index_methods):
@@ -138,7 +153,9 @@ class TestSiteIndexingSignals(TransactionOnCommitMixin):
         with self.capture_on_commit_callbacks(execute=True):
             factories.SiteFactory.create(language=language)
 
-        mock_index_methods["mock_sync_language"].assert_called_once_with(language.id)
+        mock_index_methods["mock_sync_language"].assert_called_once_with(
+            [language.id], refresh=RefreshPolicy.NONE
+        )
 
     @pytest.mark.django_db
     def test_edited_site_is_synced(self, mock_index_methods):
@@ -151,7 +168,9 @@ class TestSiteIndexingSignals(TransactionOnCommitMixin):
             site.title = "New Title"
             site.save()
 
-        mock_index_methods["mock_sync_site"].assert_called_once_with(site.id)
+        mock_index_methods["mock_sync_site"].assert_called_once_with(
+            [site.id], refresh=RefreshPolicy.NONE
+        )
 
     @pytest.mark.django_db
     def test_edited_site_related_languages_are_synced(self, mock_index_methods):
@@ -167,7 +186,8 @@ class TestSiteIndexingSignals(TransactionOnCommitMixin):
             site.language = language2
             site.save()
 
-        assert mock_index_methods["mock_sync_language"].call_count == 2
+        mock_index_methods["mock_sync_language"].assert_called_once()
+        assert len(mock_index_methods["mock_sync_language"].call_args.args[0]) == 2
 
     @pytest.mark.django_db
     def test_deleted_site_is_removed(self, mock_index_methods):
@@ -176,7 +196,9 @@ class TestSiteIndexingSignals(TransactionOnCommitMixin):
             site_id = site.id
             site.delete()
 
-        mock_index_methods["mock_remove_site"].assert_called_once_with(site_id)
+        mock_index_methods["mock_remove_site"].assert_called_once_with(
+            [site_id], refresh=RefreshPolicy.NONE
+        )
 
     @pytest.mark.django_db
     def test_deleted_site_related_language_is_synced(self, mock_index_methods):
@@ -189,4 +211,6 @@ class TestSiteIndexingSignals(TransactionOnCommitMixin):
         with self.capture_on_commit_callbacks(execute=True):
             site.delete()
 
-        mock_index_methods["mock_sync_language"].assert_called_once_with(language.id)
+        mock_index_methods["mock_sync_language"].assert_called_once_with(
+            [language.id], refresh=RefreshPolicy.NONE
+        )
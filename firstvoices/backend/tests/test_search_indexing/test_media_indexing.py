@@ -25,6 +25,10 @@ class BaseMediaDocumentManagerTest(BaseDocumentManagerTest):
     expected_index_name = ELASTICSEARCH_MEDIA_INDEX
     expected_type = ""
 
+    def create_instance_with_related_data(self, site):
+        factories.SiteFeatureFactory.create(site=site, is_enabled=True)
+        return self.factory.create(site=site)
+
     @pytest.mark.django_db
     def test_create_document(self):
         site = factories.SiteFactory.create(visibility=Visibility.MEMBERS)
@@ -96,6 +100,11 @@ class TestAudioDocumentManager(BaseMediaDocumentManagerTest):
         assert str(speaker1.id) in doc.speakers
         assert str(speaker2.id) in doc.speakers
 
+    def create_instance_with_related_data(self, site):
+        instance = super().create_instance_with_related_data(site)
+        instance.speakers.add(factories.PersonFactory.create(site=site))
+        return instance
+
 
 class TestDocumentDocumentManager(BaseMediaDocumentManagerTest):
     manager = DocumentDocumentManager
@@ -1,10 +1,15 @@
+from unittest.mock import ANY, call
+
 import pytest
+from django.utils import timezone
 
 from backend.models.constants import Visibility
+from backend.search.constants import RefreshPolicy
 from backend.search.indexing import (
     AudioDocumentManager,
     DictionaryEntryDocumentManager,
     DictionaryIndexManager,
+    DocumentDocumentManager,
     ImageDocumentManager,
     MediaIndexManager,
     SongDocumentManager,
@@ -13,6 +18,7 @@ from backend.search.indexing import (
     StoryIndexManager,
     VideoDocumentManager,
 )
+from backend.search.signals.site_signals import indexing_signals_paused
 from backend.tasks.constants import ASYNC_TASK_END_TEMPLATE
 from backend.tests import factories
 from backend.tests.utils import TransactionOnCommitMixin
@@ -21,6 +27,8 @@ from backend.tests.utils import TransactionOnCommitMixin
 class TestSiteSignals(TransactionOnCommitMixin):
     """Tests that site content is properly indexed on major Site changes."""
 
+    indexed_from = timezone.now()
+
     index_managers = [
         DictionaryIndexManager,
         SongIndexManager,
@@ -33,6 +41,7 @@ class TestSiteSignals(TransactionOnCommitMixin):
         StoryDocumentManager,
         ImageDocumentManager,
         AudioDocumentManager,
+        DocumentDocumentManager,
         VideoDocumentManager,
     ]
 
@@ -43,6 +52,16 @@ class TestSiteSignals(TransactionOnCommitMixin):
         for manager in self.index_managers:
             prefix = manager.__name__ + "_"
             mocks[prefix + "rebuild"] = mocker.patch.object(manager, "rebuild")
+            mocks[prefix + "refresh"] = mocker.patch.object(manager, "refresh")
+            mocks[prefix + "has_current_mapping"] = mocker.patch.object(
+                manager, "has_current_mapping", return_value=True
+            )
+            mocks[prefix + "update_by_query"] = mocker.patch.object(
+                manager, "update_by_query", return_value=True
+            )
+            mocks[prefix + "delete_by_query"] = mocker.patch.object(
+                manager, "delete_by_query", return_value=True
+            )
 
         return mocks
 
@@ -60,6 +79,18 @@ class TestSiteSignals(TransactionOnCommitMixin):
                 manager, "sync_in_index"
             )
 
+            mocks[prefix + "bulk_remove_from_index"] = mocker.patch.object(
+                manager, "bulk_remove_from_index"
+            )
+
+            mocks[prefix + "bulk_sync_in_index"] = mocker.patch.object(
+                manager, "bulk_sync_in_index"
+            )
+
+            mocks[prefix + "sync_site"] = mocker.patch.object(
+                manager, "sync_site", return_value=self.indexed_from
+            )
+
         return mocks
 
     @pytest.mark.django_db
@@ -83,17 +114,13 @@ class TestSiteSignals(TransactionOnCommitMixin):
         assert "site_content_indexing_tasks" not in caplog.text
 
     @pytest.mark.django_db
-    def test_edit_site_visibility_syncs_index(
+    def test_edit_site_visibility_updates_index(
         self, index_manager_mocks, document_manager_mocks, caplog
     ):
         with self.capture_on_commit_callbacks(execute=True):
             site = factories.SiteFactory.create(visibility=Visibility.PUBLIC)
-            dictionary_entry = factories.DictionaryEntryFactory.create(site=site)
-            song = factories.SongFactory.create(site=site)
-            story = factories.StoryFactory.create(site=site)
-            audio = factories.AudioFactory.create(site=site)
-            image = factories.ImageFactory.create(site=site)
-            video = factories.VideoFactory.create(site=site)
+            factories.DictionaryEntryFactory.create(site=site)
+            factories.AudioFactory.create(site=site)
 
         self.reset_all_mocks(index_manager_mocks)
         self.reset_all_mocks(document_manager_mocks)
@@ -102,14 +129,76 @@ class TestSiteSignals(TransactionOnCommitMixin):
             site.visibility = Visibility.MEMBERS
             site.save()
 
-        self.assert_document_synced(
-            document_manager_mocks, DictionaryEntryDocumentManager, dictionary_entry
-        )
-        self.assert_document_synced(document_manager_mocks, SongDocumentManager, song)
-        self.assert_document_synced(document_manager_mocks, StoryDocumentManager, story)
-        self.assert_document_synced(document_manager_mocks, AudioDocumentManager, audio)
-        self.assert_document_synced(document_manager_mocks, ImageDocumentManager, image)
-        self.assert_document_synced(document_manager_mocks, VideoDocumentManager, video)
+        for manager in self.index_managers:
+            mock_update_by_query = index_manager_mocks[
+                manager.__name__ + "_update_by_query"
+            ]
+            mock_update_by_query.assert_called_once()
+            query, _, params = mock_update_by_query.call_args.args
+            assert query == {"term": {"site_id": str(site.id)}}
+            assert params == {
+                "site_visibility": Visibility.MEMBERS,
+                "from_visibility": None,
+                "to_visibility": None,
+            }
+
+        self.assert_no_mocks_called(document_manager_mocks)
+        assert ASYNC_TASK_END_TEMPLATE in caplog.text
+
+    @pytest.mark.django_db
+    def test_edit_site_visibility_paused_does_not_affect_index(
+        self, index_manager_mocks, document_manager_mocks
+    ):
+        with self.capture_on_commit_callbacks(execute=True):
+            site = factories.SiteFactory.create(visibility=Visibility.PUBLIC)
+            factories.SiteFeatureFactory.create(
+                site=site, key="indexing_paused", is_enabled=True
+            )
+
+        self.reset_all_mocks(index_manager_mocks)
+        self.reset_all_mocks(document_manager_mocks)
+
+        with self.capture_on_commit_callbacks(execute=True):
+            site.visibility = Visibility.MEMBERS
+            site.save()
+
+        self.assert_no_mocks_called(index_manager_mocks)
+        self.assert_no_mocks_called(document_manager_mocks)
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize(
+        "current_mapping, update_complete", [(False, True), (True, False)]
+    )
+    def test_edit_site_visibility_syncs_index(
+        self,
+        index_manager_mocks,
+        document_manager_mocks,
+        caplog,
+        current_mapping,
+        update_complete,
+    ):
+        for manager in self.index_managers:
+            prefix = manager.__name__ + "_"
+            index_manager_mocks[prefix + "has_current_mapping"].return_value = (
+                current_mapping
+            )
+            index_manager_mocks[prefix + "update_by_query"].return_value = (
+                update_complete
+            )
+
+        with self.capture_on_commit_callbacks(execute=True):
+            site = factories.SiteFactory.create(visibility=Visibility.PUBLIC)
+            factories.DictionaryEntryFactory.create(site=site)
+            factories.AudioFactory.create(site=site)
+
+        self.reset_all_mocks(index_manager_mocks)
+        self.reset_all_mocks(document_manager_mocks)
+
+        with self.capture_on_commit_callbacks(execute=True):
+            site.visibility = Visibility.MEMBERS
+            site.save()
+
+        self.assert_site_synced(index_manager_mocks, document_manager_mocks, site)
 
         assert f"Task started. Additional info: site: {site}" in caplog.text
         assert ASYNC_TASK_END_TEMPLATE in caplog.text
@@ -130,9 +219,16 @@ class TestSiteSignals(TransactionOnCommitMixin):
         self.reset_all_mocks(index_manager_mocks)
         self.reset_all_mocks(document_manager_mocks)
 
+        site_id = site.id
         with self.capture_on_commit_callbacks(execute=True):
             site.delete()
 
+        for manager in self.index_managers:
+            index_manager_mocks[
+                manager.__name__ + "_delete_by_query"
+            ].assert_called_once_with({"term": {"site_id": str(site_id)}})
+
+        # content deleted with the site is also removed by its own signals
         self.assert_document_removed(
             document_manager_mocks, DictionaryEntryDocumentManager, dictionary_entry
         )
@@ -170,12 +266,69 @@ class TestSiteSignals(TransactionOnCommitMixin):
 
     @staticmethod
     def assert_document_removed(mocks, document_manager, instance):
-        mocks[document_manager.__name__ + "_remove_from_index"].assert_called_once_with(
-            instance.id
+        mocks[
+            document_manager.__name__ + "_bulk_remove_from_index"
+        ].assert_called_once_with([instance.id], refresh=RefreshPolicy.NONE)
+
+    def assert_site_synced(self, index_manager_mocks, document_manager_mocks, site):
+        for index_manager in self.index_managers:
+            prefix = index_manager.__name__ + "_"
+            stale_document_deletes = []
+
+            for document_manager in index_manager.document_managers:
+                document_manager_mocks[
+                    document_manager.__name__ + "_sync_site"
+                ].assert_called_once_with(ANY, site.id)
+                stale_document_deletes.append(
+                    call(
+                        document_manager.stale_site_documents_query(
+                            site.id, self.indexed_from
+                        )
+                    )
+                )
+
+            index_manager_mocks[prefix + "delete_by_query"].assert_has_calls(
+                stale_document_deletes
+            )
+            index_manager_mocks[prefix + "refresh"].assert_called_once()
+
+
+class TestIndexingSignalsPaused:
+    @pytest.mark.django_db
+    def test_paused_state_is_memoized(self, django_assert_num_queries):
+        site = factories.SiteFactory.create()
+        factories.SiteFeatureFactory.create(
+            site=site, key="indexing_paused", is_enabled=True
         )
 
-    @staticmethod
-    def assert_document_synced(mocks, document_manager, instance):
-        mocks[document_manager.__name__ + "_sync_in_index"].assert_called_once_with(
-            instance.id
+        with django_assert_num_queries(1):
+            assert indexing_signals_paused(site) is True
+            assert indexing_signals_paused(site) is True
+
+    @pytest.mark.django_db
+    def test_pausing_and_resuming_resets_memo(self):
+        site = factories.SiteFactory.create()
+        assert indexing_signals_paused(site) is False
+
+        feature = factories.SiteFeatureFactory.create(
+            site=site, key="indexing_paused", is_enabled=True
         )
+        assert indexing_signals_paused(site) is True
+
+        feature.is_enabled = False
+        feature.save()
+        assert indexing_signals_paused(site) is False
+
+        feature.is_enabled = True
+        feature.save()
+        feature.delete()
+        assert indexing_signals_paused(site) is False
+
+    @pytest.mark.django_db
+    def test_other_features_do_not_reset_memo(self, django_assert_num_queries):
+        site = factories.SiteFactory.create()
+        indexing_signals_paused(site)
+        factories.SiteFeatureFactory.create(site=site, key="other_feature")
+
+        with django_assert_num_queries(0):
+            assert indexing_signals_paused(site) is False
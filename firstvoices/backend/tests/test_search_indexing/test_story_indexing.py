@@ -62,3 +62,12 @@ class TestSongDocumentManager(BaseDocumentManagerTest):
 
         assert doc.created == instance.created
         assert doc.last_modified == instance.last_modified
+
+    def create_instance_with_related_data(self, site):
+        instance = self.factory.create(
+            site=site,
+            related_audio=[factories.AudioFactory.create(site=site)],
+            related_images=[factories.ImageFactory.create(site=site)],
+        )
+        factories.StoryPageFactory.create(site=site, story=instance)
+        return instance
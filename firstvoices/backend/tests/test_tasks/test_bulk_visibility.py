@@ -21,7 +21,7 @@ class TestBulkVisibilityTasks(IgnoreTaskResultsMixin):
     @pytest.fixture(scope="function", autouse=True)
     def mocked_indexing_async_func(self, mocker):
         self.mocked_func = mocker.patch(
-            "backend.tasks.visibility_tasks.request_sync_all_site_content_in_indexes"
+            "backend.tasks.visibility_tasks.request_update_site_visibility_in_indexes"
         )
 
     @pytest.mark.django_db
@@ -68,7 +68,7 @@ class TestBulkVisibilityTasks(IgnoreTaskResultsMixin):
         assert job.status == JobStatus.COMPLETE
         assert site.visibility == to_visibility
         assert site.sitefeature_set.get(key="indexing_paused").is_enabled is False
-        assert self.mocked_func.call_count == 1
+        self.mocked_func.assert_called_once_with(site, from_visibility, to_visibility)
 
         assert (
             f"Task started. Additional info: job_instance_id: {job.id}" in caplog.text
@@ -121,7 +121,7 @@ class TestBulkVisibilityTasks(IgnoreTaskResultsMixin):
         assert job.status == JobStatus.COMPLETE
         assert site.visibility == to_visibility
         assert site.sitefeature_set.get(key="indexing_paused").is_enabled is False
-        assert self.mocked_func.call_count == 1
+        self.mocked_func.assert_called_once_with(site, from_visibility, to_visibility)
 
         assert (
             DictionaryEntry.objects.filter(site=site, visibility=to_visibility).count()
@@ -4,12 +4,13 @@ from unittest.mock import patch
 import pytest
 from django.core.exceptions import ValidationError
 
-from backend.models import Alphabet, DictionaryCleanupJob, DictionaryEntry
+from backend.models import Alphabet, Character, DictionaryCleanupJob, DictionaryEntry
 from backend.models.jobs import JobStatus
 from backend.tasks.constants import ASYNC_TASK_END_TEMPLATE
 from backend.tasks.dictionary_cleanup_tasks import cleanup_dictionary
 from backend.tests import factories
 from backend.tests.test_tasks.base_task_test import IgnoreTaskResultsMixin
+from backend.utils.dictionary_cleanup_utils import calculate_cleanup_batches
 
 
 class TestDictionaryCleanupTasks(IgnoreTaskResultsMixin):
@@ -516,12 +517,216 @@ class TestDictionaryCleanupTasks(IgnoreTaskResultsMixin):
 
         self.assert_async_task_logs(job, caplog)
 
+    @pytest.mark.django_db
+    def test_unchanged_entries_not_written(self, site, alphabet, caplog):
+        factories.CharacterFactory.create(site=site, title="a")
+        unchanged_entry = factories.DictionaryEntryFactory.create(site=site, title="a")
+        changed_entry = factories.DictionaryEntryFactory.create(site=site, title="ab")
+        factories.CharacterFactory.create(site=site, title="b")
+        job = factories.DictionaryCleanupJobFactory.create(site=site, is_preview=False)
+
+        cleanup_dictionary(job.id)
+        job.refresh_from_db()
+
+        assert job.status == JobStatus.COMPLETE
+        assert (
+            DictionaryEntry.objects.get(id=unchanged_entry.id).system_last_modified
+            == unchanged_entry.system_last_modified
+        )
+        updated_entry = DictionaryEntry.objects.get(id=changed_entry.id)
+        assert updated_entry.system_last_modified > changed_entry.system_last_modified
+        assert updated_entry.custom_order == "!#"
+        assert updated_entry.split_chars_base == ["a", "b"]
+
+    @pytest.mark.django_db
+    def test_progress(self, site, alphabet, caplog):
+        factories.DictionaryEntryFactory.create(site=site, title="abc")
+        factories.DictionaryEntryFactory.create(site=site, title="def")
+        job = factories.DictionaryCleanupJobFactory.create(site=site, is_preview=True)
+
+        cleanup_dictionary(job.id)
+        job.refresh_from_db()
+
+        assert job.status == JobStatus.COMPLETE
+        assert job.total_entries == 2
+        assert job.processed_entries == 2
+
+    @pytest.mark.django_db
+    def test_incremental_cleanup_new_character(self, site, alphabet, caplog):
+        for title in "abc":
+            factories.CharacterFactory.create(site=site, title=title)
+        for title in ["a", "ab", "bc", "ad"]:
+            factories.DictionaryEntryFactory.create(site=site, title=title)
+
+        job = factories.DictionaryCleanupJobFactory.create(site=site, is_preview=False)
+        cleanup_dictionary(job.id)
+        job.refresh_from_db()
+        assert job.total_entries == 4
+
+        factories.CharacterFactory.create(site=site, title="d")
+        job = factories.DictionaryCleanupJobFactory.create(site=site, is_preview=False)
+        cleanup_dictionary(job.id)
+        job.refresh_from_db()
+
+        assert job.status == JobStatus.COMPLETE
+        # only the entry with the previously unknown character is recalculated
+        assert job.total_entries == 1
+        assert job.cleanup_result == {
+            "unknown_character_count": {},
+            "updated_entries": [
+                {
+                    "title": "ad",
+                    "cleaned_title": "",
+                    "is_title_updated": False,
+                    "previous_custom_order": "!⚑d",
+                    "new_custom_order": "!%",
+                }
+            ],
+        }
+        assert DictionaryEntry.objects.get(title="ad").split_chars_base == ["a", "d"]
+
+    @pytest.mark.django_db
+    def test_incremental_cleanup_sort_order_changed(self, site, alphabet, caplog):
+        for title in "abc":
+            factories.CharacterFactory.create(site=site, title=title)
+        for title in ["a", "ab", "c", "a-"]:
+            factories.DictionaryEntryFactory.create(site=site, title=title)
+
+        job = factories.DictionaryCleanupJobFactory.create(site=site, is_preview=False)
+        cleanup_dictionary(job.id)
+
+        character = Character.objects.get(site=site, title="b")
+        character.sort_order = 100
+        character.save()
+        unchanged_entry = factories.DictionaryEntryFactory.create(site=site, title="aa")
+
+        job = factories.DictionaryCleanupJobFactory.create(site=site, is_preview=False)
+        cleanup_dictionary(job.id)
+        job.refresh_from_db()
+
+        assert job.status == JobStatus.COMPLETE
+        # entries containing b or c, entries with unknown characters, and entries saved since the last cleanup
+        assert job.total_entries == 4
+        assert DictionaryEntry.objects.get(title="ab").custom_order == "!$"
+        assert DictionaryEntry.objects.get(title="c").custom_order == "#"
+        assert (
+            DictionaryEntry.objects.get(id=unchanged_entry.id).system_last_modified
+            == unchanged_entry.system_last_modified
+        )
+
+    @pytest.mark.django_db
+    def test_incremental_cleanup_ignorable_added(self, site, alphabet, caplog):
+        for title in "ab":
+            factories.CharacterFactory.create(site=site, title=title)
+        for title in ["ab", "a-b"]:
+            factories.DictionaryEntryFactory.create(site=site, title=title)
+
+        job = factories.DictionaryCleanupJobFactory.create(site=site, is_preview=False)
+        cleanup_dictionary(job.id)
+        assert "⚑" in DictionaryEntry.objects.get(title="a-b").custom_order
+
+        factories.IgnoredCharacterFactory.create(site=site, title="-")
+        job = factories.DictionaryCleanupJobFactory.create(site=site, is_preview=False)
+        cleanup_dictionary(job.id)
+        job.refresh_from_db()
+
+        assert job.status == JobStatus.COMPLETE
+        assert job.total_entries == 1
+        assert job.cleanup_result["unknown_character_count"] == {}
+        entry = DictionaryEntry.objects.get(title="a-b")
+        assert "⚑" not in entry.custom_order
+        assert entry.split_chars_base == []
+
+    @pytest.mark.django_db
+    def test_incremental_cleanup_counts_unknown_characters_for_site(
+        self, site, alphabet, caplog
+    ):
+        factories.CharacterFactory.create(site=site, title="a")
+        for title in ["a", "ax", "xyx"]:
+            factories.DictionaryEntryFactory.create(site=site, title=title)
+
+        job = factories.DictionaryCleanupJobFactory.create(site=site, is_preview=False)
+        cleanup_dictionary(job.id)
+
+        job = factories.DictionaryCleanupJobFactory.create(site=site, is_preview=True)
+        cleanup_dictionary(job.id)
+        job.refresh_from_db()
+
+        assert job.status == JobStatus.COMPLETE
+        assert job.total_entries == 0
+        assert job.cleanup_result == {
+            "unknown_character_count": {"⚑x": 3, "⚑y": 1},
+            "updated_entries": [],
+        }
+
+    @pytest.mark.django_db
+    def test_incremental_cleanup_after_alphabet_change_during_job(
+        self, site, alphabet, caplog
+    ):
+        factories.CharacterFactory.create(site=site, title="a")
+        factories.DictionaryEntryFactory.create(site=site, title="a")
+
+        job = factories.DictionaryCleanupJobFactory.create(site=site, is_preview=False)
+        with patch(
+            "backend.tasks.dictionary_cleanup_tasks.write_cleanup_changes",
+            side_effect=lambda *args: factories.CharacterFactory.create(
+                site=site, title="b"
+            ),
+        ):
+            cleanup_dictionary(job.id)
+
+        alphabet.refresh_from_db()
+        assert alphabet.last_cleanup_config is None
+
+        job = factories.DictionaryCleanupJobFactory.create(site=site, is_preview=True)
+        cleanup_dictionary(job.id)
+        job.refresh_from_db()
+        assert job.total_entries == 1
+
+    @pytest.mark.django_db
+    def test_parallel_calculation_matches_serial(self, site, alphabet):
+        factories.CharacterFactory.create(site=site, title="a")
+        factories.CharacterFactory.create(site=site, title="aa")
+        factories.IgnoredCharacterFactory.create(site=site, title="-")
+        rows = [
+            (uuid.uuid4(), title, "", [])
+            for title in ["aaa", "a-a", "xa", "aax", "a", " a "]
+        ]
+        batches = [rows[:2], rows[2:4], rows[4:]]
+        engine = Alphabet.objects.get(id=alphabet.id).engine
+
+        serial = list(calculate_cleanup_batches(engine, batches, 225))
+        parallel = list(calculate_cleanup_batches(engine, batches, 225, workers=2))
+
+        assert parallel == serial
+        assert [result.entry_count for result in parallel] == [2, 2, 2]
+
+    @pytest.mark.django_db
+    def test_parallel_calculation_reads_batches_lazily(self, site, alphabet):
+        factories.CharacterFactory.create(site=site, title="a")
+        engine = Alphabet.objects.get(id=alphabet.id).engine
+        read_batches = []
+
+        def batches():
+            for i in range(20):
+                read_batches.append(i)
+                yield [(uuid.uuid4(), "a", "", [])]
+
+        results = calculate_cleanup_batches(engine, batches(), 225, workers=2)
+        next(results)
+        assert len(read_batches) < 20
+
+        assert len(list(results)) == 19
+        assert len(read_batches) == 20
+
     @pytest.mark.django_db
     def test_dictionary_cleanup_job_exception(self, site, caplog):
         factories.DictionaryEntryFactory.create(site=site, title="abc")
+        factories.CharacterFactory.create(site=site, title="a")
         job = factories.DictionaryCleanupJobFactory.create(site=site, is_preview=False)
-        with patch.object(
-            DictionaryEntry, "save", side_effect=Exception("Mocked exception")
+        with patch(
+            "django.db.models.query.QuerySet.bulk_update",
+            side_effect=Exception("Mocked exception"),
         ):
             cleanup_dictionary(job.id)
 
@@ -1,7 +1,20 @@
 import uuid
+from unittest.mock import MagicMock, patch
 
+import pytest
+from django.db import transaction
+
+from backend.search.constants import RefreshPolicy
+from backend.search.indexing import DictionaryEntryDocumentManager, SongDocumentManager
+from backend.search.indexing.base import index_refresh_policy
+from backend.search.tasks import index_manager_tasks
 from backend.search.tasks.index_manager_tasks import (
+    bulk_index,
+    reindex_since_watermark,
     remove_from_index,
+    request_remove_from_index,
+    request_sync_in_index,
+    request_update_in_index,
     sync_in_index,
     update_in_index,
 )
@@ -9,8 +22,11 @@ from backend.search.tasks.site_content_indexing_tasks import (
     remove_all_site_content_from_indexes,
     sync_all_media_site_content_in_indexes,
     sync_all_site_content_in_indexes,
+    update_site_visibility_in_indexes,
 )
+from backend.tests import factories
 from backend.tests.test_tasks.base_task_test import IgnoreTaskResultsMixin
+from backend.tests.utils import TransactionOnCommitMixin
 
 # Tests for search task celery behaviour, not the actual search task functionality
 
@@ -36,22 +52,178 @@ class TestRemoveFromIndex(IgnoreTaskResultsMixin):
         return ["DocumentManager", uuid.uuid4()]
 
 
+class TestBulkIndex(IgnoreTaskResultsMixin):
+    TASK = bulk_index
+
+    def get_valid_task_args(self):
+        return ["DocumentManager", "sync", [uuid.uuid4()]]
+
+
+class TestReindexSinceWatermark(IgnoreTaskResultsMixin):
+    TASK = reindex_since_watermark
+
+    @pytest.fixture(autouse=True)
+    def mock_index_managers(self):
+        index_managers = [MagicMock(), MagicMock()]
+        with patch.object(index_manager_tasks, "INDEX_MANAGERS", index_managers):
+            yield index_managers
+
+    def get_valid_task_args(self):
+        return None
+
+    def test_all_indexes_are_caught_up(self, mock_index_managers):
+        reindex_since_watermark.apply_async()
+
+        for index_manager in mock_index_managers:
+            index_manager.reindex_since.assert_called_once_with()
+
+
+class TestIndexingBuffer(TransactionOnCommitMixin):
+    @pytest.fixture
+    def mock_bulk_index(self, mocker):
+        return mocker.patch.object(bulk_index, "apply_async")
+
+    def requested(self, mock_bulk_index):
+        """The manager, operation and instance ids of each bulk_index task sent"""
+        return [call.args[0][:3] for call in mock_bulk_index.call_args_list]
+
+    def requested_refresh(self, mock_bulk_index):
+        return [call.args[0][3] for call in mock_bulk_index.call_args_list]
+
+    @pytest.mark.django_db
+    def test_requests_are_sent_on_commit(self, mock_bulk_index):
+        entry = factories.DictionaryEntryFactory.build()
+
+        with self.capture_on_commit_callbacks(execute=False) as callbacks:
+            request_sync_in_index(DictionaryEntryDocumentManager, entry)
+
+        mock_bulk_index.assert_not_called()
+        for callback in callbacks:
+            callback()
+
+        assert self.requested(mock_bulk_index) == [
+            ("DictionaryEntryDocumentManager", "sync", [entry.id])
+        ]
+
+    @pytest.mark.django_db
+    def test_requests_are_coalesced(self, mock_bulk_index):
+        entries = factories.DictionaryEntryFactory.build_batch(3)
+        song = factories.SongFactory.build()
+
+        with self.capture_on_commit_callbacks(execute=True):
+            for entry in entries:
+                request_sync_in_index(DictionaryEntryDocumentManager, entry)
+                request_sync_in_index(DictionaryEntryDocumentManager, entry)
+            request_sync_in_index(SongDocumentManager, song)
+
+        assert self.requested(mock_bulk_index) == [
+            ("DictionaryEntryDocumentManager", "sync", [e.id for e in entries]),
+            ("SongDocumentManager", "sync", [song.id]),
+        ]
+
+    @pytest.mark.django_db
+    def test_operation_precedence(self, mock_bulk_index):
+        updated, synced, removed = factories.DictionaryEntryFactory.build_batch(3)
+
+        with self.capture_on_commit_callbacks(execute=True):
+            request_update_in_index(DictionaryEntryDocumentManager, updated)
+            request_update_in_index(DictionaryEntryDocumentManager, synced)
+            request_sync_in_index(DictionaryEntryDocumentManager, synced)
+            request_sync_in_index(DictionaryEntryDocumentManager, removed)
+            request_remove_from_index(DictionaryEntryDocumentManager, removed)
+            request_update_in_index(DictionaryEntryDocumentManager, removed)
+
+        assert self.requested(mock_bulk_index) == [
+            ("DictionaryEntryDocumentManager", "update", [updated.id]),
+            ("DictionaryEntryDocumentManager", "sync", [synced.id]),
+            ("DictionaryEntryDocumentManager", "remove", [removed.id]),
+        ]
+
+    @pytest.mark.django_db
+    def test_requests_are_chunked(self, mock_bulk_index):
+        entries = factories.DictionaryEntryFactory.build_batch(5)
+
+        with patch.object(index_manager_tasks, "BULK_INDEXING_CHUNK_SIZE", 2):
+            with self.capture_on_commit_callbacks(execute=True):
+                for entry in entries:
+                    request_sync_in_index(DictionaryEntryDocumentManager, entry)
+
+        assert [ids for _, _, ids in self.requested(mock_bulk_index)] == [
+            [entries[0].id, entries[1].id],
+            [entries[2].id, entries[3].id],
+            [entries[4].id],
+        ]
+
+    @pytest.mark.django_db
+    def test_each_transaction_is_sent_separately(self, mock_bulk_index):
+        first, second = factories.DictionaryEntryFactory.build_batch(2)
+
+        with self.capture_on_commit_callbacks(execute=True):
+            request_sync_in_index(DictionaryEntryDocumentManager, first)
+
+        with self.capture_on_commit_callbacks(execute=True):
+            request_sync_in_index(DictionaryEntryDocumentManager, second)
+
+        assert self.requested(mock_bulk_index) == [
+            ("DictionaryEntryDocumentManager", "sync", [first.id]),
+            ("DictionaryEntryDocumentManager", "sync", [second.id]),
+        ]
+
+    @pytest.mark.django_db
+    def test_refresh_policy_defaults_to_none(self, mock_bulk_index):
+        entry = factories.DictionaryEntryFactory.build()
+
+        with self.capture_on_commit_callbacks(execute=True):
+            request_sync_in_index(DictionaryEntryDocumentManager, entry)
+
+        assert self.requested_refresh(mock_bulk_index) == [RefreshPolicy.NONE]
+
+    @pytest.mark.django_db
+    def test_strongest_refresh_policy_is_sent(self, mock_bulk_index):
+        imported, edited = factories.DictionaryEntryFactory.build_batch(2)
+        song = factories.SongFactory.build()
+
+        with self.capture_on_commit_callbacks(execute=True):
+            request_sync_in_index(DictionaryEntryDocumentManager, imported)
+            with index_refresh_policy(RefreshPolicy.WAIT_FOR):
+                request_sync_in_index(DictionaryEntryDocumentManager, edited)
+            request_sync_in_index(SongDocumentManager, song)
+
+        assert self.requested_refresh(mock_bulk_index) == [
+            RefreshPolicy.WAIT_FOR,
+            RefreshPolicy.WAIT_FOR,
+        ]
+
+    @pytest.mark.django_db
+    def test_rolled_back_requests_are_discarded(self, mock_bulk_index):
+        rolled_back, committed = factories.DictionaryEntryFactory.build_batch(2)
+
+        # a savepoint rollback replaces the list of callbacks, so they aren't captured here
+        connection = transaction.get_connection()
+        start_count = len(connection.run_on_commit)
+
+        try:
+            with transaction.atomic():
+                request_sync_in_index(DictionaryEntryDocumentManager, rolled_back)
+                raise ValueError()
+        except ValueError:
+            pass
+
+        request_sync_in_index(DictionaryEntryDocumentManager, committed)
+
+        for _, callback, _ in connection.run_on_commit[start_count:]:
+            callback()
+
+        assert self.requested(mock_bulk_index) == [
+            ("DictionaryEntryDocumentManager", "sync", [committed.id]),
+        ]
+
+
 class TestRemoveAllSiteContentFromIndexes(IgnoreTaskResultsMixin):
     TASK = remove_all_site_content_from_indexes
 
     def get_valid_task_args(self):
-        return [
-            "site_title",
-            {
-                "dictionaryentry_set": [],
-                "song_set": [],
-                "story_set": [],
-                "audio_set": [],
-                "document_set": [],
-                "image_set": [],
-                "video_set": [],
-            },
-        ]
+        return ["site_title", uuid.uuid4()]
 
 
 class TestSyncAllSiteContentInIndexes(IgnoreTaskResultsMixin):
@@ -66,3 +238,10 @@ class TestSyncAllMediaSiteContentInIndexes(IgnoreTaskResultsMixin):
 
     def get_valid_task_args(self):
         return [uuid.uuid4()]
+
+
+class TestUpdateSiteVisibilityInIndexes(IgnoreTaskResultsMixin):
+    TASK = update_site_visibility_in_indexes
+
+    def get_valid_task_args(self):
+        return [uuid.uuid4()]
@@ -6,7 +6,8 @@ from rest_framework import serializers
 from backend.serializers.utils.import_job_utils import check_required_headers
 from backend.tasks.import_job_tasks import clean_csv
 from backend.tests.utils import get_batch_import_test_dataset
-from backend.utils.character_utils import ArbSorter, CustomSorter, nfc
+from backend.utils.alphabet_utils import get_alphabet_changes
+from backend.utils.character_utils import ArbSorter, CharacterTrie, CustomSorter, nfc
 from backend.utils.export_utils import expand_row, get_first_seen_keys, get_max_lengths
 
 
@@ -99,12 +100,104 @@ class TestCharacterUtils:
         assert sorter.word_as_chars("cch..") == ["c", "ch.", "."]
         assert sorter.word_as_chars("c-h") == ["c", "-", "h"]
 
+    def test_character_trie_longest_match(self):
+        trie = CharacterTrie(["a", "aa", "aaa", "ch", "c"])
+        assert trie.split("aaaaa") == [("aaa", True), ("aa", True)]
+        assert trie.split("chc") == [("ch", True), ("c", True)]
+        assert trie.split("xyaz") == [("xy", False), ("a", True), ("z", False)]
+        assert trie.split("") == []
+
+    def test_character_trie_partial_match(self):
+        trie = CharacterTrie(["abc", "b"])
+        assert trie.split("abd") == [("a", False), ("b", True), ("d", False)]
+
+    def test_arb_sorter_multichar_ignorable(self):
+        sorter = ArbSorter(order=self.chars, ignorable=["--"])
+        assert sorter.word_as_values("a--b") == [0, 1]
+        assert sorter.word_as_values("a-b") == [0, 10000 + ord("-"), 1]
+
+    def test_arb_sorter_value_array(self):
+        sorter = ArbSorter(order=self.chars)
+        assert list(sorter.word_as_value_array("abcd")) == [0, 1, 2, 10100]
+        assert sorter.word_as_value_array("q") < sorter.word_as_value_array("p")
+        assert sorter.word_as_value_array("\U0010ffff")[0] == 10000 + 0x10FFFF
+
     def test_nfc_normalization(self):
         expected_str = "ááááá"
         input_str = "ááááá"
         assert nfc(input_str) == expected_str
 
 
+class TestAlphabetChanges:
+    @staticmethod
+    def get_config(base, variants=(), ignorable=(), confusables=(), g2p_config=None):
+        return {
+            "base_characters": list(base),
+            "variant_characters": list(variants),
+            "ignorable_characters": list(ignorable),
+            "confusables": list(confusables),
+            "g2p_config": g2p_config or {},
+        }
+
+    def test_unchanged(self):
+        changes = get_alphabet_changes(self.get_config("abc"), self.get_config("abc"))
+        assert changes.characters == set()
+        assert changes.confusables == set()
+        assert not changes.flagged_entries
+
+    def test_ignorable_added(self):
+        changes = get_alphabet_changes(
+            self.get_config("ab"), self.get_config("ab", ignorable="-")
+        )
+        assert changes.characters == set()
+        assert changes.flagged_entries
+
+        changes = get_alphabet_changes(
+            self.get_config("ab", ignorable="-"), self.get_config("ab")
+        )
+        assert changes.characters == set()
+        assert changes.flagged_entries
+
+    def test_sort_order_changed(self):
+        changes = get_alphabet_changes(self.get_config("abc"), self.get_config("acb"))
+        assert changes.characters == {"b", "c"}
+        assert changes.flagged_entries
+
+    def test_multichar_added(self):
+        changes = get_alphabet_changes(
+            self.get_config(["a", "c", "h"]), self.get_config(["a", "c", "h", "ch"])
+        )
+        assert changes.characters == {"c", "h", "ch"}
+
+    def test_variant_changed(self):
+        changes = get_alphabet_changes(
+            self.get_config("ab", variants=[("A", "a")]),
+            self.get_config("ab", variants=[["A", "b"]]),
+        )
+        assert changes.characters == {"a", "b"}
+
+    def test_confusable_added(self):
+        confusable = {"in": "x", "out": "a"}
+        changes = get_alphabet_changes(
+            self.get_config("ab"), self.get_config("ab", confusables=[confusable])
+        )
+        assert changes.characters == set()
+        assert changes.confusables == {"x"}
+
+        changes = get_alphabet_changes(
+            self.get_config("ab", confusables=[confusable]), self.get_config("ab")
+        )
+        assert changes.confusables == set()
+
+    def test_g2p_config_changed(self):
+        assert (
+            get_alphabet_changes(
+                self.get_config("ab"), self.get_config("ab", g2p_config={"a": 1})
+            )
+            is None
+        )
+
+
 class TestValidateRequiredHeaders:
     def test_valid_headers_present(self):
         input_headers = ["title", "type", "description", "notes"]
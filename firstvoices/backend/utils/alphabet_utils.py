@@ -0,0 +1,317 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+from g2p.mappings import Mapping
+from g2p.transducer import Transducer
+
+from backend.utils.character_utils import CustomSorter, clean_input, nfc
+
+
+class DerivedFields(NamedTuple):
+    """Alphabet-derived values stored on a dictionary entry."""
+
+    title: str
+    custom_order: str
+    split_chars_base: list[str]
+
+
+class AlphabetEngine:
+    """
+    Compiled text processors for a site alphabet: confusables cleanup, variant-to-base conversion,
+    custom sort and character splitting.
+
+    Engines are built once from plain character data and are not modified afterwards, so a single
+    instance can be shared by every Alphabet model instance for the same site and alphabet version.
+
+    Args:
+        base_characters (list[str]): Character titles, in sort order.
+        variant_characters (list[tuple[str, str]]): (variant title, base character title) pairs.
+        ignorable_characters (list[str]): Ignored character titles.
+        confusables (list[dict]): G2P rules mapping confusable input to canonical characters.
+        g2p_config (dict): Site-specific G2P settings, see ``Alphabet.default_g2p_config``.
+    """
+
+    def __init__(
+        self,
+        base_characters: list[str],
+        variant_characters: list[tuple[str, str]],
+        ignorable_characters: list[str],
+        confusables: list[dict],
+        g2p_config: dict,
+    ):
+        # plain-data arguments, which can be used to rebuild the engine in another process
+        self.config = {
+            "base_characters": list(base_characters),
+            "variant_characters": list(variant_characters),
+            "ignorable_characters": list(ignorable_characters),
+            "confusables": list(confusables),
+            "g2p_config": g2p_config,
+        }
+
+        self.base_characters = tuple(base_characters)
+        self.variant_characters = tuple(variant_characters)
+        self.ignorable_characters = frozenset(ignorable_characters)
+        self.known_characters = (
+            frozenset(base_characters)
+            | frozenset(variant for variant, _ in variant_characters)
+            | self.ignorable_characters
+        )
+
+        presort_map = [{"in": char, "out": char} for char in base_characters] + [
+            {"in": variant, "out": base} for variant, base in variant_characters
+        ]
+        self.presort_transducer = Transducer(
+            Mapping(**g2p_config["presort_config"], rules=presort_map)
+        )
+        self.preprocess_transducer = (
+            Transducer(Mapping(**g2p_config["preprocess_config"], rules=confusables))
+            if confusables
+            else None
+        )
+
+        self.sorter = CustomSorter(
+            order=list(base_characters), ignorable=list(ignorable_characters)
+        )
+        # Ignored characters are added to the splitter order so they are not removed when splitting.
+        self.splitter = CustomSorter(
+            order=list(base_characters)
+            + [variant for variant, _ in variant_characters]
+            + list(ignorable_characters)
+        )
+
+        # Memoized base forms and custom orders of single characters
+        self._base_form_lookup = {}
+        self._custom_order_lookup = {}
+
+    def clean_confusables(self, text: str) -> str:
+        """
+        Converts all instances of confusables to instances of characters or variant characters.
+        """
+        if self.preprocess_transducer is None:
+            return text
+        return nfc(self.preprocess_transducer(text).output_string)
+
+    def get_base_form(self, text: str) -> str:
+        """
+        Converts a string to a string with all variant characters replaced with their base characters.
+        """
+        return self.presort_transducer(text).output_string
+
+    def get_custom_order(self, text: str) -> str:
+        """
+        Convert a string to a custom-order string which follows the site custom alphabet order.
+        """
+        return self.sorter.word_as_sort_string(self.get_base_form(text))
+
+    def get_numerical_sort_form(self, text: str) -> list[int]:
+        return self.sorter.word_as_values(self.get_base_form(text))
+
+    def get_character_list(self, text: str) -> list[str]:
+        """
+        Returns a list of characters in the text, split using the MTD splitter.
+        """
+        return self.splitter.word_as_chars(text)
+
+    def get_character_base_form(self, char: str) -> str:
+        """
+        Returns the base form of a single split character, memoized per engine.
+        """
+        base_form = self._base_form_lookup.get(char)
+        if base_form is None:
+            base_form = self.get_base_form(char)
+            self._base_form_lookup[char] = base_form
+        return base_form
+
+    def get_character_custom_order(self, char: str) -> str:
+        """
+        Returns the custom order of a single split character, memoized per engine.
+        """
+        custom_order = self._custom_order_lookup.get(char)
+        if custom_order is None:
+            custom_order = self.get_custom_order(char)
+            self._custom_order_lookup[char] = custom_order
+        return custom_order
+
+    def get_split_chars_base(self, title: str, custom_order: str) -> list[str]:
+        """
+        Returns the title split into base characters, or an empty list if the title contains
+        unknown or ignored characters.
+        """
+        if CustomSorter.out_of_vocab_flag in custom_order:
+            return []
+        char_list = self.get_character_list(title)
+        if self.ignorable_characters.intersection(char_list):
+            return []
+        return [self.get_character_base_form(char) for char in char_list]
+
+    def clean_confusables_many(self, texts: list[str]) -> list[str]:
+        """
+        Returns each text with confusables converted, in the same order. Repeated texts are only converted once.
+        """
+        if self.preprocess_transducer is None:
+            return list(texts)
+
+        results = {}
+        for text in texts:
+            if text not in results:
+                results[text] = self.clean_confusables(text)
+        return [results[text] for text in texts]
+
+    def compute_derived_fields(self, title: str) -> DerivedFields:
+        """
+        Returns the cleaned title, custom order and base characters for a dictionary entry title.
+        """
+        return self._derive_fields(self.clean_confusables(clean_input(title)))
+
+    def compute_derived_fields_many(self, titles: list[str]) -> list[DerivedFields]:
+        """
+        Returns the derived fields for each title, in the same order. Repeated titles are only processed once.
+        """
+        unique_titles = list(dict.fromkeys(titles))
+        cleaned_titles = self.clean_confusables_many(
+            [clean_input(title) for title in unique_titles]
+        )
+        results = {
+            title: self._derive_fields(cleaned_title)
+            for title, cleaned_title in zip(unique_titles, cleaned_titles)
+        }
+        return [results[title] for title in titles]
+
+    def _derive_fields(self, title: str) -> DerivedFields:
+        custom_order = self.get_custom_order(title)
+        return DerivedFields(
+            title, custom_order, self.get_split_chars_base(title, custom_order)
+        )
+
+    def get_unknown_characters(self, text: str) -> list[str]:
+        """
+        Returns a list of characters in the text that are not in the alphabet or variants.
+        """
+        return [
+            char
+            for char in self.get_character_list(text)
+            if char not in self.known_characters
+        ]
+
+
+class AlphabetChanges(NamedTuple):
+    """Differences between two alphabet engine configs that can affect stored dictionary entry fields."""
+
+    # base characters that may be split, sorted or mapped differently
+    characters: set[str]
+    # confusable inputs that may now be converted differently
+    confusables: set[str]
+    # whether entries with unknown or ignored characters may be affected
+    flagged_entries: bool
+
+
+def get_alphabet_changes(before_config: dict, after_config: dict):
+    """
+    Compares two alphabet engine configs (see ``AlphabetEngine.config``), and returns the base characters and
+    confusable inputs whose entries may need to be recalculated, as found in ``split_chars_base`` and titles
+    calculated with the "before" alphabet. Entries with unknown or ignored characters are not covered by the
+    returned characters, since their ``split_chars_base`` is empty, so ``flagged_entries`` reports whether they
+    may be affected instead.
+
+    Returns None if every entry may be affected.
+    """
+    if before_config["g2p_config"] != after_config["g2p_config"]:
+        return None
+
+    def parse(config):
+        ranks = {char: i for i, char in enumerate(config["base_characters"])}
+        variants = {variant: base for variant, base in config["variant_characters"]}
+        ignorables = set(config["ignorable_characters"])
+        splitter_characters = set(ranks) | set(variants) | ignorables
+        return ranks, variants, ignorables, splitter_characters
+
+    before_ranks, before_variants, before_ignorables, before_splitter = parse(
+        before_config
+    )
+    after_ranks, after_variants, after_ignorables, after_splitter = parse(after_config)
+
+    # Characters that moved in the sort order, or were added or removed
+    characters = {
+        char
+        for char in before_ranks.keys() | after_ranks.keys()
+        if before_ranks.get(char) != after_ranks.get(char)
+    }
+
+    # Base characters of variants that were added, removed or moved to another base character
+    for variant in before_variants.keys() | after_variants.keys():
+        if before_variants.get(variant) != after_variants.get(variant):
+            characters.update(
+                {before_variants.get(variant), after_variants.get(variant)} - {None}
+            )
+
+    # Adding or removing a character can change how text around it is split, so entries containing any
+    # character which shares a letter with it are affected.
+    changed_letters = set().union(*(before_splitter ^ after_splitter))
+    for char in before_splitter:
+        if changed_letters.intersection(char):
+            if char in before_ranks:
+                characters.add(char)
+            elif char in before_variants:
+                characters.add(before_variants[char])
+
+    # Any change to the known or ignored characters can add or remove unknown and ignored characters in entries
+    flagged_entries = (
+        bool(characters)
+        or before_splitter != after_splitter
+        or before_ignorables != after_ignorables
+    )
+
+    # Removed confusables don't affect titles which have already been cleaned
+    before_confusables = {
+        json.dumps(rule, sort_keys=True) for rule in before_config["confusables"]
+    }
+    confusables = {
+        rule["in"]
+        for rule in after_config["confusables"]
+        if json.dumps(rule, sort_keys=True) not in before_confusables
+    }
+
+    return AlphabetChanges(characters, confusables, flagged_entries)
+
+
+class AlphabetEngineCache:
+    """
+    Process-wide, size-limited cache of compiled alphabet engines, keyed by site id and alphabet version.
+
+    An entry is only returned if its version matches the requested version, so stale engines are never used
+    even when another process has changed the alphabet. Local changes also evict entries directly.
+    """
+
+    max_size = 256
+
+    def __init__(self):
+        self._engines = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, site_id, version):
+        with self._lock:
+            cached = self._engines.get(site_id)
+            if cached is None or cached[0] != version:
+                return None
+            self._engines.move_to_end(site_id)
+            return cached[1]
+
+    def set(self, site_id, version, engine):
+        with self._lock:
+            self._engines[site_id] = (version, engine)
+            self._engines.move_to_end(site_id)
+            while len(self._engines) > self.max_size:
+                self._engines.popitem(last=False)
+
+    def invalidate(self, site_id):
+        with self._lock:
+            self._engines.pop(site_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._engines.clear()
+
+
+alphabet_engine_cache = AlphabetEngineCache()
@@ -1,6 +1,73 @@
 import logging
-import re
 import unicodedata
+from array import array
+
+
+class CharacterTrie:
+    """Splits words into alphabet characters, always taking the longest matching character at each position.
+
+    Text between matches is returned as a single out-of-vocab token, the same as splitting on a regex
+    alternation of the characters sorted longest-first.
+
+    Examples:
+        >>> trie = CharacterTrie(['a', 'aa', 'b'])
+        >>> trie.split('aaaxyb')
+        [('aa', True), ('a', True), ('xy', False), ('b', True)]
+
+    Args:
+        characters (list[str]): The characters to match.
+    """
+
+    # key marking the end of a character in the trie, can't collide with single-character keys
+    _end = None
+
+    def __init__(self, characters: list[str]):
+        self.root = {}
+        for character in characters:
+            if not character:
+                continue
+            node = self.root
+            for c in character:
+                node = node.setdefault(c, {})
+            node[self._end] = character
+
+    def split(self, word: str) -> list[tuple[str, bool]]:
+        """Returns (token, is_known_character) pairs for the word, in order."""
+        root = self.root
+        end = self._end
+        tokens = []
+        unknown_start = None
+        i = 0
+        length = len(word)
+        while i < length:
+            node = root
+            match = None
+            match_end = i
+            j = i
+            while j < length:
+                node = node.get(word[j])
+                if node is None:
+                    break
+                j += 1
+                if end in node:
+                    match = node[end]
+                    match_end = j
+
+            if match is None:
+                if unknown_start is None:
+                    unknown_start = i
+                i += 1
+                continue
+
+            if unknown_start is not None:
+                tokens.append((word[unknown_start:i], False))
+                unknown_start = None
+            tokens.append((match, True))
+            i = match_end
+
+        if unknown_start is not None:
+            tokens.append((word[unknown_start:], False))
+        return tokens
 
 
 # From https://github.com/roedoejet/mothertongues/blob/master/mtd/processors/sorter.py
@@ -25,9 +92,8 @@ class ArbSorter:
     """
 
     def __init__(self, order: list[str], ignorable: list[str] | None = None):
-        self.ignorable = [] if ignorable is None else ignorable
-        split_order = [re.escape(x) for x in sorted(order, key=len, reverse=True)]
-        self.splitter = re.compile(f'({"|".join(split_order)})', re.UNICODE)
+        self.ignorable = frozenset() if ignorable is None else frozenset(ignorable)
+        self.splitter = CharacterTrie(order)
         # Next, collect weights for the ordering.
         self.char_to_ord_lookup = {order[i]: i for i in range(len(order))}
         self.ord_to_char_lookup = {v: k for k, v in self.char_to_ord_lookup.items()}
@@ -38,25 +104,29 @@ class ArbSorter:
     # sort ordered collections of all types, including lists.
     def word_as_values(self, word: str) -> list[int]:
         """Turn word into values"""
-        # ignore empty strings
-        word = [x for x in self.splitter.split(word) if x]
+        ignorable = self.ignorable
+        char_to_ord_lookup = self.char_to_ord_lookup
         values = []
-        for char in word:
-            if char in self.ignorable:
+        for char, is_known in self.splitter.split(word):
+            if char in ignorable:
                 continue
-            if char in self.char_to_ord_lookup:
-                values.append(self.char_to_ord_lookup[char])
+            if is_known:
+                values.append(char_to_ord_lookup[char])
             else:
                 # OOV (can be multiple OOVs strung together)
                 for oov in char:
-                    if oov in self.ignorable:
+                    if oov in ignorable:
                         continue
                     oov_index = self.oov_start + ord(oov)
-                    self.char_to_ord_lookup[oov] = oov_index
+                    char_to_ord_lookup[oov] = oov_index
                     self.ord_to_char_lookup[oov_index] = oov
                     values.append(oov_index)
         return values
 
+    def word_as_value_array(self, word: str) -> array:
+        """Turn word into values, stored in a compact array which compares the same way as the list of values"""
+        return array("I", self.word_as_values(word))
+
     def values_as_word(self, values: list[int]) -> str:
         """Turn values into word"""
         return "".join([self.ord_to_char_lookup[v] for v in values])
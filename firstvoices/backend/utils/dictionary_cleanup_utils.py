@@ -0,0 +1,136 @@
+import multiprocessing
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+from backend.utils.alphabet_utils import AlphabetEngine, DerivedFields
+from backend.utils.character_utils import CustomSorter
+
+# This module must not import Django models, so that worker processes can be started without setting up Django.
+
+
+class CleanupBatchResult(NamedTuple):
+    """Dictionary cleanup results for one batch of entries."""
+
+    entry_count: int
+    updated_entries: list[dict]
+    unknown_character_count: Counter
+    # (entry id, original title, derived fields) for entries where a stored value has changed
+    changes: list[tuple[object, str, DerivedFields]]
+
+
+def append_updated_entry(
+    updated_entries, original_title, original_custom_order, cleaned_title, new_order
+):
+    result = {
+        "title": original_title,
+        "cleaned_title": "",
+        "is_title_updated": False,
+        "previous_custom_order": original_custom_order,
+        "new_custom_order": "",
+    }
+
+    if result["previous_custom_order"] != new_order:
+        result["new_custom_order"] = new_order
+    if result["title"] != cleaned_title:
+        result["cleaned_title"] = cleaned_title
+        result["is_title_updated"] = True
+
+    if result["new_custom_order"] or result["cleaned_title"]:
+        updated_entries.append(result)
+
+
+def count_unknown_characters(
+    engine: AlphabetEngine, title: str, unknown_character_count: Counter
+):
+    """
+    Adds the unknown characters remaining in a cleaned title to the counter, keyed by their custom order.
+    """
+    # first split by character, then apply custom order
+    for char in engine.get_character_list(title):
+        char_custom_order = engine.get_character_custom_order(char)
+        if CustomSorter.out_of_vocab_flag in char_custom_order:
+            unknown_character_count[char_custom_order] += 1
+
+
+def calculate_cleanup_batch(
+    engine: AlphabetEngine, rows, custom_order_max_length: int
+) -> CleanupBatchResult:
+    """
+    Calculates cleanup results for a batch of (id, title, custom_order, split_chars_base) rows.
+    Custom orders are compared to stored values after the same truncation the custom_order field applies.
+    """
+    updated_entries = []
+    unknown_character_count = Counter()
+    changes = []
+
+    for entry_id, title, custom_order, split_chars_base in rows:
+        derived = engine.compute_derived_fields(title)
+
+        append_updated_entry(
+            updated_entries, title, custom_order, derived.title, derived.custom_order
+        )
+
+        stored_custom_order = derived.custom_order.strip()[:custom_order_max_length]
+        if (
+            derived.title != title
+            or stored_custom_order != custom_order
+            or derived.split_chars_base != split_chars_base
+        ):
+            changes.append((entry_id, title, derived))
+
+        count_unknown_characters(engine, derived.title, unknown_character_count)
+
+    return CleanupBatchResult(
+        len(rows), updated_entries, unknown_character_count, changes
+    )
+
+
+# engine for the current worker process, built once by the pool initializer
+_worker_engine = None
+
+
+def _init_worker(engine_config):
+    global _worker_engine
+    _worker_engine = AlphabetEngine(**engine_config)
+
+
+def _calculate_cleanup_batch_in_worker(rows, custom_order_max_length):
+    return calculate_cleanup_batch(_worker_engine, rows, custom_order_max_length)
+
+
+def calculate_cleanup_batches(
+    engine: AlphabetEngine, batches, custom_order_max_length: int, workers: int = 1
+):
+    """
+    Yields a CleanupBatchResult for each batch of rows, in order.
+
+    With more than one worker, batches are calculated by a pool of processes which each build their own copy of
+    the engine. Only a few batches per worker are read ahead of the results, so the rows are never all loaded
+    into memory at once. Daemon processes (such as celery prefork workers) can't start child processes, so they
+    always calculate batches in-process.
+    """
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        for rows in batches:
+            yield calculate_cleanup_batch(engine, rows, custom_order_max_length)
+        return
+
+    max_pending = workers * 2
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(engine.config,),
+    ) as executor:
+        pending = deque()
+        for rows in batches:
+            pending.append(
+                executor.submit(
+                    _calculate_cleanup_batch_in_worker, rows, custom_order_max_length
+                )
+            )
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
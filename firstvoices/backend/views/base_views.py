@@ -7,9 +7,11 @@ from rest_framework.exceptions import (
 )
 from rest_framework.response import Response
 
-from backend.models import Alphabet, Character, CharacterVariant, IgnoredCharacter, Site
+from backend.models import Site
 from backend.models.jobs import JobStatus
 from backend.permissions import utils
+from backend.search.constants import RefreshPolicy
+from backend.search.indexing.base import index_refresh_policy
 from backend.views.utils import BurstRateThrottle, SustainedRateThrottle
 
 
@@ -185,35 +187,19 @@ class SiteContentViewSetMixin:
         """Check create permissions based on the relevant site"""
         return self.get_validated_site()
 
+    # Edits made through the API wait for the search index refresh, so that they show up in the editor's next search
 
-class DictionarySerializerContextMixin:
-    """
-    Adds context to a view which is passed to the dictionary serializer to remove the need for duplicate queries.
-    """
-
-    def get_serializer_context(self):
-        """
-        A helper function to gather additional model context which can be reused for multiple dictionary entries.
-        """
-
-        site = self.get_validated_site()
+    def perform_create(self, serializer):
+        with index_refresh_policy(RefreshPolicy.WAIT_FOR):
+            super().perform_create(serializer)
 
-        context = super().get_serializer_context()
+    def perform_update(self, serializer):
+        with index_refresh_policy(RefreshPolicy.WAIT_FOR):
+            super().perform_update(serializer)
 
-        alphabet = Alphabet.objects.get_or_create(site=site)[0]
-        ignored_characters = IgnoredCharacter.objects.filter(site=site).values_list(
-            "title", flat=True
-        )
-        base_characters = Character.objects.filter(site=site).order_by("sort_order")
-        character_variants = CharacterVariant.objects.filter(site=site)
-        ignorable_characters = IgnoredCharacter.objects.filter(site=site)
-
-        context["alphabet"] = alphabet
-        context["ignored_characters"] = ignored_characters
-        context["base_characters"] = base_characters
-        context["character_variants"] = character_variants
-        context["ignorable_characters"] = ignorable_characters
-        return context
+    def perform_destroy(self, instance):
+        with index_refresh_policy(RefreshPolicy.WAIT_FOR):
+            super().perform_destroy(instance)
 
 
 class AsyncJobDeleteMixin:
@@ -9,11 +9,7 @@ from backend.serializers.dictionary_serializers import (
     DictionaryEntryDetailWriteResponseSerializer,
 )
 from backend.views.api_doc_variables import id_parameter, site_slug_parameter
-from backend.views.base_views import (
-    DictionarySerializerContextMixin,
-    FVPermissionViewSetMixin,
-    SiteContentViewSetMixin,
-)
+from backend.views.base_views import FVPermissionViewSetMixin, SiteContentViewSetMixin
 
 from . import doc_strings
 from .utils import get_media_prefetch_list
@@ -98,7 +94,6 @@ from .utils import get_media_prefetch_list
 )
 class DictionaryViewSet(
     SiteContentViewSetMixin,
-    DictionarySerializerContextMixin,
     FVPermissionViewSetMixin,
     viewsets.ModelViewSet,
 ):
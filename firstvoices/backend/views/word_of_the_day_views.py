@@ -17,11 +17,7 @@ from backend.permissions import utils
 from backend.serializers.word_of_the_day_serializers import WordOfTheDayListSerializer
 from backend.views import doc_strings
 from backend.views.api_doc_variables import site_slug_parameter
-from backend.views.base_views import (
-    DictionarySerializerContextMixin,
-    FVPermissionViewSetMixin,
-    SiteContentViewSetMixin,
-)
+from backend.views.base_views import FVPermissionViewSetMixin, SiteContentViewSetMixin
 from backend.views.utils import get_media_prefetch_list, get_select_related_media_fields
 
 
@@ -40,7 +36,6 @@ class WordOfTheDayView(
     FVPermissionViewSetMixin,
     SiteContentViewSetMixin,
     mixins.ListModelMixin,
-    DictionarySerializerContextMixin,
     viewsets.GenericViewSet,
 ):
     """
@@ -24,6 +24,7 @@ def setup_periodic_tasks(sender, **kwargs):
     # Importing after django.setup() to avoid AppRegistryNotReady error
     from django_celery_beat.models import CrontabSchedule, PeriodicTask
 
+    from backend.search.tasks.index_manager_tasks import reindex_since_watermark
     from backend.tasks.export_job_tasks import delete_old_exports
     from backend.tasks.mtd_export_tasks import check_sites_for_mtd_sync
 
@@ -53,3 +54,20 @@ def setup_periodic_tasks(sender, **kwargs):
         PeriodicTask.objects.create(
             crontab=schedule, name="delete_old_exports", task=delete_old_exports.name
         )
+
+    # Create the PeriodicTask and schedule to catch the search indices up with missed changes if they don't exist
+    if not PeriodicTask.objects.filter(name="reindex_since_watermark").exists():
+        schedule, _ = CrontabSchedule.objects.get_or_create(
+            minute=30,
+            hour="*",
+            day_of_week="*",
+            day_of_month="*",
+            month_of_year="*",
+            timezone="America/Vancouver",
+        )
+
+        PeriodicTask.objects.create(
+            crontab=schedule,
+            name="reindex_since_watermark",
+            task=reindex_since_watermark.name,
+        )
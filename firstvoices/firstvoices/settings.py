@@ -295,6 +295,10 @@ CELERY_TASK_IGNORE_RESULT = True
 # Celery tasks are not picked up by autodiscover_tasks() if they are not globally imported. This adds missing tasks.
 # CELERY_IMPORTS = ("backend.tasks.my_task",)
 
+# Number of processes used to calculate dictionary cleanup results. Only used when the task runs in a process that
+# can start child processes (e.g. not in the default celery prefork pool), otherwise the calculation runs in-process.
+DICTIONARY_CLEANUP_WORKERS = int(os.getenv("DICTIONARY_CLEANUP_WORKERS", 1))
+
 ELASTICSEARCH_HOST = os.getenv("ELASTICSEARCH_HOST", "http://localhost:9200")
 ELASTICSEARCH_PRIMARY_INDEX = os.getenv("ELASTICSEARCH_PRIMARY_INDEX", "fv")
 # The following defaults are defaults in context of non-production environments.